@@ -0,0 +1,267 @@
+import random
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from pattern_engine import cell_lines, mode_rules
+
+LETTERS = "SO"
+
+# Simple mode values: a win is worth more than any General score difference
+WIN_SCORE = 100000
+INFINITY = 10 ** 9
+
+# Transposition table bound types
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(board_size):
+    """Returns a random 64-bit key for every (cell, letter) pair, fixed per board size."""
+    rng = random.Random(board_size)
+    return tuple({letter: rng.getrandbits(64) for letter in LETTERS} for _ in range(board_size * board_size))
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget for a move runs out."""
+
+
+class TranspositionTable:
+    """Bounded cache of search results keyed by Zobrist hash, evicting the least recently used entry."""
+
+    def __init__(self, max_entries=1 << 18):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Returns the (depth, value, flag, move) entry for the key, or None."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def store(self, key, depth, value, flag, move):
+        """Stores a result, keeping a deeper existing entry for the same position."""
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > depth:
+            self.entries.move_to_end(key)
+            return
+        self.entries[key] = (depth, value, flag, move)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Removes every entry."""
+        self.entries.clear()
+
+
+class AlphaBetaPlayer:
+    """Computer player using iterative-deepening negamax with alpha-beta pruning.
+
+    Values are the score difference the side to move can still gain from the
+    position, so they do not depend on colour or on the points already
+    scored. In General mode a scoring move keeps the turn, so its child is
+    searched from the same side without negation.
+
+    An optional opening book (anything with a lookup(game_manager) method,
+    such as OpeningLibrary) answers book positions without searching.
+    """
+
+    def __init__(self, time_limit=1.0, max_depth=None, tt_size=1 << 18, book=None):
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.book = book
+        self.table = TranspositionTable(tt_size)
+        self.table_key = None
+        self.nodes = 0
+        self.depth_reached = 0
+
+    def choose_move(self, game_manager):
+        """Returns the best (row, col, character) found within the time limit, or None if the board is full."""
+        best = None
+        for depth, move, value in self.iter_search(game_manager):
+            best = move
+        return best
+
+    def iter_search(self, game_manager, should_stop=None):
+        """Yields (depth, (row, col, character), value) after each completed search depth.
+
+        should_stop is an optional callable polled during the search; the
+        search ends early when it returns True. A book position yields its
+        stored move, value and depth once, without searching.
+        """
+        if self.book is not None:
+            entry = self.book.lookup(game_manager)
+            if entry is not None:
+                move, value, depth = entry
+                yield depth, move, value
+                return
+        self._load(game_manager)
+        if not self.empties:
+            return
+        size = self.board_size
+        max_depth = min(self.max_depth or len(self.empties), len(self.empties))
+        deadline = time.perf_counter() + self.time_limit if self.time_limit else None
+        self.nodes = 0
+        self.depth_reached = 0
+        self._should_stop = should_stop
+        best_move = None
+
+        for depth in range(1, max_depth + 1):
+            # Depth 1 ignores the time limit, so even a tiny one leaves a move to play
+            self._deadline = deadline if depth > 1 else None
+            try:
+                value, move = self._search_root(depth, best_move)
+            except SearchTimeout:
+                return
+            best_move = move
+            self.depth_reached = depth
+            row, col = divmod(move[0], size)
+            yield depth, (row, col, move[1]), value
+            if abs(value) >= WIN_SCORE:
+                return  # Forced result found, deeper search cannot change it
+
+    def _load(self, game_manager):
+        """Copies the position of a GameManager into the flat search state."""
+        size = game_manager.board_size
+        self.board_size = size
+        scoring_mode, word = mode_rules(game_manager.game_mode)
+        self.simple = scoring_mode == "Simple"
+        if self.table_key != (size, game_manager.game_mode):
+            # Cached values are only meaningful for one board size and scoring mode
+            self.table.clear()
+            self.table_key = (size, game_manager.game_mode)
+        self.lines = cell_lines(word, size)  # (window, target) lines of the mode's word through each cell
+        self.keys = zobrist_keys(size)
+        self.cells = [game_manager.get_board_value(row, col) for row in range(size) for col in range(size)]
+        self.empties = [cell for cell, letter in enumerate(self.cells) if letter == ' ']
+        self.hash = 0
+        for cell, letter in enumerate(self.cells):
+            if letter != ' ':
+                self.hash ^= self.keys[cell][letter]
+
+    def _classify(self, cell, letter):
+        """Returns (lines completed, lines one letter short handed to the opponent) for placing letter at cell."""
+        cells = self.cells
+        gain = 0
+        threats = 0
+        for window, target in self.lines[cell]:
+            empty = 0
+            for position, other in enumerate(window):
+                value = letter if other == cell else cells[other]
+                if value == ' ':
+                    empty += 1
+                elif value != target[position]:
+                    break
+            else:
+                if empty == 0:
+                    gain += 1
+                elif empty == 1:
+                    threats += 1
+        return gain, threats
+
+    def _ordered_moves(self, first_move):
+        """Returns (gain, cell, letter) moves with SOS-completing moves first, then safe moves."""
+        scored = []
+        for cell in self.empties:
+            for letter in LETTERS:
+                gain, threats = self._classify(cell, letter)
+                priority = gain * 4 - (1 if threats else 0)
+                if (cell, letter) == first_move:
+                    priority += 2
+                scored.append((priority, gain, cell, letter))
+        scored.sort(key=lambda move: move[0], reverse=True)
+        return [(gain, cell, letter) for _, gain, cell, letter in scored]
+
+    def _play(self, cell, letter):
+        self.cells[cell] = letter
+        self.empties.remove(cell)
+        self.hash ^= self.keys[cell][letter]
+
+    def _unplay(self, cell, letter):
+        self.cells[cell] = ' '
+        self.empties.append(cell)
+        self.hash ^= self.keys[cell][letter]
+
+    def _check_time(self):
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        if self._should_stop is not None and self._should_stop():
+            raise SearchTimeout()
+
+    def _child_value(self, gain, depth, alpha, beta):
+        """Searches the position after a move with the given gain and returns its value for the mover."""
+        if gain:
+            if self.simple:
+                return WIN_SCORE + len(self.empties)  # Earlier wins score higher
+            return gain + self._search(depth - 1, alpha - gain, beta - gain)
+        return -self._search(depth - 1, -beta, -alpha)
+
+    def _search_root(self, depth, first_move):
+        """Searches every root move to the given depth and returns (value, (cell, letter))."""
+        alpha = -INFINITY
+        best_move = None
+        for gain, cell, letter in self._ordered_moves(first_move):
+            self._play(cell, letter)
+            try:
+                value = self._child_value(gain, depth, alpha, INFINITY)
+            finally:
+                self._unplay(cell, letter)
+            if best_move is None or value > alpha:
+                alpha = value
+                best_move = (cell, letter)
+        self.table.store(self.hash, depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _search(self, depth, alpha, beta):
+        """Negamax search returning the value of the position for the side to move."""
+        self.nodes += 1
+        if self.nodes & 63 == 0:
+            self._check_time()
+        if not self.empties or depth == 0:
+            return 0
+
+        key = self.hash
+        entry = self.table.get(key)
+        first_move = None
+        if entry is not None:
+            entry_depth, entry_value, flag, first_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return entry_value
+                if flag == LOWER:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    return entry_value
+
+        original_alpha = alpha
+        best_value = -INFINITY
+        best_move = None
+        for gain, cell, letter in self._ordered_moves(first_move):
+            self._play(cell, letter)
+            try:
+                value = self._child_value(gain, depth, alpha, beta)
+            finally:
+                self._unplay(cell, letter)
+            if value > best_value:
+                best_value = value
+                best_move = (cell, letter)
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(key, depth, best_value, flag, best_move)
+        return best_value
@@ -0,0 +1,94 @@
+import queue
+import threading
+
+
+class AnalysisService:
+    """Runs move searches on a worker thread and delivers their results on the Tk main loop.
+
+    A search is any callable taking (game_manager, should_stop) and yielding
+    progressively better suggestions, such as AlphaBetaPlayer.iter_search.
+    The worker only sees a copy of the game, and results are posted back
+    through root.after polling, so the Tk event thread never blocks on it.
+    A search started while a cancelled one is still winding down is launched
+    from the poll once the old thread exits, since both may share a player.
+    """
+
+    def __init__(self, root, poll_interval=30):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.results = queue.Queue()
+        self.generation = 0
+        self.thread = None
+        self.pending = None
+        self.stop_event = threading.Event()
+        self.callbacks = None
+        self.polling = False
+
+    def start(self, game_manager, search, on_suggestion, on_done=None):
+        """Cancels any running search and starts analysing a snapshot of the game."""
+        self.cancel()
+        self.generation += 1
+        self.stop_event = threading.Event()
+        self.callbacks = (on_suggestion, on_done)
+        snapshot = game_manager.copy()
+        thread = threading.Thread(target=self._run, daemon=True,
+                                  args=(self.generation, search, snapshot, self.stop_event))
+        if self.thread is not None and self.thread.is_alive():
+            self.pending = thread  # Started by _poll once the cancelled search has exited
+        else:
+            self.thread = thread
+            thread.start()
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_interval, self._poll)
+
+    def cancel(self):
+        """Stops the running search and discards any of its results that are not yet delivered.
+
+        Returns without waiting for the worker thread, which exits at its
+        next stop_event check; its late results are dropped by generation.
+        """
+        self.generation += 1
+        self.callbacks = None
+        self.pending = None
+        self.stop_event.set()
+
+    def is_running(self):
+        """Returns True while a search thread is alive or waiting to start."""
+        return self.pending is not None or (self.thread is not None and self.thread.is_alive())
+
+    def _run(self, generation, search, snapshot, stop_event):
+        """Worker thread body: queues each suggestion tagged with its generation."""
+        try:
+            for suggestion in search(snapshot, stop_event.is_set):
+                if stop_event.is_set():
+                    break
+                self.results.put((generation, suggestion))
+        finally:
+            self.results.put((generation, None))
+
+    def _poll(self):
+        """Delivers queued results for the current generation on the Tk main loop."""
+        if self.pending is not None and not self.thread.is_alive():
+            self.thread, self.pending = self.pending, None
+            self.thread.start()
+        while True:
+            try:
+                generation, suggestion = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation or self.callbacks is None:
+                continue  # Stale result from a cancelled search
+            on_suggestion, on_done = self.callbacks
+            if suggestion is not None:
+                on_suggestion(suggestion)
+            else:
+                self.callbacks = None
+                self.thread = None
+                if on_done is not None:
+                    on_done()
+
+        if self.is_running() or not self.results.empty():
+            self.root.after(self.poll_interval, self._poll)
+        else:
+            self.polling = False
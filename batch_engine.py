@@ -0,0 +1,127 @@
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for batched evaluation
+    np = None
+
+from sos_lines import cell_triples
+
+# Cell codes
+EMPTY, S, O = 0, 1, 2
+LETTER_CODES = {'S': S, 'O': O}
+
+# Player codes
+BLUE, RED = 0, 1
+PLAYER_NAMES = ("Blue", "Red")
+
+# Winner codes, -1 while a board is still being played
+NO_WINNER, BLUE_WINS, RED_WINS, DRAW = -1, BLUE, RED, 2
+
+# Step results, mirroring the "result" values returned by GameManager.make_move
+INVALID, NEXT_TURN, CONTINUE, WIN, DRAW_RESULT, END = range(6)
+RESULT_NAMES = (None, "next_turn", "continue", "win", "draw", "end")
+
+
+@lru_cache(maxsize=None)
+def padded_cell_triples(board_size):
+    """Returns an (n*n, m, 3) array of the line triples through each cell.
+
+    Cells with fewer than m triples are padded with the sentinel index n*n,
+    which always holds EMPTY and so never matches an SOS.
+    """
+    index = cell_triples(board_size)
+    sentinel = board_size * board_size
+    width = max(len(triples) for triples in index)
+    table = np.full((sentinel, width, 3), sentinel, dtype=np.intp)
+    for cell, triples in enumerate(index):
+        if triples:
+            table[cell, :len(triples)] = triples
+    return table
+
+
+class BatchGameEngine:
+    """Plays K SOS games of the same size and mode in lockstep on one (K, n, n) int8 array."""
+
+    def __init__(self, games, board_size, game_mode="Simple"):
+        if np is None:
+            raise ImportError("BatchGameEngine requires NumPy")
+        if game_mode not in ("Simple", "General"):
+            raise ValueError(f"Unknown game mode: {game_mode}")
+        self.games = games
+        self.board_size = board_size
+        self.game_mode = game_mode
+        self.triples = padded_cell_triples(board_size)
+        self.reset()
+
+    def reset(self):
+        """Starts every game again from an empty board with Blue to move."""
+        cells = self.board_size * self.board_size
+        # One extra always-empty column serves as the padding sentinel for the triple table
+        self.cells = np.zeros((self.games, cells + 1), dtype=np.int8)
+        self.boards = self.cells[:, :cells].reshape(self.games, self.board_size, self.board_size)
+        self.current_player = np.zeros(self.games, dtype=np.int8)
+        self.sos_count = np.zeros((self.games, 2), dtype=np.int32)
+        self.empty_count = np.full(self.games, cells, dtype=np.int32)
+        self.is_game_active = np.ones(self.games, dtype=bool)
+        self.winner = np.full(self.games, NO_WINNER, dtype=np.int8)
+        self.moves = np.zeros(self.games, dtype=np.int32)
+
+    def step(self, rows, cols, letters):
+        """Applies one move per board and returns an array of step result codes.
+
+        Moves on finished boards or occupied cells are ignored and reported as
+        INVALID. Unlike GameManager, the turn is switched automatically on
+        NEXT_TURN, and a General board filled by a scoring move reports END.
+        """
+        games = np.arange(self.games)
+        cell = np.asarray(rows) * self.board_size + np.asarray(cols)
+        letters = np.asarray(letters, dtype=np.int8)
+
+        valid = self.is_game_active & (self.cells[games, cell] == EMPTY)
+        self.cells[games[valid], cell[valid]] = letters[valid]
+        self.empty_count[valid] -= 1
+        self.moves[valid] += 1
+
+        # Gather the letters of every triple through each board's move: shape (K, m, 3)
+        values = self.cells[games[:, None, None], self.triples[cell]]
+        sos = ((values[..., 0] == S) & (values[..., 1] == O) & (values[..., 2] == S)).sum(axis=1)
+        scored = valid & (sos > 0)
+        full = valid & (self.empty_count == 0)
+
+        results = np.full(self.games, INVALID, dtype=np.int8)
+        if self.game_mode == "Simple":
+            results[scored] = WIN
+            self.winner[scored] = self.current_player[scored]
+            drawn = full & ~scored
+            results[drawn] = DRAW_RESULT
+            self.winner[drawn] = DRAW
+            self.is_game_active[scored | full] = False
+        else:
+            self.sos_count[games[scored], self.current_player[scored]] += sos[scored]
+            results[scored] = CONTINUE
+            results[full] = END
+            blue = self.sos_count[full, BLUE]
+            red = self.sos_count[full, RED]
+            self.winner[full] = np.where(blue > red, BLUE_WINS, np.where(red > blue, RED_WINS, DRAW))
+            self.is_game_active[full] = False
+
+        passing = valid & ~scored & ~full
+        results[passing] = NEXT_TURN
+        self.current_player[passing] ^= 1
+        return results
+
+    def random_moves(self, rng):
+        """Picks a random empty cell and letter for every board using a NumPy Generator."""
+        cells = self.board_size * self.board_size
+        weights = rng.random((self.games, cells))
+        weights[self.cells[:, :cells] != EMPTY] = -1.0
+        cell = weights.argmax(axis=1)
+        letters = rng.integers(S, O + 1, size=self.games, dtype=np.int8)
+        return cell // self.board_size, cell % self.board_size, letters
+
+    def play_random(self, rng):
+        """Plays every active board to completion with random moves."""
+        while self.is_game_active.any():
+            self.step(*self.random_moves(rng))
+        return self.winner
@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import platform
+import random
+import select
+import shutil
+import subprocess
+import sys
+import time
+
+from game_manager import GameManager
+from simulate import play_game, random_policy
+
+DEFAULT_SIZES = list(range(3, 21))
+MODES = ("Simple", "General")
+
+
+def _rate(operations, elapsed):
+    """Returns operations per second, guarding against a zero timer reading."""
+    return operations / elapsed if elapsed > 0 else float("inf")
+
+
+def _random_orders(board_size, count, rng):
+    """Returns shuffled (row, col, character) move lists that fill the board."""
+    cells = [(row, col) for row in range(board_size) for col in range(board_size)]
+    orders = []
+    for _ in range(count):
+        rng.shuffle(cells)
+        orders.append([(row, col, rng.choice("SO")) for row, col in cells])
+    return orders
+
+
+def bench_make_move(board_size, game_mode, min_time, rng):
+    """Measures make_move calls per second while filling boards with random moves."""
+    game_manager = GameManager(board_size, game_mode)
+    orders = _random_orders(board_size, 20, rng)
+    moves = 0
+    elapsed = 0.0
+    while elapsed < min_time:
+        for order in orders:
+            game_manager.reset_game(board_size, game_mode)
+            make_move = game_manager.make_move
+            start = time.perf_counter()
+            for row, col, character in order:
+                if not make_move(row, col, character):
+                    break
+                moves += 1
+            elapsed += time.perf_counter() - start
+    return _rate(moves, elapsed)
+
+
+def _filled_game(board_size, game_mode, rng, empty=0):
+    """Returns a game of the given mode whose board is filled with random letters except for empty cells.
+
+    The letters go straight into the board storage, so a Simple game does
+    not stop at its first SOS and the mode's own rules stay in place.
+    """
+    game_manager = GameManager(board_size, game_mode)
+    game_manager.reset_game(board_size, game_mode)
+    order = _random_orders(board_size, 1, rng)[0]
+    for row, col, character in order[:len(order) - empty]:
+        game_manager._place(row, col, character)
+        game_manager._mark_filled(row, col)
+    return game_manager
+
+
+def bench_check_sos(board_size, game_mode, min_time, rng):
+    """Measures check_sos calls per second over every cell of a filled board."""
+    game_manager = _filled_game(board_size, game_mode, rng)
+    check_sos = game_manager.check_sos
+    cells = [(row, col) for row in range(board_size) for col in range(board_size)]
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time:
+        for row, col in cells:
+            check_sos(row, col)
+        calls += len(cells)
+    return _rate(calls, time.perf_counter() - start)
+
+
+def bench_is_board_full(board_size, game_mode, min_time, rng):
+    """Measures is_board_full calls per second on a board with one empty cell."""
+    is_board_full = _filled_game(board_size, game_mode, rng, empty=1).is_board_full
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time:
+        for _ in range(1000):
+            is_board_full()
+        calls += 1000
+    return _rate(calls, time.perf_counter() - start)
+
+
+def bench_random_games(board_size, game_mode, min_time, rng):
+    """Measures complete random games per second."""
+    games = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time:
+        play_game(board_size, game_mode, random_policy, random_policy, rng)
+        games += 1
+    return _rate(games, time.perf_counter() - start)
+
+
+ENGINE_BENCHMARKS = {
+    "make_move": bench_make_move,
+    "check_sos": bench_check_sos,
+    "is_board_full": bench_is_board_full,
+    "random_games": bench_random_games,
+}
+
+
+def start_virtual_display(timeout=5.0):
+    """Starts Xvfb on a free display when no display is available; returns the process, or None if not started.
+
+    Xvfb picks the display number itself and writes it to a pipe with
+    -displayfd once it accepts connections, so DISPLAY is only set for a
+    server that is running.
+    """
+    if os.environ.get("DISPLAY") or not shutil.which("Xvfb"):
+        return None
+    read_fd, write_fd = os.pipe()
+    try:
+        process = subprocess.Popen(["Xvfb", "-displayfd", str(write_fd), "-screen", "0", "1920x1080x24"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, pass_fds=(write_fd,))
+    except OSError:
+        os.close(read_fd)
+        return None
+    finally:
+        os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        # An Xvfb that exits early closes the pipe, so this only waits out the timeout on a hung server
+        ready = select.select([pipe], [], [], timeout)[0]
+        number = pipe.readline().strip() if ready else ""
+    if not number.isdigit() or process.poll() is not None:
+        process.kill()
+        process.wait()
+        return None
+    os.environ["DISPLAY"] = f":{number}"
+    return process
+
+
+def stop_virtual_display(process):
+    """Stops an Xvfb started by start_virtual_display and unsets the DISPLAY it pointed to."""
+    process.terminate()
+    process.wait()
+    os.environ.pop("DISPLAY", None)
+
+
+def bench_create_board(board_sizes, repeats=3):
+    """Measures board construction time in seconds for the button and canvas boards.
+
+    Returns an empty dict when no display can be opened.
+    """
+    import tkinter as tk
+    from game_board import CanvasGameBoard, GameBoard
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return {}
+    results = {}
+    try:
+        for name, board_class in (("create_board", GameBoard), ("create_canvas_board", CanvasGameBoard)):
+            for board_size in board_sizes:
+                frame = tk.Frame(root)
+                best = float("inf")
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    board_class(frame, board_size, lambda row, col: None)
+                    root.update_idletasks()
+                    best = min(best, time.perf_counter() - start)
+                frame.destroy()
+                results[f"{name}|{board_size}"] = best
+    finally:
+        root.destroy()
+    return results
+
+
+def run_benchmarks(board_sizes=DEFAULT_SIZES, game_modes=MODES, min_time=0.2, gui=True, seed=0):
+    """Runs every benchmark and returns {"meta": ..., "rates": ..., "timings": ...}.
+
+    Rates are operations per second (higher is better); timings are seconds (lower is better).
+    """
+    rng = random.Random(seed)
+    rates = {}
+    for name, benchmark in ENGINE_BENCHMARKS.items():
+        for game_mode in game_modes:
+            for board_size in board_sizes:
+                rates[f"{name}|{game_mode}|{board_size}"] = benchmark(board_size, game_mode, min_time, rng)
+
+    timings = {}
+    if gui:
+        display = start_virtual_display()
+        try:
+            timings = bench_create_board(board_sizes)
+        finally:
+            if display is not None:
+                stop_virtual_display(display)
+
+    meta = {"python": platform.python_version(), "platform": platform.platform(), "time": time.time()}
+    return {"meta": meta, "rates": rates, "timings": timings}
+
+
+def compare_results(baseline, current, threshold=0.1):
+    """Returns a list of (key, baseline, current, change) for results that regressed beyond the threshold.
+
+    change is the relative slowdown, e.g. 0.25 means 25% slower than the baseline.
+    """
+    regressions = []
+    for key, old in baseline.get("rates", {}).items():
+        new = current.get("rates", {}).get(key)
+        if new is None or not old:
+            continue
+        change = 1 - new / old
+        if change > threshold:
+            regressions.append((key, old, new, change))
+    for key, old in baseline.get("timings", {}).items():
+        new = current.get("timings", {}).get(key)
+        if new is None or not old:
+            continue
+        change = new / old - 1
+        if change > threshold:
+            regressions.append((key, old, new, change))
+    return regressions
+
+
+def format_results(results):
+    """Formats benchmark results as aligned text lines."""
+    lines = [f"{key:<32} {value:>14,.0f} /s" for key, value in sorted(results["rates"].items())]
+    lines += [f"{key:<32} {value * 1000:>14.2f} ms" for key, value in sorted(results["timings"].items())]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command-line entry point for running, saving and comparing benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark the SOS rules engine and board construction.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to run each benchmark")
+    parser.add_argument("--no-gui", action="store_true", help="skip the board construction benchmark")
+    parser.add_argument("--save", metavar="FILE", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative slowdown (default 0.1)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.modes, args.min_time, not args.no_gui)
+    print(format_results(results))
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare_results(baseline, results, args.threshold)
+        for key, old, new, change in regressions:
+            print(f"REGRESSION {key}: {old:.6g} -> {new:.6g} ({change:.0%} worse)")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+from functools import lru_cache
+from game_manager import GameManager
+from sos_lines import cell_triples
+
+# Translation tables turning a board string into binary digits of the S and O bitmasks
+S_DIGITS = str.maketrans(" SO", "010")
+O_DIGITS = str.maketrans(" SO", "001")
+
+
+@lru_cache(maxsize=None)
+def cell_masks(board_size):
+    """Maps each cell to the (s_mask, o_mask) pairs of every SOS line passing through it."""
+    return tuple(
+        tuple(((1 << a) | (1 << c), 1 << b) for a, b, c in triples)
+        for triples in cell_triples(board_size)
+    )
+
+
+class BitBoard:
+    """Stores S and O occupancy as two integer bitmasks, one bit per cell."""
+
+    __slots__ = ("board_size", "s_bits", "o_bits", "full_mask", "masks")
+
+    def __init__(self, board_size):
+        self.board_size = board_size
+        self.s_bits = 0
+        self.o_bits = 0
+        self.full_mask = (1 << (board_size * board_size)) - 1
+        self.masks = cell_masks(board_size)
+
+    def get(self, index):
+        """Returns the character stored at a flat cell index (' ' when empty)."""
+        bit = 1 << index
+        if self.s_bits & bit:
+            return 'S'
+        if self.o_bits & bit:
+            return 'O'
+        return ' '
+
+    def place(self, index, character):
+        """Sets the bit for the character at a flat cell index."""
+        if character == 'S':
+            self.s_bits |= 1 << index
+        else:
+            self.o_bits |= 1 << index
+
+    def clear(self, index):
+        """Clears the bit of a flat cell index in both masks."""
+        mask = ~(1 << index)
+        self.s_bits &= mask
+        self.o_bits &= mask
+
+    def count_sos(self, index):
+        """Counts the SOS lines through the cell that are currently complete."""
+        s_bits = self.s_bits
+        o_bits = self.o_bits
+        count = 0
+        for s_mask, o_mask in self.masks[index]:
+            if s_bits & s_mask == s_mask and o_bits & o_mask:
+                count += 1
+        return count
+
+    def is_full(self):
+        """Checks if every cell holds a character."""
+        return (self.s_bits | self.o_bits) == self.full_mask
+
+    def rows(self):
+        """Returns the board as a list of lists of characters."""
+        size = self.board_size
+        return [[self.get(row * size + col) for col in range(size)] for row in range(size)]
+
+
+class BitboardGameManager(GameManager):
+    """GameManager backed by a BitBoard instead of a list of lists."""
+
+    @property
+    def board(self):
+        """Read-only list-of-lists view of the board."""
+        return self.bitboard.rows()
+
+    def _new_board(self):
+        self.bitboard = BitBoard(self.board_size)
+
+    def get_board_value(self, row, col):
+        return self.bitboard.get(row * self.board_size + col)
+
+    def _place(self, row, col, character):
+        self.bitboard.place(row * self.board_size + col, character)
+
+    def _remove(self, row, col):
+        self.bitboard.clear(row * self.board_size + col)
+
+    def check_sos(self, row, col):
+        """Counts the SOS lines completed through the given row and col."""
+        if self.pattern is not None:
+            return GameManager.check_sos(self, row, col)  # Pattern modes use the compiled tables
+        return self.bitboard.count_sos(row * self.board_size + col)
+
+    def is_board_full(self):
+        """Checks if the entire board is filled."""
+        return self.bitboard.is_full()
+
+    def _board_letters(self):
+        return "".join(map(self.bitboard.get, range(self.board_size * self.board_size)))
+
+    def _load_cells(self, letters):
+        # Reversed so cell 0 becomes the lowest bit of the parsed binary number
+        self.bitboard.s_bits = int(letters[::-1].translate(S_DIGITS), 2)
+        self.bitboard.o_bits = int(letters[::-1].translate(O_DIGITS), 2)
@@ -0,0 +1,216 @@
+import argparse
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # Without NumPy the analyzer falls back to a per-line Python count
+    np = None
+
+from board_codec import LETTER_CODES, pack_letters
+from game_manager import ACTIVE, RED_TO_MOVE, SNAPSHOT_HEADER, SOS_OCCURRED
+from game_record import LETTER_FLAG, MOVE, iter_games
+from pattern_engine import line_windows, mode_code, mode_label, mode_rules
+from sos_lines import line_triples
+
+S, O = 1, 2
+
+if np is not None:
+    # One packed game_record move: flat cell, flags and SOS lines completed
+    MOVE_DTYPE = np.dtype([("cell", "<u4"), ("flags", "u1"), ("delta", "u1")])
+    assert MOVE_DTYPE.itemsize == MOVE.size
+
+
+def count_sos_lines(boards):
+    """Counts the complete SOS lines on one board or a stack of boards.
+
+    boards is an (..., n, n) array of cell codes (0 empty, 1 S, 2 O). Each
+    direction is checked with three shifted slices, so the whole stack is
+    counted in a handful of array operations. Returns an int for a single
+    board and an array of counts for a stack.
+    """
+    boards = np.asarray(boards)
+    s = boards == S
+    o = boards == O
+    total = (
+        (s[..., :, :-2] & o[..., :, 1:-1] & s[..., :, 2:]).sum(axis=(-2, -1))  # Horizontal
+        + (s[..., :-2, :] & o[..., 1:-1, :] & s[..., 2:, :]).sum(axis=(-2, -1))  # Vertical
+        + (s[..., :-2, :-2] & o[..., 1:-1, 1:-1] & s[..., 2:, 2:]).sum(axis=(-2, -1))  # Diagonal
+        + (s[..., :-2, 2:] & o[..., 1:-1, 1:-1] & s[..., 2:, :-2]).sum(axis=(-2, -1))  # Anti-diagonal
+    )
+    return int(total) if boards.ndim == 2 else total
+
+
+def count_sos_letters(letters, board_size):
+    """Counts the complete SOS lines of a board given as a string of ' ', 'S' and 'O', row by row."""
+    if np is not None:
+        codes = np.frombuffer(letters.encode("ascii"), dtype=np.uint8)
+        return count_sos_lines(((codes == ord('S')) + 2 * (codes == ord('O'))).reshape(board_size, board_size))
+    return sum(1 for a, b, c in line_triples(board_size)
+               if letters[b] == 'O' and letters[a] == 'S' and letters[c] == 'S')
+
+
+def count_word_letters(letters, board_size, word):
+    """Counts the lines spelling word, read either way, on a board given as a string of ' ', 'S' and 'O'."""
+    if word == "SOS":
+        return count_sos_letters(letters, board_size)
+    targets = {word, word[::-1]}
+    return sum(1 for window in line_windows(board_size, len(word))
+               if "".join([letters[cell] for cell in window]) in targets)
+
+
+def load_position(game_manager, rows, game_mode=None, current_player="Blue", sos_count=None):
+    """Loads an arbitrary board into a GameManager with consistent scores and game flags.
+
+    rows is a list of strings or lists of ' ', 'S' and 'O' (or '.' for an
+    empty cell). The SOS lines on the board, or the target words of a
+    pattern mode, are recounted. In General scoring sos_count gives each
+    player's share and must add up to the recount; it may be left out when
+    the board has no SOS. A Simple scoring board holding an SOS is loaded as
+    a finished game. Raises ValueError for malformed
+    boards or scores that do not match the board.
+    """
+    game_mode = game_mode or game_manager.game_mode
+    board_size = len(rows)
+    letters = "".join("".join(row) for row in rows).replace('.', ' ')
+    if board_size < 3 or len(letters) != board_size * board_size or any(len(row) != board_size for row in rows):
+        raise ValueError("The board must be square and at least 3x3")
+    if letters.strip(" SO"):
+        raise ValueError("Cells must be ' ', '.', 'S' or 'O'")
+    if current_player not in ("Blue", "Red"):
+        raise ValueError(f"Unknown player: {current_player}")
+
+    scoring_mode, word = mode_rules(game_mode)
+    total = count_word_letters(letters, board_size, word)
+    if scoring_mode == "General":
+        if sos_count is None:
+            if total:
+                raise ValueError(f"The board holds {total} SOS lines; give each player's sos_count")
+            sos_count = {"Blue": 0, "Red": 0}
+        if sos_count["Blue"] < 0 or sos_count["Red"] < 0 or sos_count["Blue"] + sos_count["Red"] != total:
+            raise ValueError(f"sos_count {sos_count} does not add up to the {total} SOS lines on the board")
+        active = ' ' in letters
+    else:
+        if sos_count is not None and any(sos_count.values()):
+            raise ValueError("Simple mode does not keep SOS counts")
+        sos_count = {"Blue": 0, "Red": 0}
+        active = total == 0 and ' ' in letters
+
+    flags = ((RED_TO_MOVE if current_player == "Red" else 0) | (ACTIVE if active else 0)
+             | (SOS_OCCURRED if total else 0))
+    game_manager.load_bytes(SNAPSHOT_HEADER.pack(mode_code(game_mode), board_size, flags,
+                                                 sos_count["Blue"], sos_count["Red"])
+                            + mode_label(game_mode) + pack_letters(letters))
+    return game_manager
+
+
+def _check_batch(records, first_index):
+    """Validates a list of GameRecords of one size and mode with array operations; returns the problems found."""
+    board_size = records[0].board_size
+    cells = board_size * board_size
+    moves = np.frombuffer(b"".join(bytes(record.data) for record in records), dtype=MOVE_DTYPE)
+    lengths = np.array([len(record) for record in records])
+    games = np.repeat(np.arange(len(records)), lengths)
+
+    problems = []
+    cell = moves["cell"].astype(np.int64)
+    bad = (cell >= cells) | (lengths[games] > cells)
+    for index in np.unique(games[bad]):
+        problems.append((first_index + int(index), "move outside the board"))
+    keep = ~np.isin(games, games[bad])
+    games, cell, moves = games[keep], cell[keep], moves[keep]
+
+    # Every cell may be played once per game
+    slots = games * cells + cell
+    unique_slots, counts = np.unique(slots, return_counts=True)
+    for index in np.unique(unique_slots[counts > 1] // cells):
+        problems.append((first_index + int(index), "cell played twice"))
+
+    boards = np.zeros((len(records), cells), dtype=np.uint8)
+    boards[games, cell] = np.where(moves["flags"] & LETTER_FLAG, O, S)
+    recounted = count_sos_lines(boards.reshape(len(records), board_size, board_size))
+    recorded = np.bincount(games, weights=moves["delta"], minlength=len(records)).astype(np.int64)
+    for index in np.nonzero(recounted != recorded)[0]:
+        problems.append((first_index + int(index),
+                         f"recorded {recorded[index]} SOS lines but the board holds {recounted[index]}"))
+
+    if mode_rules(records[0].game_mode)[0] == "Simple":
+        # A Simple game ends on its first SOS, so only the last move may score. The moves of games
+        # dropped above are gone and empty games have none, so the last moves are found from games itself
+        last = np.r_[games[1:] != games[:-1], np.ones(min(len(games), 1), dtype=bool)]
+        for index in np.unique(games[(moves["delta"] > 0) & ~last]):
+            problems.append((first_index + int(index), "play continued after the winning SOS"))
+    return problems
+
+
+def _check_game(record, index):
+    """Validates one GameRecord in pure Python; returns the problems found."""
+    board_size = record.board_size
+    letters = [' '] * (board_size * board_size)
+    recorded = 0
+    problems = []
+    raw_moves = list(record.raw_moves())
+    scoring_mode, word = mode_rules(record.game_mode)
+    simple = scoring_mode == "Simple"
+    for position, (cell, flags, delta) in enumerate(raw_moves):
+        if cell >= len(letters):
+            return [(index, "move outside the board")]
+        if letters[cell] != ' ':
+            problems.append((index, "cell played twice"))
+        letters[cell] = 'O' if flags & LETTER_FLAG else 'S'
+        recorded += delta
+        if simple and delta and position != len(raw_moves) - 1:
+            problems.append((index, "play continued after the winning SOS"))
+    recounted = count_word_letters("".join(letters), board_size, word)
+    if recounted != recorded:
+        problems.append((index, f"recorded {recorded} SOS lines but the board holds {recounted}"))
+    return problems
+
+
+def validate_records(path, batch_size=4096):
+    """Checks every game in a game_record file and returns (games checked, [(game index, problem)]).
+
+    Each game's final board is rebuilt from its moves and its SOS lines are
+    recounted; the total must equal the sum of the recorded per-move SOS
+    counts. Moves off the board, cells played twice and Simple games that
+    continue after an SOS are reported too. SOS games are checked in batches
+    with NumPy when it is installed.
+    """
+    problems = []
+    batch = []
+    checked = 0
+    for record in iter_games(path):
+        if np is None or mode_rules(record.game_mode)[1] != "SOS":
+            # The array recount only knows SOS; pattern mode games are checked one by one
+            problems.extend(_check_game(record, checked))
+            checked += 1
+            continue
+        batch.append(record)
+        if len(batch) == batch_size:
+            problems.extend(_check_batch(batch, checked))
+            checked += len(batch)
+            batch = []
+    if batch:
+        problems.extend(_check_batch(batch, checked))
+        checked += len(batch)
+    return checked, sorted(problems)
+
+
+def main(argv=None):
+    """Command-line entry point that validates game record files."""
+    parser = argparse.ArgumentParser(description="Recount SOS lines and validate recorded games.")
+    parser.add_argument("paths", nargs="+", help="game record files")
+    parser.add_argument("--batch-size", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for path in args.paths:
+        checked, problems = validate_records(path, args.batch_size)
+        for index, problem in problems:
+            print(f"{path}: game {index}: {problem}")
+        print(f"{path}: {checked} games checked, {len(problems)} problems")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+LETTERS = " SO"
+LETTER_CODES = {' ': 0, 'S': 1, 'O': 2}
+
+
+def packed_size(cell_count):
+    """Returns the number of bytes needed to pack the given number of cells."""
+    return (cell_count + 3) // 4
+
+
+def board_codes(game_manager):
+    """Returns the board as a flat list of cell codes (0 empty, 1 S, 2 O), row by row."""
+    size = game_manager.board_size
+    get = game_manager.get_board_value
+    return [LETTER_CODES[get(row, col)] for row in range(size) for col in range(size)]
+
+
+def pack_cells(codes):
+    """Packs cell codes at 2 bits per cell, four cells per byte, cell 0 in the lowest bits of byte 0."""
+    packed = bytearray(packed_size(len(codes)))
+    for index, code in enumerate(codes):
+        if code:
+            packed[index >> 2] |= code << ((index & 3) << 1)
+    return bytes(packed)
+
+
+def unpack_cells(data, cell_count):
+    """Unpacks cell_count 2-bit cell codes produced by pack_cells."""
+    return [(data[index >> 2] >> ((index & 3) << 1)) & 3 for index in range(cell_count)]
+
+
+# Every run of four letters and its packed byte, for packing and unpacking whole boards at once
+_QUADS = [a + b + c + d for d in LETTERS for c in LETTERS for b in LETTERS for a in LETTERS]
+_QUAD_BYTES = {quad: LETTER_CODES[quad[0]] | LETTER_CODES[quad[1]] << 2 | LETTER_CODES[quad[2]] << 4
+               | LETTER_CODES[quad[3]] << 6 for quad in _QUADS}
+_BYTE_QUADS = {byte: quad for quad, byte in _QUAD_BYTES.items()}
+
+
+def pack_letters(letters):
+    """Packs a string of ' ', 'S' and 'O' cells in the same layout as pack_cells."""
+    letters += " " * (-len(letters) % 4)
+    quad_bytes = _QUAD_BYTES
+    return bytes([quad_bytes[letters[index:index + 4]] for index in range(0, len(letters), 4)])
+
+
+def unpack_letters(data, cell_count, offset=0):
+    """Unpacks cell_count cells packed by pack_letters or pack_cells, starting at a byte offset, as a string."""
+    byte_quads = _BYTE_QUADS
+    end = offset + packed_size(cell_count)
+    return "".join([byte_quads[byte] for byte in data[offset:end]])[:cell_count]
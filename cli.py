@@ -0,0 +1,148 @@
+import argparse
+import random
+import re
+import subprocess
+import sys
+
+from game_manager import GameManager
+from pattern_engine import GAME_MODES
+
+# Modules whose import time is reported by the import-time command
+CORE_MODULES = ["game_manager", "simulate", "cli"]
+
+
+def format_board(game_manager):
+    """Renders the board as text with 1-based row and column numbers."""
+    size = game_manager.board_size
+    width = len(str(size))
+    lines = [" " * (width + 1) + " ".join(str(col + 1).rjust(width) for col in range(size))]
+    for row in range(size):
+        cells = " ".join((game_manager.get_board_value(row, col).strip() or ".").rjust(width) for col in range(size))
+        lines.append(f"{str(row + 1).rjust(width)} {cells}")
+    return "\n".join(lines)
+
+
+def make_player(name, time_limit):
+    """Returns a move function (game_manager, rng) -> (row, col, character) for a player name, or None for a human."""
+    if name == "human":
+        return None
+    if name == "alphabeta":
+        from ai_player import AlphaBetaPlayer
+        player = AlphaBetaPlayer(time_limit=time_limit)
+        return lambda game_manager, rng: player.choose_move(game_manager)
+    if name == "mcts":
+        from mcts_player import MCTSPlayer
+        player = MCTSPlayer(time_limit=time_limit)
+        return lambda game_manager, rng: player.choose_move(game_manager)
+    from simulate import POLICIES
+    return POLICIES[name]
+
+
+def read_human_move(game_manager, input_func=input):
+    """Prompts until the player enters a legal move as 'row col letter'."""
+    player = game_manager.get_current_player()
+    while True:
+        text = input_func(f"{player} move (row col S|O): ")
+        match = re.fullmatch(r"\s*(\d+)\s+(\d+)\s+([SsOo])\s*", text)
+        if not match:
+            print("Enter a move like: 2 3 S")
+            continue
+        row, col = int(match.group(1)) - 1, int(match.group(2)) - 1
+        if not (0 <= row < game_manager.board_size and 0 <= col < game_manager.board_size):
+            print("That cell is off the board.")
+        elif not game_manager.is_valid_move(row, col):
+            print("That cell is already taken.")
+        else:
+            return row, col, match.group(3).upper()
+
+
+def play(board_size, game_mode, blue, red, time_limit=1.0, seed=None, input_func=input):
+    """Plays one game in the terminal and returns the winner ("Blue", "Red" or "Draw")."""
+    game_manager = GameManager(board_size, game_mode)
+    game_manager.reset_game(board_size, game_mode)
+    players = {"Blue": make_player(blue, time_limit), "Red": make_player(red, time_limit)}
+    rng = random.Random(seed)
+
+    while True:
+        print(format_board(game_manager))
+        player = game_manager.get_current_player()
+        if players[player] is None:
+            row, col, character = read_human_move(game_manager, input_func)
+        else:
+            row, col, character = players[player](game_manager, rng)
+            print(f"{player} plays {character} at {row + 1} {col + 1}")
+        result = game_manager.make_move(row, col, character)
+        outcome = result["result"]
+
+        if outcome == "next_turn":
+            game_manager.switch_turn()
+        elif outcome == "continue" and not game_manager.is_board_full():
+            print(f"SOS! {player} scores and moves again.")
+        else:
+            break
+
+    print(format_board(game_manager))
+    if outcome == "win":
+        winner = result["winner"]
+        print(f"{winner} wins by creating the first SOS!")
+    elif outcome == "draw":
+        winner = "Draw"
+        print("The game is a draw! No SOS was created.")
+    else:
+        winner = result["winner"] if outcome == "end" else game_manager.end_game()["winner"]
+        scores = game_manager.sos_count
+        print(f"{'The game is a draw!' if winner == 'Draw' else winner + ' wins!'} "
+              f"(Blue: {scores['Blue']}, Red: {scores['Red']})")
+    return winner
+
+
+def measure_import_time(module):
+    """Returns the cumulative import time of a module in microseconds, measured in a fresh interpreter."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, check=True)
+    for line in completed.stderr.splitlines():
+        # Lines look like: "import time:       self |  cumulative | package"
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    return 0
+
+
+def main(argv=None):
+    """Command-line entry point: play in the terminal, simulate, open the GUI or report import times."""
+    parser = argparse.ArgumentParser(description="SOS game command line.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    player_names = ["human", "random", "greedy", "cautious", "alphabeta", "mcts"]
+    play_parser = commands.add_parser("play", help="play a game in the terminal")
+    play_parser.add_argument("--size", type=int, default=3)
+    play_parser.add_argument("--mode", default="Simple", choices=list(GAME_MODES))
+    play_parser.add_argument("--blue", default="human", choices=player_names)
+    play_parser.add_argument("--red", default="alphabeta", choices=player_names)
+    play_parser.add_argument("--time-limit", type=float, default=1.0, help="seconds per computer move")
+    play_parser.add_argument("--seed", type=int, default=None)
+
+    commands.add_parser("simulate", help="run headless self-play (see simulate.py --help)", add_help=False)
+    commands.add_parser("gui", help="open the graphical game")
+
+    import_parser = commands.add_parser("import-time", help="report module import times")
+    import_parser.add_argument("modules", nargs="*", default=CORE_MODULES)
+
+    args, rest = parser.parse_known_args(argv)
+    if args.command == "simulate":
+        from simulate import main as simulate_main
+        simulate_main(rest)
+    elif rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    elif args.command == "play":
+        play(args.size, args.mode, args.blue, args.red, args.time_limit, args.seed)
+    elif args.command == "gui":
+        from sos_game_gui import main as gui_main
+        gui_main()
+    else:
+        for module in args.modules:
+            print(f"{module:<20} {measure_import_time(module) / 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
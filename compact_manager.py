@@ -0,0 +1,280 @@
+import sys
+
+from board_codec import pack_letters, unpack_letters
+from game_manager import ACTIVE, RED_TO_MOVE, SNAPSHOT_HEADER, SOS_OCCURRED, GameManager
+from pattern_engine import cell_code_lines, mode_code, mode_label, mode_rules, read_mode
+from sos_lines import cell_triples
+
+LETTERS = " SO"
+LETTER_CODES = {'S': 1, 'O': 2}
+S_CODE = 1
+O_CODE = 2
+# Byte translation tables between board codes and snapshot letters
+CODES_TO_LETTERS = bytes.maketrans(b"\x00\x01\x02", b" SO")
+LETTERS_TO_CODES = bytes.maketrans(b" SO", b"\x00\x01\x02")
+
+
+class CompactGameManager:
+    """Memory-compact game state with the same playing API as GameManager.
+
+    The board is one flat bytearray (0 empty, 1 S, 2 O), the scores are two
+    integer fields and there is no per-instance __dict__, so an idle session
+    costs a few hundred bytes. Move history (undo/redo) and record writers are
+    not supported; use GameManager when those are needed.
+    """
+
+    __slots__ = ("board_size", "game_mode", "scoring_mode", "word", "current_player", "board", "empty_count",
+                 "is_game_active", "blue_score", "red_score", "sos_occurred")
+
+    def __init__(self, board_size=3, game_mode="Simple"):
+        self.board_size = board_size
+        self.game_mode = game_mode
+        self.scoring_mode, self.word = mode_rules(game_mode)
+        self.current_player = "Blue"
+        self.board = bytearray(board_size * board_size)
+        self.empty_count = board_size * board_size
+        self.is_game_active = False
+        self.blue_score = 0
+        self.red_score = 0
+        self.sos_occurred = False
+
+    def reset_game(self, board_size, game_mode):
+        """Resets the game with a new board size and game mode, reusing the board buffer when the size matches."""
+        cells = board_size * board_size
+        if len(self.board) == cells:
+            self.board[:] = bytes(cells)
+        else:
+            self.board = bytearray(cells)
+        self.board_size = board_size
+        self.game_mode = game_mode
+        self.scoring_mode, self.word = mode_rules(game_mode)
+        self.current_player = "Blue"
+        self.empty_count = cells
+        self.is_game_active = True
+        self.blue_score = 0
+        self.red_score = 0
+        self.sos_occurred = False
+
+    @property
+    def sos_count(self):
+        """SOS counts per player, as a new dict (matching GameManager.sos_count)."""
+        return {"Blue": self.blue_score, "Red": self.red_score}
+
+    def get_board_value(self, row, col):
+        """Returns the character at the given row and col (' ' when empty)."""
+        return LETTERS[self.board[row * self.board_size + col]]
+
+    def get_empty_cells(self):
+        """Returns the (row, col) positions that are still empty."""
+        size = self.board_size
+        return [divmod(index, size) for index, code in enumerate(self.board) if not code]
+
+    def is_board_full(self):
+        """Checks if the entire board is filled."""
+        return self.empty_count == 0
+
+    is_board_filled = is_board_full
+
+    def is_valid_move(self, row, col):
+        """Checks if the game is active and the given cell is empty."""
+        return self.is_game_active and not self.board[row * self.board_size + col]
+
+    def make_move(self, row, col, character):
+        """Places the character, checks for SOS and returns the same results as GameManager.make_move."""
+        index = row * self.board_size + col
+        if not self.is_game_active or self.board[index]:
+            return False
+
+        self.board[index] = LETTER_CODES[character]
+        self.empty_count -= 1
+        sos_created = self._count_sos(index)
+        if sos_created:
+            self.sos_occurred = True
+
+        if self.scoring_mode == "Simple" and sos_created:
+            self.is_game_active = False
+            return {"result": "win", "winner": self.current_player}
+
+        if self.scoring_mode == "General" and sos_created:
+            if self.current_player == "Blue":
+                self.blue_score += sos_created
+            else:
+                self.red_score += sos_created
+            return {"result": "continue"}
+
+        if self.empty_count == 0:
+            if self.scoring_mode == "General":
+                return {"result": "end", "winner": self._general_winner(),
+                        "blue_score": self.blue_score, "red_score": self.red_score}
+            return {"result": "draw"}
+
+        return {"result": "next_turn"}
+
+    def _count_sos(self, index):
+        board = self.board
+        sos_count = 0
+        if self.word != "SOS":
+            # Pattern modes: every line of the mode's word through the cell, looked up from the shared cached table
+            for window, target in cell_code_lines(self.word, self.board_size)[index]:
+                if all(board[cell] == code for cell, code in zip(window, target)):
+                    sos_count += 1
+            return sos_count
+        for a, b, c in cell_triples(self.board_size)[index]:
+            if board[b] == O_CODE and board[a] == S_CODE and board[c] == S_CODE:
+                sos_count += 1
+        return sos_count
+
+    def _general_winner(self):
+        if self.blue_score > self.red_score:
+            return "Blue"
+        if self.red_score > self.blue_score:
+            return "Red"
+        return "Draw"
+
+    def check_sos(self, row, col):
+        """Counts every SOS line completed through the given row and col."""
+        return self._count_sos(row * self.board_size + col)
+
+    def count_potential_sos(self, row, col, character):
+        """Counts the SOS lines that placing the character at the given empty cell would complete."""
+        index = row * self.board_size + col
+        board = self.board
+        board[index] = LETTER_CODES[character]
+        sos_count = self._count_sos(index)
+        board[index] = 0
+        return sos_count
+
+    def switch_turn(self):
+        """Switches the turn between players."""
+        self.current_player = "Red" if self.current_player == "Blue" else "Blue"
+
+    def end_game(self):
+        """Ends the game by determining the winner based on game mode and returning the result."""
+        self.is_game_active = False
+        result = {"winner": None, "blue_score": self.blue_score, "red_score": self.red_score}
+        if self.scoring_mode == "General" and self.empty_count == 0:
+            result["winner"] = self._general_winner()
+        return result
+
+    def copy(self):
+        """Returns an independent copy of the game state."""
+        clone = CompactGameManager.__new__(CompactGameManager)
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.board = bytearray(self.board)
+        return clone
+
+    def get_current_player(self):
+        """Returns the current player."""
+        return self.current_player
+
+    def to_bytes(self):
+        """Returns a snapshot in the same format as GameManager.to_bytes."""
+        flags = ((RED_TO_MOVE if self.current_player == "Red" else 0) | (ACTIVE if self.is_game_active else 0)
+                 | (SOS_OCCURRED if self.sos_occurred else 0))
+        header = SNAPSHOT_HEADER.pack(mode_code(self.game_mode), self.board_size, flags,
+                                      self.blue_score, self.red_score)
+        return header + mode_label(self.game_mode) + pack_letters(self.board.translate(CODES_TO_LETTERS).decode("ascii"))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Creates a game from a snapshot made by to_bytes."""
+        game_manager = cls(SNAPSHOT_HEADER.unpack_from(data)[1])
+        game_manager.load_bytes(data)
+        return game_manager
+
+    def load_bytes(self, data):
+        """Restores a snapshot into this game, reusing the board buffer when the size matches."""
+        mode_number, board_size, flags, self.blue_score, self.red_score = SNAPSHOT_HEADER.unpack_from(data)
+        game_mode, start = read_mode(mode_number, data, SNAPSHOT_HEADER.size)
+        letters = unpack_letters(data, board_size * board_size, start).encode("ascii")
+        if len(self.board) == len(letters):
+            self.board[:] = letters.translate(LETTERS_TO_CODES)
+        else:
+            self.board = bytearray(letters.translate(LETTERS_TO_CODES))
+        self.board_size = board_size
+        self.empty_count = letters.count(b" ")
+        self.game_mode = game_mode
+        self.scoring_mode, self.word = mode_rules(self.game_mode)
+        self.current_player = "Red" if flags & RED_TO_MOVE else "Blue"
+        self.is_game_active = bool(flags & ACTIVE)
+        self.sos_occurred = bool(flags & SOS_OCCURRED)
+
+
+def session_size(game_manager):
+    """Returns the bytes held by one game state object and the containers it owns.
+
+    Shared objects such as interned strings, small integers and the cached
+    line tables are not counted, since they cost nothing per session.
+    """
+    seen = set()
+
+    def size_of(value):
+        if id(value) in seen or isinstance(value, (str, int, bool, float, type(None))):
+            return 0
+        seen.add(id(value))
+        total = sys.getsizeof(value)
+        if isinstance(value, dict):
+            total += sum(size_of(key) + size_of(item) for key, item in value.items())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            total += sum(size_of(item) for item in value)
+        return total
+
+    total = sys.getsizeof(game_manager)
+    attributes = getattr(game_manager, "__dict__", None)
+    if attributes is not None:
+        total += size_of(attributes)
+    for name in getattr(type(game_manager), "__slots__", ()):
+        total += size_of(getattr(game_manager, name, None))
+    return total
+
+
+class SessionPool:
+    """Reuses finished game objects for new sessions instead of allocating fresh ones.
+
+    Released objects are kept per board size so acquire can reset one whose
+    board buffer already has the right length.
+    """
+
+    def __init__(self, factory=CompactGameManager, max_idle=1024):
+        self.factory = factory
+        self.max_idle = max_idle
+        self.idle = {}  # board_size -> list of released game objects
+        self.idle_count = 0
+
+    def acquire(self, board_size, game_mode):
+        """Returns a game object reset for a new game of the given size and mode."""
+        free = self.idle.get(board_size)
+        if free:
+            game_manager = free.pop()
+            self.idle_count -= 1
+        else:
+            game_manager = self.factory(board_size, game_mode)
+        game_manager.reset_game(board_size, game_mode)
+        return game_manager
+
+    def release(self, game_manager):
+        """Returns a finished game object to the pool, dropping it if the pool is full."""
+        if self.idle_count < self.max_idle:
+            game_manager.is_game_active = False
+            self.idle.setdefault(game_manager.board_size, []).append(game_manager)
+            self.idle_count += 1
+
+    def __len__(self):
+        return self.idle_count
+
+
+def main():
+    """Prints the measured bytes per session for GameManager and CompactGameManager."""
+    print(f"{'size':>4} {'GameManager':>12} {'Compact':>8}")
+    for board_size in (3, 5, 8, 10, 15, 20):
+        sizes = []
+        for game_class in (GameManager, CompactGameManager):
+            game_manager = game_class(board_size, "General")
+            game_manager.reset_game(board_size, "General")
+            sizes.append(session_size(game_manager))
+        print(f"{board_size:>4} {sizes[0]:>12} {sizes[1]:>8}")
+
+
+if __name__ == "__main__":
+    main()
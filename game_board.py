@@ -42,3 +42,99 @@ class GameBoard:
                 except tk.TclError:
                     # Button no longer exists, skip disabling
                     continue
+
+
+class CanvasGameBoard:
+    """Draws the game board on a single canvas instead of one button per cell.
+
+    Offers the same update_button/disable_buttons interface as GameBoard.
+    Clicks are mapped to cells from their coordinates, and each update only
+    touches the text item of the cell that changed.
+    """
+
+    def __init__(self, parent, board_size, on_click_callback, cell_size=40):
+        self.parent = parent
+        self.board_size = board_size
+        self.on_click_callback = on_click_callback
+        self.cell_size = cell_size
+        self.canvas = None
+        self.cell_items = []
+        self.highlight_items = []
+        self.enabled = False
+        self.create_board()
+
+    def create_board(self):
+        """Creates the grid on a fresh canvas."""
+        # Clear any existing board elements
+        for widget in self.parent.winfo_children():
+            widget.destroy()
+
+        pixels = self.board_size * self.cell_size
+        self.canvas = tk.Canvas(self.parent, width=pixels + 1, height=pixels + 1, bg="white", highlightthickness=0)
+        self.canvas.grid(row=0, column=0, padx=5, pady=5)
+        for i in range(self.board_size + 1):
+            offset = i * self.cell_size
+            self.canvas.create_line(offset, 0, offset, pixels, fill="gray")
+            self.canvas.create_line(0, offset, pixels, offset, fill="gray")
+
+        # Text items are created the first time a cell is drawn
+        self.cell_items = [[None] * self.board_size for _ in range(self.board_size)]
+        self.highlight_items = []
+        self.canvas.bind("<Button-1>", self.on_canvas_click)
+        self.enabled = True
+
+    def cell_center(self, row, col):
+        """Returns the canvas coordinates of the centre of a cell."""
+        half = self.cell_size / 2
+        return col * self.cell_size + half, row * self.cell_size + half
+
+    def on_canvas_click(self, event):
+        """Maps a click to its cell and forwards it to the click callback."""
+        if not self.enabled:
+            return
+        row = int(self.canvas.canvasy(event.y)) // self.cell_size
+        col = int(self.canvas.canvasx(event.x)) // self.cell_size
+        if 0 <= row < self.board_size and 0 <= col < self.board_size:
+            self.on_click_callback(row, col)
+
+    def update_button(self, row, col, text):
+        """Redraws the letter of a single cell."""
+        item = self.cell_items[row][col]
+        if item is None:
+            x, y = self.cell_center(row, col)
+            font_size = max(8, self.cell_size // 2)
+            self.cell_items[row][col] = self.canvas.create_text(x, y, text=text, font=("Arial", font_size, "bold"))
+        else:
+            self.canvas.itemconfigure(item, text=text)
+
+    def draw_sos_line(self, start, end, color):
+        """Draws a line through a completed SOS from the start cell to the end cell and returns its item."""
+        x1, y1 = self.cell_center(*start)
+        x2, y2 = self.cell_center(*end)
+        return self.canvas.create_line(x1, y1, x2, y2, fill=color, width=3)
+
+    def highlight_cells(self, cells, color):
+        """Replaces the current cell highlights with shaded squares on the given (row, col) cells."""
+        self.erase_items(self.highlight_items)
+        size = self.cell_size
+        self.highlight_items = [
+            self.canvas.create_rectangle(col * size + 1, row * size + 1, (col + 1) * size, (row + 1) * size,
+                                         fill=color, outline="")
+            for row, col in cells
+        ]
+        for item in self.highlight_items:
+            self.canvas.tag_lower(item)
+
+    def erase_items(self, items):
+        """Deletes canvas items such as SOS lines."""
+        for item in items:
+            self.canvas.delete(item)
+
+    def disable_buttons(self):
+        """Ignores further clicks after the game ends."""
+        self.enabled = False
+        try:
+            self.canvas.configure(bg="#eeeeee")
+        except (tk.TclError, AttributeError):
+            # Canvas no longer exists or was never created
+            pass
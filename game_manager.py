@@ -1,3 +1,16 @@
+import struct
+
+from board_codec import pack_letters, unpack_letters
+from pattern_engine import game_rules, mode_code, mode_label, read_mode
+from sos_lines import cell_coordinates, cell_triples_rc
+
+# Snapshot header: game mode code (pattern_engine.mode_code), board size, flags, Blue score, Red score;
+# the mode's pattern_engine.mode_label and the 2-bit packed board follow
+SNAPSHOT_HEADER = struct.Struct("<BHBII")
+RED_TO_MOVE = 1
+ACTIVE = 2
+SOS_OCCURRED = 4
+
 class GameManager:
     """Manages the game state, player turns, and game logic for SOS."""
 
@@ -5,55 +18,122 @@ class GameManager:
         """Initializes the game manager with players, board, and game mode."""
         self.board_size = board_size
         self.game_mode = game_mode
+        # Simple or General scoring, and the compiled target word for pattern modes (None for plain SOS)
+        self.scoring_mode, self.pattern = game_rules(game_mode, board_size)
         self.current_player = "Blue"  # Start with Blue player
-        self.board = [[' ' for _ in range(board_size)] for _ in range(board_size)]  # Initialize empty board
+        self._new_board()  # Initialize empty board
+        self._reset_empty_cells()
         self.is_game_active = False  # Game active flag
         self.sos_count = {"Blue": 0, "Red": 0}  # Track SOS counts for each player in General mode
         self.sos_occurred = False  # Track if any SOS has occurred
+        self.recorder = None  # Optional GameRecordWriter that receives every move
+        self.undo_stack = []  # Per-move deltas for unmake_move
+        self.redo_stack = []  # Undone moves for redo_move
+        self.threats = None  # Threat map, built on first query by the threat map methods
 
     def reset_game(self, board_size, game_mode):
         """Resets the game with a new board size and game mode."""
         self.board_size = board_size
         self.game_mode = game_mode
-        self.board = [[' ' for _ in range(board_size)] for _ in range(board_size)]
+        self.scoring_mode, self.pattern = game_rules(game_mode, board_size)
+        self._new_board()
+        self._reset_empty_cells()
         self.current_player = "Blue"
         self.is_game_active = True
         self.sos_count = {"Blue": 0, "Red": 0}  # Reset SOS counters for a new game
         self.sos_occurred = False  # Reset SOS tracker for a new game
+        self.undo_stack = []
+        self.redo_stack = []
+        self.threats = None
+        if self.recorder is not None:
+            self.recorder.start_game(board_size, game_mode)
+
+    def _new_board(self):
+        """Allocates an empty board for the current board size."""
+        self.board = [[' ' for _ in range(self.board_size)] for _ in range(self.board_size)]
+
+    def get_board_value(self, row, col):
+        """Returns the character at the given row and col (' ' when empty)."""
+        return self.board[row][col]
+
+    def _place(self, row, col, character):
+        """Stores the character at the given row and col."""
+        self.board[row][col] = character
+
+    def _remove(self, row, col):
+        """Clears the character at the given row and col."""
+        self.board[row][col] = ' '
+
+    def _reset_empty_cells(self):
+        """Marks every cell as empty in the incremental empty-cell tracker."""
+        size = self.board_size
+        self.empty_cells = {(row, col) for row in range(size) for col in range(size)}
+        self.empty_count = size * size
+
+    def _mark_filled(self, row, col):
+        """Removes a newly filled cell from the empty-cell tracker."""
+        self.empty_cells.discard((row, col))
+        self.empty_count -= 1
+
+    def _mark_empty(self, row, col):
+        """Returns a cleared cell to the empty-cell tracker."""
+        self.empty_cells.add((row, col))
+        self.empty_count += 1
+
+    def get_empty_cells(self):
+        """Returns the (row, col) positions that are still empty."""
+        return list(self.empty_cells)
 
     def is_board_full(self):
         """Checks if the entire board is filled."""
-        for row in self.board:
-            if ' ' in row:
-                return False
-        return True
+        return self.empty_count == 0
     
+    def is_valid_move(self, row, col):
+        """Checks if the game is active and the given cell is empty."""
+        return self.is_game_active and self.get_board_value(row, col) == ' '
+
     def make_move(self, row, col, character):
         """Attempts to place the selected character on the board, checks for SOS, and determines the game result."""
-        if self.board[row][col] != ' ' or not self.is_game_active:
+        if not self.is_valid_move(row, col):
             return False  # Invalid move
 
         # Place the selected character
-        self.board[row][col] = character
+        self._place(row, col, character)
+        self._mark_filled(row, col)
         sos_created = self.check_sos(row, col)
+        sos_occurred = self.sos_occurred
+        if sos_created:
+            self.sos_occurred = True
+        if self.threats is not None:
+            self._update_threats(row, col)
+        if self.recorder is not None:
+            self.recorder.record_move(row, col, character, self.current_player, sos_created)
+        self.undo_stack.append((row, col, character, self.current_player, sos_created,
+                                sos_occurred, self.is_game_active))
+        if self.redo_stack:
+            self.redo_stack = []  # A new move invalidates the undone ones
 
         # Check for Simple Game Mode win condition
-        if self.game_mode == "Simple" and sos_created:
+        if self.scoring_mode == "Simple" and sos_created:
             self.is_game_active = False
+            self._finish_record()
             return {"result": "win", "winner": self.current_player}
 
         # General Game Mode: Update SOS count if an SOS is created
-        if self.game_mode == "General" and sos_created:
+        if self.scoring_mode == "General" and sos_created:
             self.sos_count[self.current_player] += sos_created
+            if self.is_board_full():
+                self._finish_record()  # The scoring move filled the board, so the game is over
             # Return "continue" to allow the player to take another turn
             return {"result": "continue"}
 
         # Check if board is full to determine end game result
         if self.is_board_full():
+            self._finish_record()
             blue_score = self.sos_count["Blue"]
             red_score = self.sos_count["Red"]
 
-            if self.game_mode == "General":
+            if self.scoring_mode == "General":
                 # Determine the winner based on SOS count
                 if blue_score > red_score:
                     winner = "Blue"
@@ -71,96 +151,201 @@ class GameManager:
 
 
 
+    def unmake_move(self):
+        """Takes back the last move, restoring the cell, player to move, scores and game flags.
+
+        Returns False if there is no move to take back.
+        """
+        if not self.undo_stack:
+            return False
+        row, col, character, player, sos_created, sos_occurred, is_game_active = self.undo_stack.pop()
+        self.redo_stack.append((row, col, character, player, self.current_player))
+        self._remove(row, col)
+        self._mark_empty(row, col)
+        if self.threats is not None:
+            self._update_threats(row, col)
+        if self.scoring_mode == "General":
+            self.sos_count[player] -= sos_created
+        self.current_player = player
+        self.sos_occurred = sos_occurred
+        self.is_game_active = is_game_active
+        if self.recorder is not None:
+            self.recorder.pop_move()
+        return True
+
+    def redo_move(self):
+        """Replays the last move taken back and returns its make_move result, or False if there is none.
+
+        The player to move is restored to what it was before the move was taken back.
+        """
+        if not self.redo_stack:
+            return False
+        row, col, character, player, next_player = self.redo_stack.pop()
+        redo_stack = self.redo_stack
+        self.current_player = player
+        result = self.make_move(row, col, character)
+        self.redo_stack = redo_stack
+        self.current_player = next_player
+        return result
+
+    def _finish_record(self):
+        """Writes the finished game to the recorder, if one is attached."""
+        if self.recorder is not None:
+            self.recorder.end_game()
+
     def switch_turn(self):
         """Switches the turn between players."""
         self.current_player = "Red" if self.current_player == "Blue" else "Blue"
 
+    def _triples_through(self, row, col):
+        """Returns the ((row, col), (row, col), (row, col)) line triples passing through the given cell."""
+        return cell_triples_rc(self.board_size)[row][col]
+
     def check_sos(self, row, col):
-        """Checks if an SOS pattern is created at the given row and col."""
-        sos_count = 0
+        """Counts every SOS line completed through the given row and col.
 
-        # Horizontal SOS (left-right)
-        if col - 1 >= 0 and col + 1 < self.board_size:
-            if self.board[row][col - 1] == 'S' and self.board[row][col] == 'O' and self.board[row][col + 1] == 'S':
+        In pattern modes the lines are the mode's target word instead.
+        """
+        if self.pattern is not None:
+            return self.pattern.count(self.get_board_value, row, col, self.get_board_value(row, col))
+        board = self.board
+        sos_count = 0
+        for (a_row, a_col), (b_row, b_col), (c_row, c_col) in self._triples_through(row, col):
+            if board[b_row][b_col] == 'O' and board[a_row][a_col] == 'S' and board[c_row][c_col] == 'S':
                 sos_count += 1
-                return sos_count
+        return sos_count
 
-        # Vertical SOS (up-down)
-        if row - 1 >= 0 and row + 1 < self.board_size:
-            if self.board[row - 1][col] == 'S' and self.board[row][col] == 'O' and self.board[row + 1][col] == 'S':
-                sos_count += 1
-                return sos_count
-            
-        # Diagonal SOS (top-left to bottom-right)
-        if row - 1 >= 0 and col - 1 >= 0 and row + 1 < self.board_size and col + 1 < self.board_size:
-            if self.board[row - 1][col - 1] == 'S' and self.board[row][col] == 'O' and self.board[row + 1][col + 1] == 'S':
-                sos_count += 1
-                return sos_count
-            
-        # Diagonal SOS (bottom-left to top-right)
-        if row + 1 < self.board_size and col - 1 >= 0 and row - 1 >= 0 and col + 1 < self.board_size:
-            if self.board[row + 1][col - 1] == 'S' and self.board[row][col] == 'O' and self.board[row - 1][col + 1] == 'S':
-                sos_count += 1
-                return sos_count
-            
-        # "OSO" pattern horizontally (left-right)
-        if col - 2 >= 0:
-            if self.board[row][col - 2] == 'S' and self.board[row][col - 1] == 'O' and self.board[row][col] == 'S':
-                sos_count += 1
-        if col + 2 < self.board_size:
-            if self.board[row][col] == 'S' and self.board[row][col + 1] == 'O' and self.board[row][col + 2] == 'S':
-                sos_count += 1
-                return sos_count
-            
-        # "OSO" pattern vertically (up-down)
-        if row - 2 >= 0:
-            if self.board[row - 2][col] == 'S' and self.board[row - 1][col] == 'O' and self.board[row][col] == 'S':
-                sos_count += 1
-        if row + 2 < self.board_size:
-            if self.board[row][col] == 'S' and self.board[row + 1][col] == 'O' and self.board[row + 2][col] == 'S':
-                sos_count += 1
-                return sos_count
-            
-        # "OSO" pattern diagonally (top-left to bottom-right)
-        if row - 2 >= 0 and col - 2 >= 0:
-            if self.board[row - 2][col - 2] == 'S' and self.board[row - 1][col - 1] == 'O' and self.board[row][col] == 'S':
-                sos_count += 1
-                return sos_count
-            
-        if row + 2 < self.board_size and col + 2 < self.board_size:
-            if self.board[row][col] == 'S' and self.board[row + 1][col + 1] == 'O' and self.board[row + 2][col + 2] == 'S':
-                sos_count += 1
-                return sos_count
-            
-        # "OSO" pattern diagonally (bottom-left to top-right)
-        if row + 2 < self.board_size and col - 2 >= 0:
-            if self.board[row + 2][col - 2] == 'S' and self.board[row + 1][col - 1] == 'O' and self.board[row][col] == 'S':
-                sos_count += 1
-                return sos_count
-            
-        if row - 2 >= 0 and col + 2 < self.board_size:
-            if self.board[row][col] == 'S' and self.board[row - 1][col + 1] == 'O' and self.board[row - 2][col + 2] == 'S':
+    def get_sos_lines(self, row, col):
+        """Returns the (row, col) cells of every complete SOS through the given cell, first cell to last.
+
+        SOS lines are (start, middle, end) triples; pattern modes return whole windows.
+        """
+        get = self.get_board_value
+        if self.pattern is not None:
+            return self.pattern.matches(get, row, col)
+        return [(a, b, c) for a, b, c in self._triples_through(row, col)
+                if get(*b) == 'O' and get(*a) == 'S' and get(*c) == 'S']
+
+    def count_potential_sos(self, row, col, character):
+        """Counts the SOS lines that placing the character at the given empty cell would complete."""
+        get = self.get_board_value
+        if self.pattern is not None:
+            return self.pattern.count(get, row, col, character)
+        cell = (row, col)
+        sos_count = 0
+        for a, b, c in self._triples_through(row, col):
+            if b == cell:
+                if character == 'O' and get(*a) == 'S' and get(*c) == 'S':
+                    sos_count += 1
+            elif character == 'S' and get(*b) == 'O' and get(*(c if a == cell else a)) == 'S':
                 sos_count += 1
-                return sos_count
-          
         return sos_count
 
+    def _cell_threats(self, row, col):
+        """Returns (S lines completed, O lines completed, S lines opened, O lines opened) for an empty cell.
+
+        A line is opened when the letter leaves it one move away from an SOS.
+        """
+        get = self.get_board_value
+        if self.pattern is not None:
+            s_score, s_open = self.pattern.threats(get, row, col, 'S')
+            o_score, o_open = self.pattern.threats(get, row, col, 'O')
+            return s_score, o_score, s_open, o_open
+        cell = (row, col)
+        s_score = o_score = s_open = o_open = 0
+        for a, b, c in self._triples_through(row, col):
+            if b == cell:
+                first, last = get(*a), get(*c)
+                if first == 'S' and last == 'S':
+                    o_score += 1
+                elif (first, last) in (('S', ' '), (' ', 'S')):
+                    o_open += 1
+            else:
+                middle, end = get(*b), get(*(c if a == cell else a))
+                if middle == 'O' and end == 'S':
+                    s_score += 1
+                elif (middle, end) in (('O', ' '), (' ', 'S')):
+                    s_open += 1
+        return s_score, o_score, s_open, o_open
+
+    def _update_threats(self, row, col):
+        """Refreshes the threat map for the cells sharing a line with a cell that was just filled or cleared."""
+        threats = self.threats
+        get = self.get_board_value
+        lines = self._triples_through(row, col) if self.pattern is None else self.pattern.windows_through[row][col]
+        cells = {cell for line in lines for cell in line}
+        cells.add((row, col))
+        for cell in cells:
+            entry = self._cell_threats(*cell) if get(*cell) == ' ' else None
+            if entry is not None and any(entry):
+                threats[cell] = entry
+            else:
+                threats.pop(cell, None)
+
+    def get_threat_map(self):
+        """Returns {(row, col): (S lines completed, O lines completed, S lines opened, O lines opened)}.
+
+        Only empty cells with a non-zero entry are listed. The map is built the
+        first time it is asked for and then kept up to date by make_move and
+        unmake_move, which only revisit the cells sharing a line with the move.
+        """
+        if self.threats is None:
+            self.threats = {}
+            for row, col in self.get_empty_cells():
+                entry = self._cell_threats(row, col)
+                if any(entry):
+                    self.threats[(row, col)] = entry
+        return self.threats
+
+    def scoring_moves(self):
+        """Returns (row, col, character, sos_count) for every move that completes at least one SOS."""
+        moves = []
+        for (row, col), (s_score, o_score, _, _) in self.get_threat_map().items():
+            if s_score:
+                moves.append((row, col, 'S', s_score))
+            if o_score:
+                moves.append((row, col, 'O', o_score))
+        return moves
+
+    def unsafe_moves(self):
+        """Returns (row, col, character) for non-scoring moves that leave the opponent a new SOS to complete."""
+        moves = []
+        for (row, col), (s_score, o_score, s_open, o_open) in self.get_threat_map().items():
+            if s_open and not s_score:
+                moves.append((row, col, 'S'))
+            if o_open and not o_score:
+                moves.append((row, col, 'O'))
+        return moves
+
+    def safe_moves(self):
+        """Returns (row, col, character) for moves that neither score nor open a new SOS for the opponent."""
+        threats = self.get_threat_map()
+        moves = []
+        for row, col in self.get_empty_cells():
+            entry = threats.get((row, col))
+            if entry is None:
+                moves.append((row, col, 'S'))
+                moves.append((row, col, 'O'))
+            else:
+                if not (entry[0] or entry[2]):
+                    moves.append((row, col, 'S'))
+                if not (entry[1] or entry[3]):
+                    moves.append((row, col, 'O'))
+        return moves
+
     def is_board_filled(self):
         """Checks if the entire board is filled."""
-        for row in self.board:
-            for cell in row:
-                if cell == ' ':  # Found an empty cell
-                    return False
-        return True
+        return self.empty_count == 0
 
     def end_game(self):
         """Ends the game by determining the winner based on game mode and returning the result."""
         self.is_game_active = False
+        self._finish_record()
         blue_score = self.sos_count["Blue"]
         red_score = self.sos_count["Red"]
         result = {"winner": None, "blue_score": blue_score, "red_score": red_score}
 
-        if self.game_mode == "General" and self.is_board_full():
+        if self.scoring_mode == "General" and self.is_board_full():
             # Determine the winner based on SOS count
             if blue_score > red_score:
                 result["winner"] = "Blue"
@@ -171,6 +356,79 @@ class GameManager:
 
         return result
     
+    def copy(self):
+        """Returns an independent copy of the game state."""
+        clone = self.__class__(self.board_size, self.game_mode)
+        for row in range(self.board_size):
+            for col in range(self.board_size):
+                character = self.get_board_value(row, col)
+                if character != ' ':
+                    clone._place(row, col, character)
+        clone.empty_cells = set(self.empty_cells)
+        clone.empty_count = self.empty_count
+        clone.current_player = self.current_player
+        clone.is_game_active = self.is_game_active
+        clone.sos_count = dict(self.sos_count)
+        clone.sos_occurred = self.sos_occurred
+        return clone
+
     def get_current_player(self):
         """Returns the current player."""
         return self.current_player
+
+    def _board_letters(self):
+        """Returns the board as one string of ' ', 'S' and 'O', row by row."""
+        return "".join(["".join(row) for row in self.board])
+
+    def _load_cells(self, letters):
+        """Overwrites every cell from a string made by _board_letters, reusing the board storage."""
+        size = self.board_size
+        board = self.board
+        for row in range(size):
+            board[row][:] = letters[row * size:(row + 1) * size]
+
+    def _load_empty_cells(self, letters):
+        """Rebuilds the empty-cell tracker from a string made by _board_letters."""
+        self.empty_cells = {cell for cell, character in zip(cell_coordinates(self.board_size), letters)
+                            if character == ' '}
+        self.empty_count = len(self.empty_cells)
+
+    def to_bytes(self):
+        """Returns a compact snapshot of the game state: a small header and the board at 2 bits per cell.
+
+        Snapshots are immutable bytes, so equal positions can be used as
+        dictionary keys. Move history (undo/redo) is not included.
+        """
+        cells = pack_letters(self._board_letters())
+        flags = ((RED_TO_MOVE if self.current_player == "Red" else 0) | (ACTIVE if self.is_game_active else 0)
+                 | (SOS_OCCURRED if self.sos_occurred else 0))
+        header = SNAPSHOT_HEADER.pack(mode_code(self.game_mode), self.board_size, flags,
+                                      self.sos_count["Blue"], self.sos_count["Red"])
+        return header + mode_label(self.game_mode) + cells
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Creates a game from a snapshot made by to_bytes."""
+        game_manager = cls(SNAPSHOT_HEADER.unpack_from(data)[1])
+        game_manager.load_bytes(data)
+        return game_manager
+
+    def load_bytes(self, data):
+        """Restores a snapshot made by to_bytes into this game, reusing the board when the size matches."""
+        mode_number, board_size, flags, blue_score, red_score = SNAPSHOT_HEADER.unpack_from(data)
+        game_mode, start = read_mode(mode_number, data, SNAPSHOT_HEADER.size)
+        letters = unpack_letters(data, board_size * board_size, start)
+        if board_size != self.board_size:
+            self.board_size = board_size
+            self._new_board()
+        self._load_cells(letters)
+        self._load_empty_cells(letters)
+        self.game_mode = game_mode
+        self.scoring_mode, self.pattern = game_rules(self.game_mode, board_size)
+        self.current_player = "Red" if flags & RED_TO_MOVE else "Blue"
+        self.is_game_active = bool(flags & ACTIVE)
+        self.sos_occurred = bool(flags & SOS_OCCURRED)
+        self.sos_count = {"Blue": blue_score, "Red": red_score}
+        self.undo_stack = []
+        self.redo_stack = []
+        self.threats = None
@@ -0,0 +1,205 @@
+import mmap
+import os
+import struct
+from array import array
+
+from pattern_engine import NAMED_MODE, mode_code, mode_label, read_mode
+
+# File header: magic, format version, game mode code (pattern_engine.mode_code), board size;
+# the mode's pattern_engine.mode_label follows
+HEADER = struct.Struct("<4sBBH")
+MAGIC = b"SOSR"
+VERSION = 1
+
+# Each game is a move count followed by that many fixed-size move records
+GAME_HEADER = struct.Struct("<I")
+# Move record: flat cell index, flags (bit 0: letter is O, bit 1: player is Red), SOS lines completed
+MOVE = struct.Struct("<IBB")
+LETTER_FLAG = 1
+PLAYER_FLAG = 2
+
+
+def read_header(file):
+    """Reads the file header from a binary file or mmap and returns (board_size, game_mode)."""
+    data = file.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError("Not a game record file: header is truncated")
+    magic, version, mode_number, board_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a game record file: bad magic")
+    if version != VERSION:
+        raise ValueError(f"Unsupported game record version: {version}")
+    label = b""
+    if mode_number == NAMED_MODE:
+        label = file.read(1)
+        label += file.read(label[0]) if label else b""
+    return board_size, read_mode(mode_number, label, 0)[0]
+
+
+class GameRecord:
+    """One recorded game, decoded lazily from its packed move records."""
+
+    __slots__ = ("board_size", "game_mode", "data")
+
+    def __init__(self, board_size, game_mode, data):
+        self.board_size = board_size
+        self.game_mode = game_mode
+        self.data = data
+
+    def __len__(self):
+        return len(self.data) // MOVE.size
+
+    def raw_moves(self):
+        """Yields (cell, flags, sos_delta) tuples without decoding them."""
+        return MOVE.iter_unpack(self.data)
+
+    def moves(self):
+        """Yields (row, col, character, player, sos_delta) for every move."""
+        for cell, flags, sos_delta in MOVE.iter_unpack(self.data):
+            row, col = divmod(cell, self.board_size)
+            yield (row, col, 'O' if flags & LETTER_FLAG else 'S', "Red" if flags & PLAYER_FLAG else "Blue", sos_delta)
+
+    def scores(self):
+        """Returns the total SOS lines completed by each player."""
+        scores = {"Blue": 0, "Red": 0}
+        for _, flags, sos_delta in MOVE.iter_unpack(self.data):
+            scores["Red" if flags & PLAYER_FLAG else "Blue"] += sos_delta
+        return scores
+
+
+class GameRecordWriter:
+    """Appends finished games to a record file; GameManager feeds it through its recorder attribute."""
+
+    def __init__(self, path, board_size, game_mode):
+        self.board_size = board_size
+        self.game_mode = game_mode
+        # mode_code rejects unknown modes before the file is created
+        header = HEADER.pack(MAGIC, VERSION, mode_code(game_mode), board_size) + mode_label(game_mode)
+        self.moves = bytearray()
+        self.written = None  # (file offset, moves) of the last game written, until the next game starts
+        self.file = open(path, "a+b")
+        self.file.seek(0, os.SEEK_END)
+        if self.file.tell() == 0:
+            self.file.write(header)
+        else:
+            self.file.seek(0)
+            try:
+                stored = read_header(self.file)
+            except ValueError:
+                self.file.close()
+                raise
+            if stored != (board_size, game_mode):
+                self.file.close()
+                raise ValueError("Record file holds games of a different board size or mode")
+            self.file.seek(0, os.SEEK_END)
+
+    def start_game(self, board_size, game_mode):
+        """Discards any unfinished game and checks that the new game fits this file."""
+        if (board_size, game_mode) != (self.board_size, self.game_mode):
+            raise ValueError("Record file holds games of a different board size or mode")
+        self.moves.clear()
+        self.written = None
+
+    def record_move(self, row, col, character, player, sos_delta):
+        """Buffers one move of the current game."""
+        flags = (LETTER_FLAG if character == 'O' else 0) | (PLAYER_FLAG if player == "Red" else 0)
+        self.moves += MOVE.pack(row * self.board_size + col, flags, min(sos_delta, 255))
+
+    def pop_move(self):
+        """Drops the last buffered move, used when a move is taken back.
+
+        Taking back the final move of a game already written reopens that
+        game: it is cut from the file and its moves buffered again.
+        """
+        if not self.moves and self.written is not None:
+            offset, moves = self.written
+            self.file.truncate(offset)
+            self.moves[:] = moves
+            self.written = None
+        del self.moves[-MOVE.size:]
+
+    def end_game(self):
+        """Writes the buffered game to the file; does nothing if no moves were recorded."""
+        if not self.moves:
+            return
+        self.file.seek(0, os.SEEK_END)
+        self.written = (self.file.tell(), bytes(self.moves))
+        self.file.write(GAME_HEADER.pack(len(self.moves) // MOVE.size))
+        self.file.write(self.moves)
+        self.moves.clear()
+
+    def close(self):
+        """Flushes and closes the file."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_games(path, buffer_size=1 << 16):
+    """Streams the games of a record file one at a time without loading the whole file."""
+    with open(path, "rb", buffering=buffer_size) as file:
+        board_size, game_mode = read_header(file)
+        while True:
+            count_bytes = file.read(GAME_HEADER.size)
+            if not count_bytes:
+                return
+            if len(count_bytes) < GAME_HEADER.size:
+                raise ValueError("Game record file is truncated")
+            size = GAME_HEADER.unpack(count_bytes)[0] * MOVE.size
+            data = file.read(size)
+            if len(data) < size:
+                raise ValueError("Game record file is truncated")
+            yield GameRecord(board_size, game_mode, data)
+
+
+class MappedGameRecords:
+    """Random access to the games of a record file through a memory map.
+
+    Opening the file only walks the game headers to build an offset index;
+    indexing copies just that game's moves out of the map, so the records
+    stay valid after the file is closed.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.board_size, self.game_mode = read_header(self.map)
+        self.offsets = array("Q")
+        offset = self.map.tell()
+        end = len(self.map)
+        while offset < end:
+            if offset + GAME_HEADER.size > end:
+                raise ValueError("Game record file is truncated")
+            count = GAME_HEADER.unpack_from(self.map, offset)[0]
+            self.offsets.append(offset)
+            offset += GAME_HEADER.size + count * MOVE.size
+        if offset > end:
+            raise ValueError("Game record file is truncated")
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        offset = self.offsets[index]
+        count = GAME_HEADER.unpack_from(self.map, offset)[0]
+        start = offset + GAME_HEADER.size
+        return GameRecord(self.board_size, self.game_mode, self.map[start:start + count * MOVE.size])
+
+    def __iter__(self):
+        for index in range(len(self.offsets)):
+            yield self[index]
+
+    def close(self):
+        """Releases the memory map and the file."""
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
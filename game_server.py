@@ -0,0 +1,361 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+
+from compact_manager import CompactGameManager, SessionPool
+from pattern_engine import GAME_MODES
+
+logger = logging.getLogger(__name__)
+
+LETTERS = ("S", "O")
+
+
+class Connection:
+    """One connected client: its stream pair and the game it is seated in."""
+
+    __slots__ = ("server", "reader", "writer", "session", "player", "queue_key", "last_activity", "closed")
+
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.session = None  # Session the client is playing in
+        self.player = None  # "Blue" or "Red" within that session
+        self.queue_key = None  # (game_mode, board_size) while waiting for an opponent
+        self.last_activity = asyncio.get_running_loop().time()
+        self.closed = False
+
+    async def send(self, message):
+        """Writes one JSON line, waiting for the client to catch up only when its buffer is over the limit.
+
+        A client that cannot drain its buffer within the server's write timeout is disconnected.
+        """
+        if self.closed:
+            return
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        if self.writer.transport.get_write_buffer_size() > self.server.write_buffer_limit:
+            try:
+                await asyncio.wait_for(self.writer.drain(), self.server.write_timeout)
+            except (asyncio.TimeoutError, ConnectionError):
+                logger.info("Dropping slow client %s", self.writer.get_extra_info("peername"))
+                self.close()
+
+    def close(self):
+        """Closes the connection without waiting for buffered data to be sent."""
+        if not self.closed:
+            self.closed = True
+            self.writer.transport.abort()
+
+
+class Session:
+    """A game between two connections, validated by its own game state object."""
+
+    __slots__ = ("session_id", "game_manager", "players", "last_activity")
+
+    def __init__(self, session_id, game_manager, blue, red, now):
+        self.session_id = session_id
+        self.game_manager = game_manager
+        self.players = {"Blue": blue, "Red": red}
+        self.last_activity = now
+
+
+class GameServer:
+    """Hosts many concurrent SOS games over TCP in a single asyncio event loop.
+
+    Clients speak line-delimited JSON. A client sends
+    {"type": "join", "mode": ..., "size": ...} and is paired with the next
+    client asking for the same mode and board size; both receive a "start"
+    message with their colour. Moves are sent as
+    {"type": "move", "row": ..., "col": ..., "letter": ...}, checked with
+    make_move and broadcast to both players, followed by "game_over" when the
+    game ends. Problems are reported with {"type": "error", "message": ...}.
+    Games without a move for idle_timeout seconds are ended and both clients
+    disconnected. Game state objects come from a SessionPool, so finished
+    games are reset and reused rather than reallocated.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, idle_timeout=300.0, max_board_size=20,
+                 write_buffer_limit=64 * 1024, write_timeout=5.0, max_line_length=1024,
+                 game_factory=CompactGameManager, max_idle_games=1024):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.max_board_size = max_board_size
+        self.write_buffer_limit = write_buffer_limit
+        self.write_timeout = write_timeout
+        self.max_line_length = max_line_length
+        self.pool = SessionPool(game_factory, max_idle_games)  # Finished games are reset and reused
+        self.sessions = {}  # session_id -> Session
+        self.waiting = {}  # (game_mode, board_size) -> Connection waiting for an opponent
+        self.connections = set()
+        self.session_ids = itertools.count(1)
+        self.server = None
+        self.eviction_task = None
+
+    async def start(self):
+        """Starts listening and the idle-eviction task; returns the bound (host, port)."""
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port,
+                                                 limit=self.max_line_length)
+        self.eviction_task = asyncio.get_running_loop().create_task(self.evict_idle())
+        self.host, self.port = self.server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self):
+        """Starts the server and serves until cancelled."""
+        if self.server is None:
+            await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stops accepting clients and disconnects everyone."""
+        if self.eviction_task is not None:
+            self.eviction_task.cancel()
+            self.eviction_task = None
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for connection in list(self.connections):
+            connection.close()
+
+    async def handle_client(self, reader, writer):
+        """Reads and dispatches messages from one client until it disconnects."""
+        connection = Connection(self, reader, writer)
+        self.connections.add(connection)
+        try:
+            while not connection.closed:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await connection.send({"type": "error", "message": "Message too long"})
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                connection.last_activity = asyncio.get_running_loop().time()
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    await connection.send({"type": "error", "message": "Malformed JSON"})
+                    continue
+                await self.dispatch(connection, message)
+        finally:
+            await self.disconnect(connection)
+
+    async def dispatch(self, connection, message):
+        """Routes one decoded message to its handler."""
+        message_type = message.get("type") if isinstance(message, dict) else None
+        if message_type == "join":
+            await self.handle_join(connection, message)
+        elif message_type == "move":
+            await self.handle_move(connection, message)
+        elif message_type == "leave":
+            await self.handle_leave(connection)
+        else:
+            await connection.send({"type": "error", "message": f"Unknown message type: {message_type}"})
+
+    async def handle_join(self, connection, message):
+        """Queues the client for a game, or pairs it with a client already waiting for the same game."""
+        game_mode = message.get("mode", "Simple")
+        board_size = message.get("size", 3)
+        if connection.session is not None or connection.queue_key is not None:
+            await connection.send({"type": "error", "message": "Already in a game"})
+            return
+        if game_mode not in GAME_MODES:
+            await connection.send({"type": "error", "message": f"Unknown game mode: {game_mode}"})
+            return
+        if type(board_size) is not int or not 3 <= board_size <= self.max_board_size:
+            await connection.send({"type": "error", "message": f"Board size must be between 3 and {self.max_board_size}"})
+            return
+
+        key = (game_mode, board_size)
+        opponent = self.waiting.pop(key, None)
+        if opponent is None:
+            connection.queue_key = key
+            self.waiting[key] = connection
+            await connection.send({"type": "waiting", "mode": game_mode, "size": board_size})
+            return
+
+        opponent.queue_key = None
+        game_manager = self.pool.acquire(board_size, game_mode)
+        session = Session(next(self.session_ids), game_manager, opponent, connection,
+                          asyncio.get_running_loop().time())
+        self.sessions[session.session_id] = session
+        for player, seated in session.players.items():
+            seated.session = session
+            seated.player = player
+            await seated.send({"type": "start", "game": session.session_id, "player": player,
+                               "mode": game_mode, "size": board_size})
+
+    async def handle_move(self, connection, message):
+        """Validates and plays a move, then tells both players the outcome."""
+        session = connection.session
+        if session is None:
+            await connection.send({"type": "error", "message": "Not in a game"})
+            return
+        game_manager = session.game_manager
+        if game_manager.get_current_player() != connection.player:
+            await connection.send({"type": "error", "message": "Not your turn"})
+            return
+        row, col, letter = message.get("row"), message.get("col"), message.get("letter")
+        size = game_manager.board_size
+        if (type(row) is not int or type(col) is not int or not (0 <= row < size and 0 <= col < size)
+                or letter not in LETTERS):
+            await connection.send({"type": "error", "message": "Invalid move"})
+            return
+
+        result = game_manager.make_move(row, col, letter)
+        if not result:
+            await connection.send({"type": "error", "message": "Invalid move"})
+            return
+        session.last_activity = asyncio.get_running_loop().time()
+        outcome = result["result"]
+        if outcome == "next_turn":
+            game_manager.switch_turn()
+        elif outcome == "continue" and game_manager.is_board_full():
+            # The last move scored and filled the board, so the game ends on the extra turn
+            result = dict(game_manager.end_game(), result="end")
+            outcome = "end"
+
+        update = {"type": "move", "row": row, "col": col, "letter": letter, "player": connection.player,
+                  "result": outcome, "next": game_manager.get_current_player(),
+                  "scores": dict(game_manager.sos_count)}
+        for seated in session.players.values():
+            await seated.send(update)
+
+        if outcome == "win":
+            await self.end_session(session, result["winner"], "finished")
+        elif outcome == "draw":
+            await self.end_session(session, "Draw", "finished")
+        elif outcome == "end":
+            await self.end_session(session, result["winner"], "finished")
+
+    async def handle_leave(self, connection):
+        """Leaves the matchmaking queue, or forfeits the current game."""
+        if connection.queue_key is not None:
+            self.waiting.pop(connection.queue_key, None)
+            connection.queue_key = None
+        elif connection.session is not None:
+            await self.forfeit(connection)
+
+    async def forfeit(self, connection):
+        """Ends the connection's game as a win for its opponent."""
+        winner = "Red" if connection.player == "Blue" else "Blue"
+        await self.end_session(connection.session, winner, "forfeit")
+
+    async def end_session(self, session, winner, reason):
+        """Removes a finished session and sends the final result to both players."""
+        if self.sessions.pop(session.session_id, None) is None:
+            return
+        game_manager = session.game_manager
+        game_manager.is_game_active = False
+        message = {"type": "game_over", "game": session.session_id, "winner": winner, "reason": reason,
+                   "blue_score": game_manager.sos_count["Blue"], "red_score": game_manager.sos_count["Red"]}
+        for seated in session.players.values():
+            seated.session = None
+            seated.player = None
+            await seated.send(message)
+        self.pool.release(game_manager)
+
+    async def disconnect(self, connection):
+        """Cleans up after a client goes away, forfeiting any game in progress."""
+        if connection.queue_key is not None and self.waiting.get(connection.queue_key) is connection:
+            del self.waiting[connection.queue_key]
+        connection.queue_key = None
+        if connection.session is not None:
+            await self.forfeit(connection)
+        connection.close()
+        self.connections.discard(connection)
+
+    async def evict_idle(self):
+        """Periodically ends idle games and drops clients that never joined one."""
+        interval = max(self.idle_timeout / 4, 0.01)
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            deadline = loop.time() - self.idle_timeout
+            for session in [session for session in self.sessions.values() if session.last_activity < deadline]:
+                players = list(session.players.values())
+                await self.end_session(session, None, "idle")
+                for connection in players:
+                    connection.close()
+            for connection in list(self.connections):
+                if (connection.session is None and connection.queue_key is None
+                        and connection.last_activity < deadline):
+                    connection.close()
+
+
+class GameClient:
+    """Minimal asyncio client for the game server, used by tests and bots."""
+
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+
+    async def connect(self, host, port):
+        """Opens the connection."""
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        return self
+
+    async def send(self, message_type, **fields):
+        """Sends one message of the given type."""
+        self.writer.write(json.dumps(dict(fields, type=message_type)).encode() + b"\n")
+        await self.writer.drain()
+
+    async def receive(self, timeout=5.0):
+        """Returns the next message from the server, or None once the server has closed the connection."""
+        line = await asyncio.wait_for(self.reader.readline(), timeout)
+        return json.loads(line) if line else None
+
+    async def join(self, game_mode="Simple", board_size=3):
+        """Joins matchmaking and waits for the "start" message."""
+        await self.send("join", mode=game_mode, size=board_size)
+        while True:
+            message = await self.receive()
+            if message is None or message["type"] in ("start", "error"):
+                return message
+
+    async def move(self, row, col, letter):
+        """Sends a move and returns the server's reply to it."""
+        await self.send("move", row=row, col=col, letter=letter)
+        return await self.receive()
+
+    async def close(self):
+        """Closes the connection."""
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def main(argv=None):
+    """Command-line entry point that runs the server until interrupted."""
+    parser = argparse.ArgumentParser(description="Host SOS games over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="seconds before an idle game is ended")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = GameServer(args.host, args.port, args.idle_timeout)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
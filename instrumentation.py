@@ -0,0 +1,184 @@
+import cProfile
+import functools
+import io
+import pstats
+import time
+from collections import Counter
+
+# GameManager methods timed as make_move phases
+GAME_MANAGER_PHASES = {
+    "is_valid_move": "validation",
+    "_place": "placement",
+    "check_sos": "sos_detection",
+    "is_board_full": "end_of_game_check",
+}
+
+
+class LatencyHistogram:
+    """Histogram of durations in power-of-two microsecond buckets."""
+
+    __slots__ = ("buckets", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.buckets = Counter()
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, elapsed_ns):
+        """Records one duration in nanoseconds."""
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        # Bucket b holds durations below 2**b microseconds
+        self.buckets[(elapsed_ns // 1000).bit_length()] += 1
+
+    def percentile(self, fraction):
+        """Returns the upper bound in microseconds of the bucket holding the given fraction of samples."""
+        target = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return 2 ** bucket
+        return 0
+
+    def summary(self):
+        """Returns count, mean, max and approximate percentiles in microseconds."""
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1000 if self.count else 0.0,
+            "max_us": self.max_ns / 1000,
+            "p50_us": self.percentile(0.5),
+            "p90_us": self.percentile(0.9),
+            "p99_us": self.percentile(0.99),
+            "buckets_us": {2 ** bucket: count for bucket, count in sorted(self.buckets.items())},
+        }
+
+
+class Instrumentation:
+    """Opt-in latency and event instrumentation for GameManager and SOSGameGUI.
+
+    Instrumenting an object shadows the timed methods with wrappers stored on
+    that instance only, so objects that are not instrumented (or after
+    uninstrument) run the original methods with no overhead.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = Counter()
+        self.profiler = None
+        self.wrapped = []
+        self.board = None
+
+    def histogram(self, name):
+        """Returns the histogram for a phase, creating it on first use."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        return histogram
+
+    def _wrap(self, target, method_name, phase, on_result=None):
+        """Replaces a bound method on the target instance with a timed wrapper."""
+        original = getattr(target, method_name)
+        histogram = self.histogram(phase)
+        clock = time.perf_counter_ns
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = clock()
+            result = original(*args, **kwargs)
+            histogram.add(clock() - start)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        setattr(target, method_name, timed)
+        self.wrapped.append((target, method_name))
+        return timed
+
+    def _count_move(self, result):
+        self.counters["moves" if result else "invalid_moves"] += 1
+
+    def _count_sos(self, sos_created):
+        if sos_created:
+            self.counters["sos_events"] += 1
+            self.counters["sos_lines"] += sos_created
+
+    def instrument_game_manager(self, game_manager):
+        """Times make_move and each of its phases on one GameManager and counts moves and SOS events."""
+        self._wrap(game_manager, "make_move", "make_move", self._count_move)
+        for method_name, phase in GAME_MANAGER_PHASES.items():
+            on_result = self._count_sos if method_name == "check_sos" else None
+            self._wrap(game_manager, method_name, phase, on_result)
+
+    def instrument_gui(self, app):
+        """Times board clicks and board widget updates on an SOSGameGUI, including boards created later."""
+        self.instrument_game_manager(app.game_manager)
+        on_board_click = self._wrap(app, "on_board_click", "on_board_click")
+        if getattr(app, "board", None) is not None:
+            app.board.on_click_callback = on_board_click
+            self._instrument_board(app.board)
+
+        start_game = app.start_game
+
+        @functools.wraps(start_game)
+        def instrumented_start_game(*args, **kwargs):
+            result = start_game(*args, **kwargs)
+            self._instrument_board(app.board)
+            return result
+
+        app.start_game = instrumented_start_game
+        self.wrapped.append((app, "start_game"))
+
+    def _instrument_board(self, board):
+        if board is self.board:
+            return
+        # Every new game builds a new board, so drop the old board's wrappers instead of keeping it alive
+        self.wrapped = [(target, method_name) for target, method_name in self.wrapped if target is not self.board]
+        self.board = board
+        self._wrap(board, "update_button", "widget_update")
+        if hasattr(board, "draw_sos_line"):
+            self._wrap(board, "draw_sos_line", "widget_update")
+
+    def uninstrument(self):
+        """Removes every wrapper so the original methods run again."""
+        for target, method_name in reversed(self.wrapped):
+            if method_name in vars(target):
+                delattr(target, method_name)
+        self.wrapped.clear()
+        self.board = None
+
+    def start_profile(self):
+        """Starts a cProfile capture."""
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def stop_profile(self, path=None):
+        """Stops the cProfile capture, optionally dumps it to a file, and returns a pstats.Stats."""
+        if self.profiler is None:
+            raise RuntimeError("Profiling was not started")
+        self.profiler.disable()
+        if path is not None:
+            self.profiler.dump_stats(path)
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        self.profiler = None
+        return stats
+
+    def stats(self):
+        """Returns counters and per-phase latency summaries as a dictionary."""
+        return {
+            "counters": dict(self.counters),
+            "phases": {name: histogram.summary() for name, histogram in sorted(self.histograms.items())},
+        }
+
+    def report(self):
+        """Formats the collected statistics as text."""
+        lines = [f"{name}: {count}" for name, count in sorted(self.counters.items())]
+        for name, histogram in sorted(self.histograms.items()):
+            summary = histogram.summary()
+            lines.append(f"{name:<18} n={summary['count']:<8} mean={summary['mean_us']:.1f}us "
+                         f"p50<{summary['p50_us']}us p90<{summary['p90_us']}us p99<{summary['p99_us']}us "
+                         f"max={summary['max_us']:.1f}us")
+        return "\n".join(lines)
@@ -0,0 +1,302 @@
+import math
+import random
+import time
+
+from pattern_engine import cell_code_lines, mode_rules
+from sos_lines import cell_triples
+
+# Cell codes used by the playout engine
+EMPTY, S, O = 0, 1, 2
+LETTER_CODES = {' ': EMPTY, 'S': S, 'O': O}
+LETTERS = " SO"
+
+# Player and result codes
+BLUE, RED, DRAW = 0, 1, 2
+PLAYERS = ("Blue", "Red")
+
+
+class PlayoutState:
+    """Mutable flat game state that playouts update in place without allocating."""
+
+    __slots__ = ("board_size", "game_mode", "simple", "triples", "lines", "cells", "empties", "player", "scores",
+                 "over", "winner")
+
+    def __init__(self, board_size, game_mode):
+        scoring_mode, word = mode_rules(game_mode)
+        self.board_size = board_size
+        self.game_mode = game_mode
+        self.simple = scoring_mode == "Simple"
+        self.triples = cell_triples(board_size)
+        # Pattern modes check the (window, target codes) lines of their word; plain SOS keeps the unrolled triples
+        self.lines = None if word == "SOS" else cell_code_lines(word, board_size)
+        self.cells = bytearray(board_size * board_size)
+        self.empties = list(range(board_size * board_size))
+        self.player = BLUE
+        self.scores = [0, 0]
+        self.over = False
+        self.winner = None
+
+    @classmethod
+    def from_game_manager(cls, game_manager):
+        """Builds a state holding the current position of a GameManager."""
+        size = game_manager.board_size
+        state = cls(size, game_manager.game_mode)
+        for row in range(size):
+            for col in range(size):
+                state.cells[row * size + col] = LETTER_CODES[game_manager.get_board_value(row, col)]
+        state.empties = [cell for cell in range(size * size) if not state.cells[cell]]
+        state.player = PLAYERS.index(game_manager.get_current_player())
+        state.scores = [game_manager.sos_count["Blue"], game_manager.sos_count["Red"]]
+        state.over = not game_manager.is_game_active or not state.empties
+        return state
+
+    def copy_from(self, other):
+        """Overwrites this state with another one of the same size, reusing its buffers."""
+        self.cells[:] = other.cells
+        self.empties[:] = other.empties
+        self.player = other.player
+        self.scores[0] = other.scores[0]
+        self.scores[1] = other.scores[1]
+        self.over = other.over
+        self.winner = other.winner
+
+    def legal_moves(self):
+        """Returns every (cell, letter) move available in the position."""
+        return [(cell, letter) for cell in self.empties for letter in (S, O)]
+
+    def gain(self, cell, letter):
+        """Counts the SOS lines placing the letter at the empty cell would complete."""
+        cells = self.cells
+        count = 0
+        if self.lines is not None:
+            for window, target in self.lines[cell]:
+                for other, needed in zip(window, target):
+                    if (letter if other == cell else cells[other]) != needed:
+                        break
+                else:
+                    count += 1
+            return count
+        for a, b, c in self.triples[cell]:
+            if ((letter if a == cell else cells[a]) == S and (letter if b == cell else cells[b]) == O
+                    and (letter if c == cell else cells[c]) == S):
+                count += 1
+        return count
+
+    def play(self, cell, letter, position=None):
+        """Applies a move with GameManager rules, including the General mode extra turn."""
+        empties = self.empties
+        if position is None:
+            position = empties.index(cell)
+        # Swap-remove keeps the empty list compact without shifting
+        empties[position] = empties[-1]
+        empties.pop()
+        gained = self.gain(cell, letter)
+        self.cells[cell] = letter
+
+        if gained and self.simple:
+            self.over = True
+            self.winner = self.player
+            return
+        if gained:
+            self.scores[self.player] += gained
+        if not empties:
+            self.over = True
+            blue, red = self.scores
+            self.winner = BLUE if blue > red else RED if red > blue else DRAW
+        elif not gained:
+            self.player ^= 1
+
+
+def random_playout(state, rng):
+    """Plays a random letter on a random empty cell."""
+    position = rng.randrange(len(state.empties))
+    state.play(state.empties[position], S if rng.random() < 0.5 else O, position)
+
+
+def greedy_playout(state, rng):
+    """Plays the first scoring move found, otherwise a random move."""
+    for position, cell in enumerate(state.empties):
+        for letter in (S, O):
+            if state.gain(cell, letter):
+                state.play(cell, letter, position)
+                return
+    random_playout(state, rng)
+
+
+# Playout policies selectable by name; each applies one move to a PlayoutState
+PLAYOUT_POLICIES = {
+    "random": random_playout,
+    "greedy": greedy_playout,
+}
+
+
+class Node:
+    """Search tree node; wins are counted for the player who made the move into the node."""
+
+    __slots__ = ("move", "mover", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, mover, parent, untried):
+        self.move = move
+        self.mover = mover
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+
+def run_search(root_state, deadline, playout, exploration, rng, max_playouts=None, should_stop=None):
+    """Runs UCT iterations from the root state until the deadline or until should_stop returns True.
+
+    Returns ({(cell, letter): (visits, wins)} for the root moves, playouts run).
+    """
+    root = Node(None, None, None, root_state.legal_moves())
+    rng.shuffle(root.untried)
+    state = PlayoutState(root_state.board_size, root_state.game_mode)
+    playouts = 0
+
+    while time.perf_counter() < deadline and (max_playouts is None or playouts < max_playouts):
+        if should_stop is not None and playouts & 15 == 0 and should_stop():
+            break
+        node = root
+        state.copy_from(root_state)
+
+        # Selection
+        while not node.untried and node.children and not state.over:
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda child: child.wins / child.visits
+                       + exploration * math.sqrt(log_visits / child.visits))
+            state.play(*node.move)
+
+        # Expansion
+        if node.untried and not state.over:
+            move = node.untried.pop()
+            mover = state.player
+            state.play(*move)
+            untried = [] if state.over else state.legal_moves()
+            rng.shuffle(untried)
+            child = Node(move, mover, node, untried)
+            node.children.append(child)
+            node = child
+
+        # Playout
+        while not state.over:
+            playout(state, rng)
+        playouts += 1
+
+        # Backpropagation
+        winner = state.winner
+        while node is not None:
+            node.visits += 1
+            if winner == node.mover:
+                node.wins += 1.0
+            elif winner == DRAW:
+                node.wins += 0.5
+            node = node.parent
+
+    return {child.move: (child.visits, child.wins) for child in root.children}, playouts
+
+
+def _search_worker(task):
+    """Runs an independent root-parallel search in a worker process."""
+    board_size, game_mode, cells, player, scores, budget, playout_name, exploration, seed = task
+    state = PlayoutState(board_size, game_mode)
+    state.cells[:] = cells
+    state.empties = [cell for cell in range(board_size * board_size) if not cells[cell]]
+    state.player = player
+    state.scores = list(scores)
+    deadline = time.perf_counter() + budget
+    return run_search(state, deadline, PLAYOUT_POLICIES[playout_name], exploration, random.Random(seed))
+
+
+def merge_root_stats(results):
+    """Sums the (root stats, playouts) results of root-parallel searches into one (root stats, playouts)."""
+    stats = {}
+    playouts = 0
+    for worker_stats, worker_playouts in results:
+        playouts += worker_playouts
+        for move, (visits, wins) in worker_stats.items():
+            total_visits, total_wins = stats.get(move, (0, 0.0))
+            stats[move] = (total_visits + visits, total_wins + wins)
+    return stats, playouts
+
+
+class MCTSPlayer:
+    """Computer player using Monte Carlo Tree Search with UCT selection.
+
+    With workers > 1 the search is root-parallel: every worker process grows
+    its own tree for the whole time budget and the root statistics are
+    summed before picking the most visited move. Positions found in the
+    optional opening book are answered from it without searching.
+    """
+
+    def __init__(self, time_limit=1.0, playout="random", exploration=1.4, workers=1, seed=None, book=None):
+        if playout not in PLAYOUT_POLICIES:
+            raise ValueError(f"Unknown playout policy: {playout}")
+        self.time_limit = time_limit
+        self.playout = playout
+        self.exploration = exploration
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.book = book
+        self.pool = None
+        self.last_playouts = 0
+        self.last_elapsed = 0.0
+        self.last_stats = {}  # {(cell, letter): (visits, wins)} at the root of the last search
+
+    @property
+    def playouts_per_second(self):
+        """Playout throughput of the last search."""
+        return self.last_playouts / self.last_elapsed if self.last_elapsed else 0.0
+
+    def choose_move(self, game_manager, should_stop=None):
+        """Returns the most visited (row, col, character) move, or None if no move is available."""
+        state = PlayoutState.from_game_manager(game_manager)
+        if state.over:
+            return None
+        if self.book is not None:
+            entry = self.book.lookup(game_manager)
+            if entry is not None:
+                self.last_playouts = 0
+                self.last_elapsed = 0.0
+                return entry[0]
+        started = time.perf_counter()
+
+        if self.workers > 1:
+            if self.pool is None:
+                from multiprocessing import Pool
+                self.pool = Pool(processes=self.workers)
+            tasks = [(state.board_size, game_manager.game_mode, bytes(state.cells), state.player, state.scores,
+                      self.time_limit, self.playout, self.exploration, self.rng.getrandbits(64))
+                     for _ in range(self.workers)]
+            stats, playouts = merge_root_stats(self.pool.map(_search_worker, tasks))
+        else:
+            deadline = started + self.time_limit
+            stats, playouts = run_search(state, deadline, PLAYOUT_POLICIES[self.playout], self.exploration, self.rng,
+                                         should_stop=should_stop)
+
+        self.last_playouts = playouts
+        self.last_elapsed = time.perf_counter() - started
+        self.last_stats = stats
+        if not stats:
+            # Budget too small for a single playout: fall back to any legal move
+            stats = {state.legal_moves()[0]: (0, 0.0)}
+        cell, letter = max(stats, key=lambda move: stats[move])
+        row, col = divmod(cell, state.board_size)
+        return row, col, LETTERS[letter]
+
+    def iter_search(self, game_manager, should_stop=None):
+        """Yields one (playouts, (row, col, character), playouts per second) suggestion when the search ends.
+
+        Matches AlphaBetaPlayer.iter_search so both players can run in an AnalysisService.
+        """
+        move = self.choose_move(game_manager, should_stop)
+        if move is not None and not (should_stop is not None and should_stop()):
+            yield self.last_playouts, move, self.playouts_per_second
+
+    def close(self):
+        """Shuts down the worker pool, if one was started."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
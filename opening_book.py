@@ -0,0 +1,306 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_left
+from functools import lru_cache
+
+from ai_player import AlphaBetaPlayer
+from board_codec import LETTER_CODES, LETTERS, packed_size, unpack_cells
+from game_manager import GameManager
+from pattern_engine import GAME_MODES, cell_code_lines, mode_code, mode_label, mode_rules, read_mode
+
+# File header: magic, format version, game mode code (pattern_engine.mode_code), board size, plies covered,
+# record count; the mode's pattern_engine.mode_label follows, then the records
+HEADER = struct.Struct("<4sBBBBI")
+MAGIC = b"SOSB"
+VERSION = 1
+
+# Each record is a fixed-width position key followed by the best move (canonical cell, letter code),
+# its value for the side to move and the search depth that produced it
+ENTRY = struct.Struct("<HBiB")
+
+# Books are not shipped with the code; build them into this directory with `python opening_book.py`
+BOOK_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_books")
+
+
+@lru_cache(maxsize=None)
+def symmetries(board_size):
+    """Returns the 8 dihedral symmetries of the board as (forward, inverse) flat cell maps.
+
+    forward[cell] is where the cell lands after the transformation and
+    inverse[cell] is where it came from.
+    """
+    last = board_size - 1
+    maps = (
+        lambda row, col: (row, col),
+        lambda row, col: (col, last - row),
+        lambda row, col: (last - row, last - col),
+        lambda row, col: (last - col, row),
+        lambda row, col: (row, last - col),
+        lambda row, col: (last - row, col),
+        lambda row, col: (col, row),
+        lambda row, col: (last - col, last - row),
+    )
+    result = []
+    for transform in maps:
+        forward = [0] * (board_size * board_size)
+        inverse = [0] * (board_size * board_size)
+        for cell in range(board_size * board_size):
+            row, col = transform(*divmod(cell, board_size))
+            forward[cell] = row * board_size + col
+            inverse[row * board_size + col] = cell
+        result.append((tuple(forward), tuple(inverse)))
+    return tuple(result)
+
+
+def canonical_key(filled, board_size):
+    """Returns (key, symmetry index) of the canonical form of a position given as (cell, code) pairs.
+
+    The key packs the transformed board at 2 bits per cell (cell i in bits
+    2i and 2i+1, as in board_codec.pack_cells); the canonical form is the
+    symmetry giving the smallest key.
+    """
+    best_key = None
+    best_index = 0
+    for index, (forward, _) in enumerate(symmetries(board_size)):
+        key = 0
+        for cell, code in filled:
+            key |= code << (forward[cell] << 1)
+        if best_key is None or key < best_key:
+            best_key = key
+            best_index = index
+    return best_key, best_index
+
+
+def key_codes(key, board_size):
+    """Returns the flat cell codes of the position packed in a key."""
+    cell_count = board_size * board_size
+    return unpack_cells(key.to_bytes(packed_size(cell_count), "little"), cell_count)
+
+
+def position_from_key(key, board_size, game_mode):
+    """Builds a GameManager holding the position packed in a key."""
+    game_manager = GameManager(board_size, game_mode)
+    game_manager.reset_game(board_size, game_mode)
+    for cell, code in enumerate(key_codes(key, board_size)):
+        if code:
+            row, col = divmod(cell, board_size)
+            game_manager.make_move(row, col, LETTERS[code])
+    return game_manager
+
+
+def opening_positions(board_size, game_mode, plies):
+    """Returns the canonical keys of every position reachable in fewer than plies moves.
+
+    Simple mode positions containing the mode's word are left out, since the
+    game is already over there.
+    """
+    scoring_mode, word = mode_rules(game_mode)
+    lines = cell_code_lines(word, board_size)
+    cell_count = board_size * board_size
+    level = {0}
+    positions = [0]
+    for _ in range(plies - 1):
+        next_level = set()
+        for key in level:
+            codes = key_codes(key, board_size)
+            filled = [(cell, code) for cell, code in enumerate(codes) if code]
+            for cell in range(cell_count):
+                if codes[cell]:
+                    continue
+                for code in (1, 2):
+                    if scoring_mode == "Simple":
+                        codes[cell] = code
+                        scored = any(all(codes[other] == needed for other, needed in zip(window, target))
+                                     for window, target in lines[cell])
+                        codes[cell] = 0
+                        if scored:
+                            continue
+                    next_level.add(canonical_key(filled + [(cell, code)], board_size)[0])
+        level = next_level
+        positions.extend(sorted(level))
+    return positions
+
+
+_worker_player = None
+
+
+def _evaluate(task):
+    """Searches one canonical position and returns its book record fields."""
+    global _worker_player
+    board_size, game_mode, key, time_limit, max_depth = task
+    if _worker_player is None or (_worker_player.time_limit, _worker_player.max_depth) != (time_limit, max_depth):
+        _worker_player = AlphaBetaPlayer(time_limit=time_limit, max_depth=max_depth)
+    result = None
+    for depth, (row, col, character), value in _worker_player.iter_search(position_from_key(key, board_size, game_mode)):
+        result = (key, row * board_size + col, LETTER_CODES[character], value, depth)
+    return result
+
+
+def build_book(path, board_size, game_mode, plies, time_limit=1.0, max_depth=None, workers=1):
+    """Searches every opening position and writes the sorted book file; returns the number of records."""
+    tasks = [(board_size, game_mode, key, time_limit, max_depth)
+             for key in opening_positions(board_size, game_mode, plies)]
+    if workers == 1:
+        results = [_evaluate(task) for task in tasks]
+    else:
+        # Imported lazily to keep short-lived workers fast to start
+        from multiprocessing import Pool
+        with Pool(processes=workers) as pool:
+            results = list(pool.imap_unordered(_evaluate, tasks, chunksize=max(1, len(tasks) // (workers * 16))))
+
+    width = packed_size(board_size * board_size)
+    records = sorted(result for result in results if result is not None)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, mode_code(game_mode), board_size, plies, len(records)))
+        file.write(mode_label(game_mode))
+        for key, cell, letter, value, depth in records:
+            # Big-endian keys sort the same as the integers, so the file can be bisected bytewise
+            file.write(key.to_bytes(width, "big"))
+            file.write(ENTRY.pack(cell, letter, value, depth))
+    return len(records)
+
+
+class _KeyView:
+    """Sequence view of the record keys in a mapped book, for bisect."""
+
+    __slots__ = ("data", "start", "width", "record_size", "count")
+
+    def __init__(self, data, start, width, record_size, count):
+        self.data = data
+        self.start = start
+        self.width = width
+        self.record_size = record_size
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        offset = self.start + index * self.record_size
+        return self.data[offset:offset + self.width]
+
+
+class OpeningBook:
+    """Read-only opening book for one board size and mode, memory-mapped and searched by bisection."""
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < HEADER.size:
+            self.close()
+            raise ValueError("Not an opening book file: header is truncated")
+        magic, version, mode_number, self.board_size, self.plies, count = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("Not an opening book file or unsupported version")
+        try:
+            self.game_mode, self.start = read_mode(mode_number, self.map, HEADER.size)
+        except ValueError:
+            self.close()
+            raise
+        self.width = packed_size(self.board_size * self.board_size)
+        self.record_size = self.width + ENTRY.size
+        if len(self.map) < self.start + count * self.record_size:
+            self.close()
+            raise ValueError("Opening book file is truncated")
+        self.keys = _KeyView(self.map, self.start, self.width, self.record_size, count)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, game_manager):
+        """Returns ((row, col, character), value, depth) for the position, or None if it is not in the book."""
+        size = self.board_size
+        if game_manager.board_size != size or game_manager.game_mode != self.game_mode:
+            return None
+        get = game_manager.get_board_value
+        filled = []
+        for row in range(size):
+            for col in range(size):
+                character = get(row, col)
+                if character != ' ':
+                    if len(filled) + 1 >= self.plies:
+                        return None  # Deeper than the book
+                    filled.append((row * size + col, LETTER_CODES[character]))
+
+        key, symmetry = canonical_key(filled, size)
+        key_bytes = key.to_bytes(self.width, "big")
+        index = bisect_left(self.keys, key_bytes)
+        if index == len(self.keys) or self.keys[index] != key_bytes:
+            return None
+        cell, letter, value, depth = ENTRY.unpack_from(self.map, self.start + index * self.record_size + self.width)
+        # The stored move is in canonical coordinates; map it back onto this board
+        row, col = divmod(symmetries(size)[symmetry][1][cell], size)
+        return (row, col, LETTERS[letter]), value, depth
+
+    def close(self):
+        """Releases the memory map and the file."""
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def book_path(directory, board_size, game_mode):
+    """Returns the file name used for the book of a board size and mode."""
+    return os.path.join(directory, f"sos_{game_mode.lower().replace(' ', '_')}_{board_size}.book")
+
+
+class OpeningLibrary:
+    """Opens the book for each board size and mode on first use; positions without a book are misses.
+
+    No books are shipped, so until they are built with `python opening_book.py`
+    every lookup misses and the players search every position.
+    """
+
+    def __init__(self, directory=BOOK_DIRECTORY):
+        self.directory = directory
+        self.books = {}
+
+    def lookup(self, game_manager):
+        """Returns ((row, col, character), value, depth) from the matching book, or None."""
+        key = (game_manager.board_size, game_manager.game_mode)
+        if key not in self.books:
+            path = book_path(self.directory, *key)
+            self.books[key] = OpeningBook(path) if os.path.exists(path) else None
+        book = self.books[key]
+        return book.lookup(game_manager) if book is not None else None
+
+    def close(self):
+        """Closes every opened book."""
+        for book in self.books.values():
+            if book is not None:
+                book.close()
+        self.books.clear()
+
+
+def main(argv=None):
+    """Command-line entry point that builds opening books in parallel."""
+    parser = argparse.ArgumentParser(description="Build SOS opening books.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 4, 5])
+    parser.add_argument("--modes", nargs="+", default=["Simple", "General"], choices=list(GAME_MODES))
+    parser.add_argument("--plies", type=int, default=3, help="answer positions with fewer than this many moves")
+    parser.add_argument("--time-limit", type=float, default=1.0, help="seconds of search per position")
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--directory", default=BOOK_DIRECTORY)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.directory, exist_ok=True)
+    for game_mode in args.modes:
+        for board_size in args.sizes:
+            path = book_path(args.directory, board_size, game_mode)
+            started = time.perf_counter()
+            count = build_book(path, board_size, game_mode, args.plies, args.time_limit, args.max_depth, args.workers)
+            print(f"{path}: {count} positions in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
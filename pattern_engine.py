@@ -0,0 +1,227 @@
+from functools import lru_cache
+
+from board_codec import LETTER_CODES
+from sos_lines import DIRECTIONS, cell_coordinates
+
+SCORING_MODES = ("Simple", "General")
+# Letters a game board can hold; boards, snapshots and records store them in 2 bits per cell
+BOARD_LETTERS = "SO"
+
+# Game modes: name -> (scoring mode, target word). Plain SOS modes keep GameManager's built-in checker.
+GAME_MODES = {
+    "Simple": ("Simple", "SOS"),
+    "General": ("General", "SOS"),
+}
+
+
+@lru_cache(maxsize=None)
+def line_windows(board_size, length):
+    """Returns every straight run of length cells on the board as a tuple of flat cell indices, in reading order.
+
+    Each run is listed once, in the DIRECTIONS order used by sos_lines, so
+    line_windows(n, 3) matches line_triples(n).
+    """
+    windows = []
+    for row in range(board_size):
+        for col in range(board_size):
+            for d_row, d_col in DIRECTIONS:
+                end_row = row + (length - 1) * d_row
+                end_col = col + (length - 1) * d_col
+                if 0 <= end_row < board_size and 0 <= end_col < board_size:
+                    windows.append(tuple((row + step * d_row) * board_size + col + step * d_col
+                                         for step in range(length)))
+    return tuple(windows)
+
+
+class Pattern:
+    """A target word compiled into move-check tables for one board size.
+
+    Every straight window of len(word) cells is matched against the word read
+    both ways, or once for a palindrome such as SOS. For each cell and letter
+    the tables hold the windows that letter can complete there, as the other
+    cells and the letters they need, so a move check only visits the windows
+    through the cell that agree with the placed letter. Any alphabet works;
+    the letters are the distinct characters of the word.
+    """
+
+    __slots__ = ("word", "board_size", "alphabet", "windows", "windows_through", "completions")
+
+    def __init__(self, word, board_size):
+        if len(word) < 2:
+            raise ValueError("A target word needs at least two letters")
+        if board_size is None:
+            raise ValueError("Patterns need a bounded board")
+        self.word = word
+        self.board_size = board_size
+        self.alphabet = "".join(sorted(set(word)))
+        coordinates = cell_coordinates(board_size)
+        self.windows = tuple(tuple(coordinates[cell] for cell in window)
+                             for window in line_windows(board_size, len(word)))
+
+        targets = {word, word[::-1]}  # A set, so a palindrome is matched once
+        windows_through = [[[] for _ in range(board_size)] for _ in range(board_size)]
+        completions = [[{letter: [] for letter in self.alphabet} for _ in range(board_size)]
+                       for _ in range(board_size)]
+        for window in self.windows:
+            for position, (row, col) in enumerate(window):
+                windows_through[row][col].append(window)
+                others = window[:position] + window[position + 1:]
+                for target in targets:
+                    completions[row][col][target[position]].append(
+                        (others, tuple(target[:position] + target[position + 1:]), window))
+        self.windows_through = tuple(tuple(tuple(cell) for cell in row) for row in windows_through)
+        self.completions = tuple(
+            tuple({letter: tuple(entries) for letter, entries in cell.items()} for cell in row)
+            for row in completions
+        )
+
+    def count(self, get, row, col, letter):
+        """Counts the windows through (row, col) that spell the word with letter in that cell.
+
+        get is a (row, col) -> character lookup such as GameManager.get_board_value.
+        """
+        count = 0
+        for others, letters, _ in self.completions[row][col].get(letter, ()):
+            for cell, needed in zip(others, letters):
+                if get(*cell) != needed:
+                    break
+            else:
+                count += 1
+        return count
+
+    def matches(self, get, row, col):
+        """Returns the windows of (row, col) cells through the cell that spell the word."""
+        found = []
+        for others, letters, window in self.completions[row][col].get(get(row, col), ()):
+            if all(get(*cell) == needed for cell, needed in zip(others, letters)):
+                found.append(window)
+        return found
+
+    def threats(self, get, row, col, letter):
+        """Returns (windows completed, windows left one letter short) by placing letter at an empty cell."""
+        completed = opened = 0
+        for others, letters, _ in self.completions[row][col].get(letter, ()):
+            missing = 0
+            for cell, needed in zip(others, letters):
+                value = get(*cell)
+                if value == ' ':
+                    missing += 1
+                    if missing > 1:
+                        break
+                elif value != needed:
+                    break
+            else:
+                if missing:
+                    opened += 1
+                else:
+                    completed += 1
+        return completed, opened
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(word, board_size):
+    """Returns the Pattern for a word and board size, compiling it once per process."""
+    return Pattern(word, board_size)
+
+
+@lru_cache(maxsize=None)
+def cell_lines(word, board_size):
+    """Maps each flat cell index to the (window, target) pairs of the lines through it.
+
+    window holds the flat cell indices of a line and target the letters it
+    must spell, once per reading of the word (once for a palindrome). For
+    SOS the windows are the cell_triples of sos_lines, in the same order.
+    """
+    targets = sorted({word, word[::-1]})
+    index = [[] for _ in range(board_size * board_size)]
+    for window in line_windows(board_size, len(word)):
+        for target in targets:
+            for cell in window:
+                index[cell].append((window, target))
+    return tuple(tuple(lines) for lines in index)
+
+
+@lru_cache(maxsize=None)
+def cell_code_lines(word, board_size):
+    """Same table as cell_lines with each target as board_codec cell codes (1 S, 2 O)."""
+    return tuple(tuple((window, tuple(LETTER_CODES[letter] for letter in target)) for window, target in lines)
+                 for lines in cell_lines(word, board_size))
+
+
+def register_game_mode(name, scoring_mode, word):
+    """Adds a game mode that scores the target word with Simple or General rules.
+
+    Registered modes are accepted by GameManager next to "Simple" and
+    "General". The word must use the board letters S and O.
+    """
+    if scoring_mode not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {scoring_mode}")
+    if len(word) < 2 or word.strip(BOARD_LETTERS):
+        raise ValueError(f"Target words are two or more of the letters {BOARD_LETTERS}: {word!r}")
+    if GAME_MODES.get(name, (scoring_mode, word)) != (scoring_mode, word):
+        raise ValueError(f"Game mode {name} is already registered")
+    if len(name.encode("utf-8")) > 255:
+        raise ValueError("Game mode names are stored in at most 255 bytes")
+    GAME_MODES[name] = (scoring_mode, word)
+
+
+def mode_rules(game_mode):
+    """Returns (scoring mode, target word) for a game mode."""
+    rules = GAME_MODES.get(game_mode)
+    if rules is None:
+        raise ValueError(f"Unknown game mode: {game_mode}")
+    return rules
+
+
+def mode_code(game_mode):
+    """Returns the number that stores a game mode in snapshots, game records and opening books.
+
+    The modes registered in this module have fixed codes. Any mode added
+    later gets NAMED_MODE and is identified by the mode_label written after
+    the header, since registration order can differ between processes.
+    """
+    mode_rules(game_mode)
+    if game_mode in BUILTIN_MODES:
+        return BUILTIN_MODES.index(game_mode)
+    return NAMED_MODE
+
+
+def mode_label(game_mode):
+    """Returns the bytes that follow a header holding mode_code: empty, or the length-prefixed mode name."""
+    if mode_code(game_mode) != NAMED_MODE:
+        return b""
+    name = game_mode.encode("utf-8")
+    return bytes([len(name)]) + name
+
+
+def read_mode(code, data, offset):
+    """Returns (game mode, offset past its label) for a mode_code whose mode_label starts at data[offset].
+
+    A named mode must be registered in this process as well.
+    """
+    if code != NAMED_MODE:
+        if code >= len(BUILTIN_MODES):
+            raise ValueError(f"Unknown game mode code: {code}")
+        return BUILTIN_MODES[code], offset
+    end = offset + 1 + (data[offset] if offset < len(data) else 0)
+    if end > len(data):
+        raise ValueError("Game mode name is truncated")
+    game_mode = bytes(data[offset + 1:end]).decode("utf-8")
+    mode_rules(game_mode)
+    return game_mode, end
+
+
+def game_rules(game_mode, board_size):
+    """Returns (scoring mode, Pattern) for a game mode; the Pattern is None for plain SOS."""
+    scoring_mode, word = mode_rules(game_mode)
+    if word == "SOS":
+        return scoring_mode, None
+    return scoring_mode, compile_pattern(word, board_size)
+
+
+register_game_mode("Simple SOSOS", "Simple", "SOSOS")
+register_game_mode("General SOSOS", "General", "SOSOS")
+
+# Modes with a fixed mode_code; NAMED_MODE marks any other mode, stored by name
+BUILTIN_MODES = tuple(GAME_MODES)
+NAMED_MODE = 255
@@ -0,0 +1,145 @@
+import time
+
+
+def record_moves(record):
+    """Yields the (row, col, character) moves of a recorded GameRecord."""
+    for row, col, character, _, _ in record.moves():
+        yield row, col, character
+
+
+def bot_moves(game_manager, policies, rng):
+    """Yields moves chosen by a policy per player, e.g. {"Blue": greedy_policy, "Red": random_policy}.
+
+    Each move is chosen when it is requested, so the policies always see the
+    game as it stands after the previous move.
+    """
+    while True:
+        yield policies[game_manager.get_current_player()](game_manager, rng)
+
+
+class PlaybackController:
+    """Plays a stream of moves into a game and its board, redrawing once per frame.
+
+    Moves are applied to the GameManager as fast as the speed allows, but
+    widget work is deferred: the changed cells and new SOS lines of a frame
+    are drawn together and on_frame (for labels) runs once, from a
+    root.after timer capped at fps. moves_per_second=None plays as fast as
+    possible, spending up to frame_budget seconds per frame on moves.
+    """
+
+    def __init__(self, root, game_manager, board, moves, moves_per_second=None, fps=30,
+                 on_frame=None, on_finish=None, frame_budget=0.012):
+        self.root = root
+        self.game_manager = game_manager
+        self.board = board
+        self.moves = iter(moves)
+        self.moves_per_second = moves_per_second
+        self.frame_interval = max(1, int(1000 / fps))
+        self.on_frame = on_frame  # Called with the game manager after each drawn frame
+        self.on_finish = on_finish  # Called with the final result dict
+        self.frame_budget = frame_budget
+        self.generation = 0
+        self.running = False
+        self.finished = False
+        self.credit = 0.0
+        self.last_tick = None
+        self.frames = 0
+        self.moves_played = 0
+        self.dirty_cells = {}
+        self.pending_lines = []
+
+    def start(self):
+        """Starts or resumes playback."""
+        if self.running or self.finished:
+            return
+        self.running = True
+        self.generation += 1
+        self.last_tick = time.perf_counter()
+        self.root.after(self.frame_interval, lambda generation=self.generation: self._tick(generation))
+
+    def stop(self):
+        """Pauses playback; ticks already scheduled are ignored."""
+        self.running = False
+        self.generation += 1
+
+    def set_speed(self, moves_per_second):
+        """Changes the playback speed; None plays as fast as possible."""
+        self.moves_per_second = moves_per_second
+        self.credit = 0.0
+
+    def step(self):
+        """Plays a single move and draws it immediately; returns False once the game is over."""
+        if self.finished:
+            return False
+        self._play_one()
+        self._flush()
+        return not self.finished
+
+    def _tick(self, generation):
+        if generation != self.generation or not self.running:
+            return
+        now = time.perf_counter()
+        if self.moves_per_second is None:
+            deadline = now + self.frame_budget
+            while not self.finished and time.perf_counter() < deadline:
+                self._play_one()
+        else:
+            self.credit += (now - self.last_tick) * self.moves_per_second
+            while self.credit >= 1 and not self.finished:
+                self.credit -= 1
+                self._play_one()
+        self.last_tick = now
+        self._flush()
+        if self.finished:
+            self.running = False
+        else:
+            self.root.after(self.frame_interval, lambda: self._tick(generation))
+
+    def _play_one(self):
+        """Applies the next move to the game only, remembering what needs drawing."""
+        game_manager = self.game_manager
+        move = next(self.moves, None)
+        if move is None:
+            self._finish(game_manager.end_game())
+            return
+        row, col, character = move
+        player = game_manager.get_current_player()
+        result = game_manager.make_move(row, col, character)
+        if not result:
+            self._finish(dict(game_manager.end_game(), error=f"Invalid move {row} {col} {character}"))
+            return
+        self.moves_played += 1
+        self.dirty_cells[(row, col)] = character
+        outcome = result["result"]
+        if outcome in ("win", "continue"):
+            color = "blue" if player == "Blue" else "red"
+            self.pending_lines.extend((line[0], line[-1], color) for line in game_manager.get_sos_lines(row, col))
+        if outcome == "next_turn":
+            game_manager.switch_turn()
+        elif outcome == "continue":
+            if game_manager.is_board_full():
+                # The last move scored and filled the board, so the game ends on the extra turn
+                self._finish(dict(game_manager.end_game(), result="end"))
+        else:
+            if game_manager.is_game_active:
+                game_manager.end_game()  # A full board leaves the game open for the caller to close
+            self._finish(result)
+
+    def _finish(self, result):
+        self.finished = True
+        self.result = result
+
+    def _flush(self):
+        """Draws everything that changed since the last frame and refreshes the labels once."""
+        board = self.board
+        for (row, col), character in self.dirty_cells.items():
+            board.update_button(row, col, character)
+        for start, end, color in self.pending_lines:
+            board.draw_sos_line(start, end, color)
+        self.dirty_cells.clear()
+        self.pending_lines.clear()
+        self.frames += 1
+        if self.on_frame is not None:
+            self.on_frame(self.game_manager)
+        if self.finished and self.on_finish is not None:
+            self.on_finish(self.result)
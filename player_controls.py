@@ -7,6 +7,7 @@ class PlayerControls:
         self.parent = parent
         self.player_name = player_name
         self.choice = tk.StringVar(value=default_choice)
+        self.is_computer = tk.BooleanVar(value=False)
         self.create_controls()
 
     def create_controls(self):
@@ -20,3 +21,6 @@ class PlayerControls:
         o_button = tk.Radiobutton(self.parent, text="O", variable=self.choice, value="O")
         o_button.grid(row=2, column=0, padx=5, pady=5)
 
+        computer_button = tk.Checkbutton(self.parent, text="Computer", variable=self.is_computer)
+        computer_button.grid(row=3, column=0, padx=5, pady=5)
+
@@ -0,0 +1,205 @@
+import argparse
+import json
+import random
+from collections import Counter
+
+from game_manager import GameManager
+from pattern_engine import GAME_MODES
+
+
+def random_policy(game_manager, rng):
+    """Plays a random letter on a random empty cell."""
+    row, col = rng.choice(game_manager.get_empty_cells())
+    return row, col, rng.choice("SO")
+
+
+def greedy_policy(game_manager, rng):
+    """Plays the move completing the most SOS lines, falling back to a random move."""
+    scoring_moves = game_manager.scoring_moves()
+    if not scoring_moves:
+        return random_policy(game_manager, rng)
+    row, col, character, _ = max(scoring_moves, key=lambda move: move[3])
+    return row, col, character
+
+
+def cautious_policy(game_manager, rng):
+    """Plays like greedy_policy, but falls back to a random move that opens no SOS for the opponent."""
+    scoring_moves = game_manager.scoring_moves()
+    if scoring_moves:
+        row, col, character, _ = max(scoring_moves, key=lambda move: move[3])
+        return row, col, character
+    safe_moves = game_manager.safe_moves()
+    if safe_moves:
+        return rng.choice(safe_moves)
+    return random_policy(game_manager, rng)
+
+
+# Move policies selectable by name; each takes (game_manager, rng) and returns (row, col, character)
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "cautious": cautious_policy,
+}
+
+
+def play_game(board_size, game_mode, blue_policy, red_policy, rng):
+    """Plays one game headlessly and returns its winner, scores and number of moves."""
+    game_manager = GameManager(board_size, game_mode)
+    game_manager.reset_game(board_size, game_mode)
+    policies = {"Blue": blue_policy, "Red": red_policy}
+    moves = 0
+
+    while True:
+        row, col, character = policies[game_manager.get_current_player()](game_manager, rng)
+        result = game_manager.make_move(row, col, character)
+        moves += 1
+        outcome = result["result"]
+        if outcome == "next_turn":
+            game_manager.switch_turn()
+        elif outcome != "continue" or game_manager.is_board_full():
+            break
+
+    if outcome == "draw":
+        winner = "Draw"
+    elif outcome in ("win", "end"):
+        winner = result["winner"]
+    else:
+        # The last move scored and filled the board, so the game ends on the extra turn
+        winner = game_manager.end_game()["winner"]
+
+    return {
+        "winner": winner,
+        "blue_score": game_manager.sos_count["Blue"],
+        "red_score": game_manager.sos_count["Red"],
+        "moves": moves,
+    }
+
+
+class SimulationStats:
+    """Aggregates the results of many games played with the same mode and board size."""
+
+    def __init__(self, game_mode, board_size):
+        self.game_mode = game_mode
+        self.board_size = board_size
+        self.games = 0
+        self.wins = {"Blue": 0, "Red": 0, "Draw": 0}
+        self.sos_totals = {"Blue": 0, "Red": 0}
+        self.lengths = Counter()
+
+    def add_game(self, game):
+        """Adds the result of one game returned by play_game."""
+        self.games += 1
+        self.wins[game["winner"]] += 1
+        self.sos_totals["Blue"] += game["blue_score"]
+        self.sos_totals["Red"] += game["red_score"]
+        self.lengths[game["moves"]] += 1
+
+    def merge(self, other):
+        """Adds the totals of another SimulationStats for the same configuration."""
+        self.games += other.games
+        for key in self.wins:
+            self.wins[key] += other.wins[key]
+        for key in self.sos_totals:
+            self.sos_totals[key] += other.sos_totals[key]
+        self.lengths.update(other.lengths)
+
+    def summary(self):
+        """Returns the aggregate statistics as a plain dictionary."""
+        games = self.games or 1
+        return {
+            "game_mode": self.game_mode,
+            "board_size": self.board_size,
+            "games": self.games,
+            "win_rate": {key: count / games for key, count in self.wins.items()},
+            "average_sos": {key: total / games for key, total in self.sos_totals.items()},
+            "average_length": sum(length * count for length, count in self.lengths.items()) / games,
+            "length_distribution": dict(sorted(self.lengths.items())),
+        }
+
+
+def _run_batch(task):
+    """Plays a batch of games in a worker process and returns its SimulationStats."""
+    board_size, game_mode, blue_name, red_name, games, seed = task
+    rng = random.Random(seed)
+    blue_policy = POLICIES[blue_name]
+    red_policy = POLICIES[red_name]
+    stats = SimulationStats(game_mode, board_size)
+    for _ in range(games):
+        stats.add_game(play_game(board_size, game_mode, blue_policy, red_policy, rng))
+    return stats
+
+
+def simulate(games, board_sizes=(3,), game_modes=("Simple", "General"), blue_policy="random",
+             red_policy="random", workers=None, seed=None, batch_size=250):
+    """Plays the given number of games for every mode and board size across a process pool.
+
+    Returns a dictionary mapping (game_mode, board_size) to SimulationStats.
+    """
+    for name in (blue_policy, red_policy):
+        if name not in POLICIES:
+            raise ValueError(f"Unknown policy: {name}")
+
+    seeds = random.Random(seed)
+    tasks = []
+    for game_mode in game_modes:
+        for board_size in board_sizes:
+            remaining = games
+            while remaining > 0:
+                count = min(batch_size, remaining)
+                tasks.append((board_size, game_mode, blue_policy, red_policy, count, seeds.getrandbits(64)))
+                remaining -= count
+
+    results = {(game_mode, board_size): SimulationStats(game_mode, board_size)
+               for game_mode in game_modes for board_size in board_sizes}
+
+    if workers == 1:
+        # Run in-process, which avoids pool start-up cost for small jobs
+        for stats in map(_run_batch, tasks):
+            results[(stats.game_mode, stats.board_size)].merge(stats)
+    else:
+        from multiprocessing import Pool  # Imported lazily to keep short-lived workers fast to start
+        with Pool(processes=workers) as pool:
+            for stats in pool.imap_unordered(_run_batch, tasks):
+                results[(stats.game_mode, stats.board_size)].merge(stats)
+
+    return results
+
+
+def format_report(results):
+    """Formats simulation results as a human readable table."""
+    lines = []
+    for (game_mode, board_size), stats in sorted(results.items()):
+        summary = stats.summary()
+        win_rate = summary["win_rate"]
+        average_sos = summary["average_sos"]
+        lines.append(
+            f"{game_mode:<13} {board_size:>2}x{board_size:<2} games={summary['games']:<8} "
+            f"blue={win_rate['Blue']:.3f} red={win_rate['Red']:.3f} draw={win_rate['Draw']:.3f} "
+            f"sos(blue/red)={average_sos['Blue']:.2f}/{average_sos['Red']:.2f} "
+            f"length={summary['average_length']:.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command-line entry point for headless self-play."""
+    parser = argparse.ArgumentParser(description="Play SOS games headlessly and report aggregate statistics.")
+    parser.add_argument("--games", type=int, default=1000, help="games per mode and board size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3], help="board sizes to simulate")
+    parser.add_argument("--modes", nargs="+", default=["Simple", "General"], choices=list(GAME_MODES))
+    parser.add_argument("--blue", default="random", choices=sorted(POLICIES), help="Blue move policy")
+    parser.add_argument("--red", default="random", choices=sorted(POLICIES), help="Red move policy")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = simulate(args.games, args.sizes, args.modes, args.blue, args.red, args.workers, args.seed)
+    if args.json:
+        print(json.dumps([stats.summary() for _, stats in sorted(results.items())], indent=2))
+    else:
+        print(format_report(results))
+
+
+if __name__ == "__main__":
+    main()
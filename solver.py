@@ -0,0 +1,325 @@
+import argparse
+import os
+import time
+from operator import add
+
+from ai_player import EXACT, LOWER, UPPER
+from board_codec import LETTER_CODES, LETTERS, board_codes
+from opening_book import symmetries
+from pattern_engine import GAME_MODES, compile_pattern
+from sos_lines import cell_coordinates
+
+
+class Solver:
+    """Exact memoized negamax for one board size and game mode.
+
+    Values are for the side to move: in Simple mode 1 (win), 0 (draw) or -1
+    (loss); in General mode the side to move's SOS lines minus the
+    opponent's from here to the end of the game. Both depend only on the
+    letters on the board, so results are memoized by the position's
+    canonical key under the 8 board symmetries (as in opening_book), which
+    is kept up to date incrementally as moves are tried. A shared mapping,
+    such as a multiprocessing Manager dict, can hold the results for
+    positions with up to shared_plies letters so that workers solving
+    different openings reuse each other's work.
+    """
+
+    def __init__(self, board_size, game_mode, shared=None, shared_plies=0):
+        if game_mode not in GAME_MODES:
+            raise ValueError(f"Unknown game mode: {game_mode}")
+        scoring_mode, word = GAME_MODES[game_mode]
+        self.board_size = board_size
+        self.game_mode = game_mode
+        self.simple = scoring_mode == "Simple"
+        self.cell_count = board_size * board_size
+        pattern = compile_pattern(word, board_size)
+        # completions[cell][code]: (other cells, codes they need) for each line the letter completes at the cell
+        self.completions = tuple(
+            (None,) + tuple(
+                tuple((tuple(other_row * board_size + other_col for other_row, other_col in others),
+                       tuple(LETTER_CODES[letter] for letter in letters))
+                      for others, letters, _ in pattern.completions[row][col].get(LETTERS[code], ()))
+                for code in (1, 2))
+            for row, col in cell_coordinates(board_size)
+        )
+        # deltas[cell][code]: what the letter adds to the position key under each symmetry
+        self.forwards = tuple(forward for forward, _ in symmetries(board_size))
+        self.deltas = tuple(
+            (None,) + tuple(tuple(code << (forward[cell] << 1) for forward in self.forwards) for code in (1, 2))
+            for cell in range(self.cell_count)
+        )
+        self.limit = len(pattern.windows) + 1  # Beyond any General value
+        self.memo = {}
+        self.shared = shared
+        self.shared_plies = shared_plies
+        self.depth_nodes = [0] * (self.cell_count + 1)  # Positions searched per number of letters on the board
+
+    def position_keys(self, codes):
+        """Returns the key of the position under each symmetry; the smallest is its canonical key."""
+        return tuple(sum(code << (forward[cell] << 1) for cell, code in enumerate(codes) if code)
+                     for forward in self.forwards)
+
+    def _gain(self, codes, cell, code):
+        """Counts the lines completed by placing code at cell."""
+        gain = 0
+        for others, needed in self.completions[cell][code]:
+            for other, value in zip(others, needed):
+                if codes[other] != value:
+                    break
+            else:
+                gain += 1
+        return gain
+
+    def _store(self, key, filled, value, flag):
+        self.memo[key] = (value, flag)
+        if self.shared is not None and filled <= self.shared_plies:
+            self.shared[key] = (value, flag)
+
+    def _search(self, codes, keys, filled, alpha, beta):
+        """Returns the value of a position that is not over, searched with an alpha-beta window."""
+        key = min(keys)
+        entry = self.memo.get(key)
+        if entry is None and self.shared is not None and filled <= self.shared_plies:
+            entry = self.shared.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                return value
+        self.depth_nodes[filled] += 1
+
+        moves = []
+        for cell in range(self.cell_count):
+            if not codes[cell]:
+                for code in (1, 2):
+                    gain = self._gain(codes, cell, code)
+                    if gain and self.simple:
+                        self._store(key, filled, 1, EXACT)
+                        return 1
+                    moves.append((gain, cell, code))
+        moves.sort(reverse=True)  # Scoring moves first
+
+        last = filled + 1 == self.cell_count
+        original_alpha = alpha
+        best = -self.limit
+        for gain, cell, code in moves:
+            if last:
+                value = gain
+            else:
+                codes[cell] = code
+                child_keys = tuple(map(add, keys, self.deltas[cell][code]))
+                if gain:
+                    # The mover scored and plays again
+                    value = gain + self._search(codes, child_keys, filled + 1, alpha - gain, beta - gain)
+                else:
+                    value = -self._search(codes, child_keys, filled + 1, -beta, -alpha)
+                codes[cell] = 0
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._store(key, filled, best, flag)
+        return best
+
+    def solve_codes(self, codes):
+        """Returns the exact value of a position given as flat cell codes (0 empty, 1 S, 2 O)."""
+        codes = list(codes)
+        filled = sum(1 for code in codes if code)
+        if filled == self.cell_count:
+            return 0
+        return self._search(codes, self.position_keys(codes), filled, -self.limit, self.limit)
+
+    def move_values(self, codes):
+        """Returns {(cell, code): exact value for the mover} for every move in a position given as cell codes."""
+        codes = list(codes)
+        keys = self.position_keys(codes)
+        filled = sum(1 for code in codes if code)
+        values = {}
+        for cell in range(self.cell_count):
+            if codes[cell]:
+                continue
+            for code in (1, 2):
+                gain = self._gain(codes, cell, code)
+                if gain and self.simple:
+                    values[(cell, code)] = 1
+                    continue
+                if filled + 1 == self.cell_count:
+                    values[(cell, code)] = gain
+                    continue
+                codes[cell] = code
+                child = self._search(codes, tuple(map(add, keys, self.deltas[cell][code])), filled + 1,
+                                     -self.limit, self.limit)
+                codes[cell] = 0
+                values[(cell, code)] = gain + child if gain else -child
+        return values
+
+    def solve_position(self, game_manager):
+        """Returns {(row, col, character): exact value for the player to move} for a GameManager position."""
+        if (game_manager.board_size, game_manager.game_mode) != (self.board_size, self.game_mode):
+            raise ValueError("The position does not match the solver's board size and game mode")
+        if not game_manager.is_game_active:
+            raise ValueError("The game is over")
+        return {divmod(cell, self.board_size) + (LETTERS[code],): value
+                for (cell, code), value in self.move_values(board_codes(game_manager)).items()}
+
+    def perft(self, max_depth=None):
+        """Returns [(depth, move sequences, games ended)] from the empty board, like a chess perft.
+
+        Positions reached by different move orders, or that are rotations or
+        reflections of each other, have identical subtrees, so each layer
+        keeps one entry per canonical position with the number of move
+        sequences reaching it instead of walking every sequence.
+        """
+        cells = self.cell_count
+        max_depth = cells if max_depth is None else min(max_depth, cells)
+        deltas = self.deltas
+        layer = {0: [1, (0,) * cells, (0,) * len(self.forwards)]}
+        counts = [(0, 1, 0)]
+        for depth in range(1, max_depth + 1):
+            next_layer = {}
+            nodes = ended = 0
+            for paths, codes, keys in layer.values():
+                for cell in range(cells):
+                    if codes[cell]:
+                        continue
+                    for code in (1, 2):
+                        nodes += paths
+                        if depth == cells or (self.simple and self._gain(codes, cell, code)):
+                            ended += paths
+                            continue
+                        child_keys = tuple(map(add, keys, deltas[cell][code]))
+                        key = min(child_keys)
+                        entry = next_layer.get(key)
+                        if entry is None:
+                            next_layer[key] = [paths, codes[:cell] + (code,) + codes[cell + 1:], child_keys]
+                        else:
+                            entry[0] += paths
+            layer = next_layer
+            counts.append((depth, nodes, ended))
+        return counts
+
+
+def split_positions(solver, plies):
+    """Returns {canonical key: cell codes} for the distinct positions, game not over, after the given plies."""
+    positions = {}
+
+    def walk(codes, keys, depth):
+        if depth == plies:
+            positions.setdefault(min(keys), tuple(codes))
+            return
+        for cell in range(solver.cell_count):
+            if codes[cell]:
+                continue
+            for code in (1, 2):
+                if depth + 1 == solver.cell_count or (solver.simple and solver._gain(codes, cell, code)):
+                    continue  # The game is over after this move
+                codes[cell] = code
+                walk(codes, tuple(map(add, keys, solver.deltas[cell][code])), depth + 1)
+                codes[cell] = 0
+
+    walk([0] * solver.cell_count, (0,) * len(solver.forwards), 0)
+    return positions
+
+
+_worker_solver = None
+
+
+def _init_worker(board_size, game_mode, shared, shared_plies):
+    global _worker_solver
+    _worker_solver = Solver(board_size, game_mode, shared, shared_plies)
+
+
+def _solve_task(codes):
+    """Solves one split position in a worker and returns (key, value, positions searched per depth)."""
+    solver = _worker_solver
+    before = list(solver.depth_nodes)
+    value = solver.solve_codes(codes)
+    return min(solver.position_keys(codes)), value, [after - start for after, start in zip(solver.depth_nodes, before)]
+
+
+def describe_value(value, game_mode):
+    """Describes the value of the empty board, which is Blue's, as a game result."""
+    if value == 0:
+        return "Draw"
+    winner = "Blue" if value > 0 else "Red"
+    if GAME_MODES[game_mode][0] == "Simple":
+        return f"{winner} wins"
+    return f"{winner} wins by {abs(value)}"
+
+
+def solve(board_size, game_mode, workers=None, split_plies=1, shared_plies=3):
+    """Solves a game from the empty board and returns the result with search statistics.
+
+    The distinct positions after split_plies moves are solved in a process
+    pool (in-process when workers is 1) with a shared memo for positions of
+    up to shared_plies letters; the opening plies are then solved on top of
+    their exact values.
+    """
+    started = time.perf_counter()
+    solver = Solver(board_size, game_mode)
+    positions = split_positions(solver, split_plies)
+    tasks = [positions[key] for key in sorted(positions)]
+    if workers == 1:
+        results = [(key, solver.solve_codes(codes), None) for key, codes in zip(sorted(positions), tasks)]
+    else:
+        # Imported lazily to keep short-lived workers fast to start
+        from multiprocessing import Manager, Pool
+        with Manager() as manager:
+            shared = manager.dict()
+            with Pool(workers, initializer=_init_worker,
+                      initargs=(board_size, game_mode, shared, shared_plies)) as pool:
+                results = list(pool.imap_unordered(_solve_task, tasks))
+
+    for key, value, depth_nodes in results:
+        solver.memo[key] = (value, EXACT)
+        if depth_nodes is not None:
+            solver.depth_nodes = [total + count for total, count in zip(solver.depth_nodes, depth_nodes)]
+    values = solver.move_values([0] * solver.cell_count)
+    value = max(values.values())
+    return {
+        "board_size": board_size,
+        "game_mode": game_mode,
+        "value": value,
+        "result": describe_value(value, game_mode),
+        "best_moves": sorted(divmod(cell, board_size) + (LETTERS[code],)
+                             for (cell, code), move_value in values.items() if move_value == value),
+        "nodes": sum(solver.depth_nodes),
+        "depth_nodes": solver.depth_nodes,
+        "split_positions": len(tasks),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main(argv=None):
+    """Command-line entry point that solves small boards and prints perft counts."""
+    parser = argparse.ArgumentParser(description="Solve SOS exactly on small boards.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3])
+    parser.add_argument("--modes", nargs="+", default=["Simple", "General"], choices=list(GAME_MODES))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--split-plies", type=int, default=1, help="solve the positions after this many moves in parallel")
+    parser.add_argument("--shared-plies", type=int, default=3, help="share results for positions up to this many letters")
+    parser.add_argument("--perft", action="store_true", help="also count the move sequences at every depth")
+    args = parser.parse_args(argv)
+
+    for game_mode in args.modes:
+        for board_size in args.sizes:
+            if args.perft:
+                print(f"{'depth':>5} {'nodes':>20} {'ended':>20}")
+                for depth, nodes, ended in Solver(board_size, game_mode).perft():
+                    print(f"{depth:>5} {nodes:>20} {ended:>20}")
+            result = solve(board_size, game_mode, args.workers, args.split_plies, args.shared_plies)
+            moves = " ".join(f"{row + 1},{col + 1},{character}" for row, col, character in result["best_moves"])
+            print(f"{game_mode} {board_size}x{board_size}: {result['result']} "
+                  f"({result['nodes']} positions searched in {result['seconds']:.1f}s; best first moves {moves})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,506 @@
+import logging
+import os
+import random
+import tkinter as tk
+from tkinter import filedialog, ttk
+from game_manager import GameManager
+from pattern_engine import GAME_MODES
+from player_controls import PlayerControls
+from game_board import CanvasGameBoard
+from ai_player import AlphaBetaPlayer
+from mcts_player import MCTSPlayer
+from analysis_service import AnalysisService
+from opening_book import OpeningLibrary
+from game_record import iter_games
+from playback import PlaybackController, bot_moves, record_moves
+from simulate import POLICIES
+
+# Largest board size accepted by the board size selector
+MAX_BOARD_SIZE = 20
+
+logger = logging.getLogger(__name__)
+
+class SOSGameGUI:
+    """Handles the user interface for the SOS game."""
+    
+    def __init__(self, root):
+        self.root = root
+        self.root.title("SOS Application")
+
+        # Initialize Game Manager
+        self.board_size = 3
+        self.game_mode = "Simple"
+        self.game_manager = GameManager(self.board_size, self.game_mode)
+
+        # Game active flag
+        self.is_game_active = False
+
+        # Opening positions are answered from the books in opening_books/ when one exists for the game
+        self.opening_books = OpeningLibrary()
+        if not os.path.isdir(self.opening_books.directory):
+            logger.info("No opening books in %s; build them with `python opening_book.py`",
+                        self.opening_books.directory)
+        # Computer opponents used for players marked as "Computer"; MCTS takes over on large boards
+        self.computer_player = AlphaBetaPlayer(time_limit=1.0, book=self.opening_books)
+        self.mcts_player = MCTSPlayer(time_limit=1.0, book=self.opening_books)
+        self.hint_player = AlphaBetaPlayer(time_limit=5.0, book=self.opening_books)
+        self.computer_moving = False
+        self.computer_move = None
+
+        # Background searches for hints and computer moves
+        self.analysis = AnalysisService(self.root)
+
+        # Replay of a recorded game or a bot-vs-bot game, when one is running
+        self.playback = None
+
+        # Create the main UI structure
+        self.create_ui()
+
+    def create_ui(self):
+        """Sets up the main layout for the game."""
+        self.main_frame = tk.Frame(self.root)
+        self.main_frame.grid(row=0, column=0, padx=20, pady=20)
+
+        # Top Frame for mode and size selection
+        self.top_frame = tk.Frame(self.main_frame)
+        self.top_frame.grid(row=0, column=0, columnspan=3, padx=10, pady=10)
+
+        # Set up the game controls
+        self.setup_game_controls(self.top_frame)
+
+        # Player control frames
+        self.blue_frame = tk.Frame(self.main_frame)
+        self.blue_controls = PlayerControls(self.blue_frame, "Blue")
+        self.blue_frame.grid(row=1, column=0, padx=20, pady=10, sticky="n")
+
+        self.red_frame = tk.Frame(self.main_frame)
+        self.red_controls = PlayerControls(self.red_frame, "Red")
+        self.red_frame.grid(row=1, column=2, padx=20, pady=10, sticky="n")
+
+        # Create the Scrollable Board Frame
+        self.create_scrollable_board_frame()
+
+        # Bottom Frame for start/end game buttons
+        self.bottom_frame = tk.Frame(self.main_frame)
+        self.bottom_frame.grid(row=2, column=0, columnspan=3, pady=20)
+
+        self.setup_bottom_controls(self.bottom_frame)
+        
+        # Labels for SOS counts in General mode
+        blue_count = self.game_manager.sos_count["Blue"]
+        red_count = self.game_manager.sos_count["Red"]
+            
+        self.blue_sos_label = tk.Label(self.main_frame, text=f"Blue SOS Count:{blue_count}")
+        self.blue_sos_label.grid(row=3, column=0, padx=5, pady=5)
+
+        self.red_sos_label = tk.Label(self.main_frame, text=f"Red SOS Count: {red_count}")
+        self.red_sos_label.grid(row=3, column=2, padx=5, pady=5)
+
+    def create_scrollable_board_frame(self):
+        """Create a scrollable frame for the game board."""
+        self.canvas = tk.Canvas(self.main_frame)
+        self.canvas.grid(row=1, column=1, padx=20, pady=10, sticky="nsew")
+
+        self.scrollbar_x = ttk.Scrollbar(self.main_frame, orient="horizontal", command=self.canvas.xview)
+        self.scrollbar_x.grid(row=3, column=1, sticky="ew")
+
+        self.scrollbar_y = ttk.Scrollbar(self.main_frame, orient="vertical", command=self.canvas.yview)
+        self.scrollbar_y.grid(row=1, column=3, sticky="ns")
+
+        self.canvas.configure(xscrollcommand=self.scrollbar_x.set, yscrollcommand=self.scrollbar_y.set)
+
+        self.board_frame = tk.Frame(self.canvas)
+        self.canvas.create_window((0, 0), window=self.board_frame, anchor="nw")
+
+        self.board_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+
+    def setup_game_controls(self, parent):
+        """Sets up game mode and board size selection."""
+        label = tk.Label(parent, text="SOS")
+        label.grid(row=0, column=0, padx=5, pady=1, sticky="w")
+
+        self.radio_var = tk.StringVar(value="Simple Game")  # "<game mode> Game"; see selected_mode
+
+        radio_frame = tk.Frame(parent)
+        radio_frame.grid(row=0, column=1, padx=10, pady=1, sticky="w")
+
+        # One button per game mode, Simple and General first, then the pattern modes two per row
+        for index, game_mode in enumerate(GAME_MODES):
+            tk.Radiobutton(radio_frame, text=f"{game_mode} game", variable=self.radio_var,
+                           value=f"{game_mode} Game").grid(row=index // 2, column=index % 2, padx=5, pady=1, sticky="w")
+
+        board_size_label = tk.Label(parent, text="Board size")
+        board_size_label.grid(row=0, column=2, padx=5, pady=1, sticky="w")
+
+        self.board_size_var = tk.IntVar(value=3)
+        vcmd = (self.root.register(self.validate_board_size), '%P')
+        self.board_size_spinbox = tk.Spinbox(parent, from_=3, to=MAX_BOARD_SIZE, textvariable=self.board_size_var, 
+                                             validate="key", validatecommand=vcmd, width=3)
+        self.board_size_spinbox.grid(row=0, column=3, padx=5, pady=1, sticky="w")
+
+    def setup_bottom_controls(self, parent):
+        """Sets up the bottom controls like Start/End game buttons."""
+        self.start_button = tk.Button(parent, text="Start Game", command=self.toggle_game)
+        self.start_button.grid(row=0, column=0, padx=10, pady=5)
+
+        self.hint_button = tk.Button(parent, text="Hint", command=self.request_hint)
+        self.hint_button.grid(row=0, column=1, padx=10, pady=5)
+
+        self.undo_button = tk.Button(parent, text="Undo", command=self.undo_move)
+        self.undo_button.grid(row=0, column=2, padx=10, pady=5)
+
+        self.redo_button = tk.Button(parent, text="Redo", command=self.redo_move)
+        self.redo_button.grid(row=0, column=3, padx=10, pady=5)
+
+        self.turn_label = tk.Label(parent, text="Current turn: Blue")
+        self.turn_label.grid(row=1, column=0)
+        self.turn_label.grid_remove()
+
+        self.hint_label = tk.Label(parent, text="")
+        self.hint_label.grid(row=2, column=0, columnspan=2)
+
+        # Playback of recorded games and bot-vs-bot games; speed 0 plays as fast as possible
+        self.replay_button = tk.Button(parent, text="Replay...", command=self.replay_recorded_game)
+        self.replay_button.grid(row=3, column=0, padx=10, pady=5)
+
+        self.watch_button = tk.Button(parent, text="Watch Bots", command=self.watch_bots)
+        self.watch_button.grid(row=3, column=1, padx=10, pady=5)
+
+        self.speed_var = tk.IntVar(value=20)
+        self.speed_scale = tk.Scale(parent, from_=0, to=200, orient="horizontal", variable=self.speed_var,
+                                    label="Moves/s (0 = max)", command=self.on_speed_change)
+        self.speed_scale.grid(row=3, column=2, columnspan=2)
+
+        # Shades the empty cells where a letter would complete an SOS
+        self.show_threats = tk.BooleanVar(value=False)
+        self.threats_check = tk.Checkbutton(parent, text="Show threats", variable=self.show_threats,
+                                            command=self.update_threats)
+        self.threats_check.grid(row=1, column=1, columnspan=2)
+
+    def validate_board_size(self, new_value):
+        """Validates the board size input in the Spinbox to ensure it is between 3 and MAX_BOARD_SIZE."""
+        if new_value.isdigit():
+            value = int(new_value)
+            return 3 <= value <= MAX_BOARD_SIZE
+        return False
+
+    def toggle_game(self):
+        """Toggles between starting and ending the game."""
+        if self.start_button["text"] == "Start Game":
+            self.start_game()
+            self.start_button.config(text="End Game")
+        else:
+            self.end_game()
+            self.start_button.config(text="Start Game")
+
+    def selected_mode(self):
+        """Returns the game mode chosen with the radio buttons, whose values are "<game mode> Game"."""
+        return self.radio_var.get().removesuffix(" Game")
+
+    def start_game(self):
+        """Initializes the game board and sets up for play."""
+        self.is_game_active = True
+        # Retrieve the game mode as selected by the user in the radio buttons
+        self.game_mode = self.selected_mode()  # Update GUI�s game mode
+        self.board_size = self.board_size_var.get()  # Get selected board size from spinbox
+        
+        logger.debug("Selected game mode: %s", self.game_mode)
+
+        # Stop any search still looking at the previous game
+        self.analysis.cancel()
+
+        # Pass the selected game mode to the GameManager
+        self.game_manager.reset_game(self.board_size, self.game_mode)
+
+        # Adjust the window size and initialize the game board
+        self.adjust_window_size(self.board_size)
+        self.board = CanvasGameBoard(self.board_frame, self.board_size, self.on_board_click)
+        self.move_lines = []  # Canvas items of the SOS lines drawn by each move, for undo
+        
+        initial_turn = self.game_manager.get_current_player()
+        self.turn_label.config(text=f"Current turn: {initial_turn}")
+        self.turn_label.grid()  # Show the turn label to start displaying turns
+        self.schedule_computer_move()
+
+
+    def adjust_window_size(self, board_size):
+        """Adjusts the window size based on the board size."""
+        cell_size = 50
+        board_pixel_size = board_size * cell_size
+        max_window_size = 600
+
+        if board_pixel_size > max_window_size:
+            self.canvas.grid()
+        else:
+            self.root.geometry(f"{board_pixel_size + 600}x{board_pixel_size + 600}")
+
+    def on_board_click(self, row, col):
+        """Handles a click on the board."""
+        if not self.game_manager.is_game_active:
+            return
+
+        current_player = self.game_manager.get_current_player()
+        controls = self.get_player_controls(current_player)
+        if controls.is_computer.get() and not self.computer_moving:
+            return  # Ignore clicks while the computer is to move
+        character_choice = controls.choice.get()
+
+        move_result = self.game_manager.make_move(row, col, character_choice)
+
+        if move_result:
+            self.show_move(row, col, character_choice, current_player, move_result)
+
+    def show_move(self, row, col, character, current_player, move_result, replayed=False):
+        """Updates the board and labels after a move; replayed (redone) moves already have their turn restored."""
+        # The board changed, so any running analysis is out of date
+        self.analysis.cancel()
+        self.hint_label.config(text="")
+
+        # Update the board visually
+        self.board.update_button(row, col, character)
+        lines = []
+        if move_result["result"] in ("win", "continue"):
+            lines = self.draw_sos_lines(row, col, current_player)
+        self.move_lines.append(lines)
+        self.update_threats()
+
+        # Handle different results from make_move
+        if move_result["result"] == "win":
+            self.turn_label.config(text=f"{move_result['winner']} wins by creating the first SOS!")
+            self.end_game()
+        elif move_result["result"] == "continue":
+            self.update_sos_count_display()
+            self.turn_label.config(text=f"SOS! Current Turn: {current_player}")
+            self.schedule_computer_move()
+        elif move_result["result"] == "draw":
+            self.turn_label.config(text="The game is a draw! No SOS was created.")
+            self.end_game()
+        elif move_result["result"] == "end":
+            winner = move_result["winner"]
+            blue_score = move_result["blue_score"]
+            red_score = move_result["red_score"]
+
+            if winner == "Draw":
+                self.turn_label.config(text=f"The game is a draw! (Blue: {blue_score}, Red: {red_score})")
+            else:
+                self.turn_label.config(text=f"{winner} wins! (Blue: {blue_score}, Red: {red_score})")
+            self.end_game()
+        else:
+            # Switch to the next player if no SOS created
+            if not replayed:
+                self.game_manager.switch_turn()
+            next_turn = self.game_manager.get_current_player()
+            self.turn_label.config(text=f"Current turn: {next_turn}")
+            self.schedule_computer_move()
+
+    def is_playing_back(self):
+        """Checks if a replay or bot game is being played back."""
+        return self.playback is not None and self.playback.running
+
+    def playback_speed(self):
+        """Returns the selected playback speed in moves per second, or None for as fast as possible."""
+        return self.speed_var.get() or None
+
+    def on_speed_change(self, _value):
+        """Applies a new speed to the running playback."""
+        if self.playback is not None:
+            self.playback.set_speed(self.playback_speed())
+
+    def start_playback(self, game_mode, board_size, moves):
+        """Starts a new game of the given mode and size and plays the moves into it, frame by frame.
+
+        moves may be a callable taking the game manager and returning the move iterator.
+        """
+        if self.playback is not None:
+            self.playback.stop()
+        self.radio_var.set(f"{game_mode} Game")
+        self.board_size_var.set(board_size)
+        self.start_game()
+        self.analysis.cancel()  # Playback drives both sides
+        self.start_button.config(text="End Game")
+        self.board.enabled = False
+        if callable(moves):
+            moves = moves(self.game_manager)
+        self.playback = PlaybackController(self.root, self.game_manager, self.board, moves, self.playback_speed(),
+                                           on_frame=self.show_playback_frame, on_finish=self.finish_playback)
+        self.playback.start()
+
+    def replay_recorded_game(self):
+        """Asks for a game record file and replays its last game."""
+        path = filedialog.askopenfilename(title="Replay game record", filetypes=[("Game records", "*.sosr"),
+                                                                                 ("All files", "*")])
+        if not path:
+            return
+        record = None
+        try:
+            for record in iter_games(path):
+                pass
+        except (OSError, ValueError) as error:
+            self.hint_label.config(text=f"Cannot replay: {error}")
+            return
+        if record is None:
+            self.hint_label.config(text="The file holds no games")
+            return
+        self.start_playback(record.game_mode, record.board_size, record_moves(record))
+
+    def watch_bots(self):
+        """Plays a game between two computer policies on the selected mode and size."""
+        policies = {"Blue": POLICIES["cautious"], "Red": POLICIES["greedy"]}
+        self.start_playback(self.selected_mode(), self.board_size_var.get(),
+                            lambda game_manager: bot_moves(game_manager, policies, random.Random()))
+
+    def show_playback_frame(self, game_manager):
+        """Refreshes the score and turn labels once per playback frame."""
+        self.update_sos_count_display()
+        self.turn_label.config(text=f"Playback: move {self.playback.moves_played}, "
+                                    f"turn: {game_manager.get_current_player()}")
+
+    def finish_playback(self, result):
+        """Shows the result of a finished playback and ends the game."""
+        if "error" in result:
+            text = f"Playback stopped: {result['error']}"
+        elif result.get("result") == "win":
+            text = f"{result['winner']} wins by creating the first SOS!"
+        elif result.get("winner") in ("Blue", "Red"):
+            text = f"{result['winner']} wins! (Blue: {result['blue_score']}, Red: {result['red_score']})"
+        else:
+            text = "The game is a draw!"
+        self.end_game()
+        self.turn_label.config(text=text)
+        self.start_button.config(text="Start Game")
+
+    def update_threats(self):
+        """Highlights the cells where the player to move can complete an SOS, if Show threats is on."""
+        if getattr(self, "board", None) is None:
+            return
+        cells = []
+        if self.show_threats.get() and self.game_manager.is_game_active:
+            cells = {(row, col) for row, col, _, _ in self.game_manager.scoring_moves()}
+        self.board.highlight_cells(cells, "#fff2a8")
+
+    def draw_sos_lines(self, row, col, player):
+        """Draws every SOS completed through the given cell in the player's colour."""
+        color = "blue" if player == "Blue" else "red"
+        return [self.board.draw_sos_line(line[0], line[-1], color) for line in self.game_manager.get_sos_lines(row, col)]
+
+    def undo_move(self):
+        """Takes back moves until a human is to move, or a single move when both players are computers."""
+        if not self.game_manager.is_game_active or not self.game_manager.undo_stack or self.is_playing_back():
+            return
+        self.analysis.cancel()
+        has_human = not (self.blue_controls.is_computer.get() and self.red_controls.is_computer.get())
+        while self.game_manager.undo_stack:
+            row, col = self.game_manager.undo_stack[-1][:2]
+            self.game_manager.unmake_move()
+            self.board.update_button(row, col, ' ')
+            self.board.erase_items(self.move_lines.pop())
+            self.update_threats()
+            if not has_human or not self.get_player_controls(self.game_manager.get_current_player()).is_computer.get():
+                break
+
+        self.hint_label.config(text="")
+        self.update_sos_count_display()
+        self.turn_label.config(text=f"Current turn: {self.game_manager.get_current_player()}")
+        self.schedule_computer_move()
+
+    def redo_move(self):
+        """Replays the last move taken back with Undo."""
+        if not self.game_manager.is_game_active or not self.game_manager.redo_stack or self.is_playing_back():
+            return
+        row, col, character, player, _ = self.game_manager.redo_stack[-1]
+        move_result = self.game_manager.redo_move()
+        self.show_move(row, col, character, player, move_result, replayed=True)
+
+    def get_player_controls(self, player):
+        """Returns the PlayerControls for the given player."""
+        return self.blue_controls if player == "Blue" else self.red_controls
+
+    def schedule_computer_move(self):
+        """Starts a background search if the player to move is controlled by the computer."""
+        if not self.game_manager.is_game_active:
+            return
+        if self.get_player_controls(self.game_manager.get_current_player()).is_computer.get():
+            player = self.mcts_player if self.board_size >= 10 else self.computer_player
+            self.computer_move = None
+            self.analysis.start(self.game_manager, player.iter_search,
+                                self.on_computer_suggestion, self.play_computer_move)
+
+    def on_computer_suggestion(self, suggestion):
+        """Keeps the latest move suggested by the computer search."""
+        self.computer_move = suggestion[1]
+
+    def play_computer_move(self):
+        """Plays the computer's best move once its search has finished."""
+        if not self.game_manager.is_game_active or self.computer_move is None:
+            return
+        controls = self.get_player_controls(self.game_manager.get_current_player())
+        if not controls.is_computer.get():
+            return
+        row, col, character = self.computer_move
+        self.computer_move = None
+        controls.choice.set(character)
+        self.computer_moving = True
+        try:
+            self.on_board_click(row, col)
+        finally:
+            self.computer_moving = False
+
+    def request_hint(self):
+        """Starts a background search that streams improving move hints for the current player."""
+        if not self.game_manager.is_game_active or self.is_playing_back():
+            return
+        if self.get_player_controls(self.game_manager.get_current_player()).is_computer.get():
+            return  # The computer's own search is running, and a hint search would cancel it
+        self.hint_label.config(text="Thinking...")
+        self.analysis.start(self.game_manager, self.hint_player.iter_search, self.show_hint)
+
+    def show_hint(self, suggestion):
+        """Displays a move suggested by the hint search."""
+        depth, (row, col, character), _ = suggestion
+        self.hint_label.config(text=f"Hint: {character} at row {row + 1}, column {col + 1} (depth {depth})")
+
+    def update_sos_count_display(self):
+        """Updates the SOS count display for each player."""
+        blue_count = self.game_manager.sos_count["Blue"]
+        red_count = self.game_manager.sos_count["Red"]
+        self.blue_sos_label.config(text=f"Blue SOS Count: {blue_count}")
+        self.red_sos_label.config(text=f"Red SOS Count: {red_count}")
+
+    def end_game(self):
+        """Ends the game, disables all buttons, and clears the board."""
+        self.is_game_active = False
+        self.analysis.cancel()
+        if self.playback is not None:
+            self.playback.stop()
+        self.game_manager.end_game()
+
+        self.board.disable_buttons()
+        self.blue_controls.choice.set("S")
+        self.red_controls.choice.set("S")
+        self.board_frame.grid_remove()
+
+def main():
+    """Main function to run the Tkinter application."""
+    root = tk.Tk()
+    app = SOSGameGUI(root)
+
+    # Opt-in latency instrumentation: SOS_INSTRUMENT=1, plus SOS_PROFILE=<file> for a cProfile capture
+    instrumentation = None
+    if os.environ.get("SOS_INSTRUMENT"):
+        from instrumentation import Instrumentation
+        instrumentation = Instrumentation()
+        instrumentation.instrument_gui(app)
+        root.bind("<Control-i>", lambda event: print(instrumentation.report()))
+        if os.environ.get("SOS_PROFILE"):
+            instrumentation.start_profile()
+
+    root.mainloop()
+
+    if instrumentation is not None:
+        print(instrumentation.report())
+        if instrumentation.profiler is not None:
+            instrumentation.stop_profile(os.environ["SOS_PROFILE"])
+
+if __name__ == "__main__":
+    main()
+    
@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+# Line directions: horizontal, vertical, diagonal and anti-diagonal
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+@lru_cache(maxsize=None)
+def cell_coordinates(board_size):
+    """Returns the (row, col) of every flat cell index."""
+    return tuple(divmod(cell, board_size) for cell in range(board_size * board_size))
+
+
+@lru_cache(maxsize=None)
+def line_triples(board_size):
+    """Returns every line of three cells on the board as (a, b, c) flat cell indices, b being the middle cell."""
+    triples = []
+    for row in range(board_size):
+        for col in range(board_size):
+            for d_row, d_col in DIRECTIONS:
+                end_row = row + 2 * d_row
+                end_col = col + 2 * d_col
+                if 0 <= end_row < board_size and 0 <= end_col < board_size:
+                    triples.append((row * board_size + col,
+                                    (row + d_row) * board_size + col + d_col,
+                                    end_row * board_size + end_col))
+    return tuple(triples)
+
+
+@lru_cache(maxsize=None)
+def cell_triples(board_size):
+    """Maps each flat cell index to every (a, b, c) line triple passing through it."""
+    index = [[] for _ in range(board_size * board_size)]
+    for triple in line_triples(board_size):
+        for cell in triple:
+            index[cell].append(triple)
+    return tuple(tuple(triples) for triples in index)
+
+
+@lru_cache(maxsize=None)
+def cell_triples_rc(board_size):
+    """Same index as cell_triples, addressed as [row][col] with (row, col) pairs in each triple."""
+    index = cell_triples(board_size)
+    return tuple(
+        tuple(
+            tuple(tuple(divmod(cell, board_size) for cell in triple) for triple in index[row * board_size + col])
+            for col in range(board_size)
+        )
+        for row in range(board_size)
+    )
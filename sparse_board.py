@@ -0,0 +1,149 @@
+from game_manager import GameManager
+from sos_lines import DIRECTIONS
+
+# Cells per side of a storage tile; tiles are allocated the first time one of their cells is filled
+CHUNK_SIZE = 16
+LETTERS = " SO"
+LETTER_CODES = {'S': 1, 'O': 2}
+
+
+class SparseGameManager(GameManager):
+    """GameManager for very large or unbounded boards that stores only occupied cells.
+
+    Cells live in CHUNK_SIZE x CHUNK_SIZE bytearray tiles keyed by tile
+    coordinates, so memory grows with the moves played rather than the board
+    area. A board_size of None makes the board unbounded in every direction;
+    it is then never full. SOS detection computes the lines through a cell on
+    the fly, so it only reads the tiles next to the move.
+    """
+
+    def _new_board(self):
+        self.tiles = {}
+
+    def _reset_empty_cells(self):
+        self.occupied = 0
+        self.empty_count = None if self.board_size is None else self.board_size * self.board_size
+
+    def _mark_filled(self, row, col):
+        self.occupied += 1
+        if self.empty_count is not None:
+            self.empty_count -= 1
+
+    def _mark_empty(self, row, col):
+        self.occupied -= 1
+        if self.empty_count is not None:
+            self.empty_count += 1
+
+    def in_bounds(self, row, col):
+        """Checks if the cell lies on the board."""
+        size = self.board_size
+        return size is None or (0 <= row < size and 0 <= col < size)
+
+    def get_board_value(self, row, col):
+        """Returns the character at the given row and col, ' ' when empty and None when off the board."""
+        if not self.in_bounds(row, col):
+            return None
+        tile = self.tiles.get((row // CHUNK_SIZE, col // CHUNK_SIZE))
+        if tile is None:
+            return ' '
+        return LETTERS[tile[(row % CHUNK_SIZE) * CHUNK_SIZE + col % CHUNK_SIZE]]
+
+    def _place(self, row, col, character):
+        key = (row // CHUNK_SIZE, col // CHUNK_SIZE)
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self.tiles[key] = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+        tile[(row % CHUNK_SIZE) * CHUNK_SIZE + col % CHUNK_SIZE] = LETTER_CODES[character]
+
+    def _remove(self, row, col):
+        tile = self.tiles[(row // CHUNK_SIZE, col // CHUNK_SIZE)]
+        tile[(row % CHUNK_SIZE) * CHUNK_SIZE + col % CHUNK_SIZE] = 0
+
+    def _triples_through(self, row, col):
+        triples = []
+        for d_row, d_col in DIRECTIONS:
+            for offset in range(3):
+                start_row = row - offset * d_row
+                start_col = col - offset * d_col
+                end_row = start_row + 2 * d_row
+                end_col = start_col + 2 * d_col
+                if self.in_bounds(start_row, start_col) and self.in_bounds(end_row, end_col):
+                    triples.append(((start_row, start_col), (start_row + d_row, start_col + d_col), (end_row, end_col)))
+        return triples
+
+    def check_sos(self, row, col):
+        """Counts every SOS line completed through the given row and col."""
+        if self.pattern is not None:
+            return GameManager.check_sos(self, row, col)  # Pattern modes use the compiled tables
+        get = self.get_board_value
+        sos_count = 0
+        for a, b, c in self._triples_through(row, col):
+            if get(*b) == 'O' and get(*a) == 'S' and get(*c) == 'S':
+                sos_count += 1
+        return sos_count
+
+    def occupied_cells(self):
+        """Yields (row, col, character) for every filled cell."""
+        for (tile_row, tile_col), tile in self.tiles.items():
+            for index, code in enumerate(tile):
+                if code:
+                    offset_row, offset_col = divmod(index, CHUNK_SIZE)
+                    yield tile_row * CHUNK_SIZE + offset_row, tile_col * CHUNK_SIZE + offset_col, LETTERS[code]
+
+    def get_empty_cells(self):
+        """Returns the empty cells that are legal moves.
+
+        On a bounded board this is every empty cell. An unbounded board has
+        infinitely many, so it returns frontier_cells() instead.
+        """
+        if self.board_size is not None:
+            size = self.board_size
+            return [(row, col) for row in range(size) for col in range(size) if self.get_board_value(row, col) == ' ']
+        return self.frontier_cells()
+
+    def frontier_cells(self):
+        """Returns the empty cells within two steps of a filled cell, or the centre of an empty board.
+
+        A cell further from every move can neither complete nor open a line,
+        so on very large boards this is the move list worth searching. Its
+        cost grows with the moves played rather than the board area. The
+        centre of an unbounded board is (0, 0).
+        """
+        if not self.occupied:
+            return [(0, 0)] if self.board_size is None else [(self.board_size // 2, self.board_size // 2)]
+        frontier = set()
+        for row, col, _ in self.occupied_cells():
+            for d_row in range(-2, 3):
+                for d_col in range(-2, 3):
+                    if self.get_board_value(row + d_row, col + d_col) == ' ':
+                        frontier.add((row + d_row, col + d_col))
+        return list(frontier)
+
+    def _board_letters(self):
+        if self.board_size is None:
+            raise ValueError("An unbounded board cannot be saved as a snapshot")
+        size = self.board_size
+        get = self.get_board_value
+        return "".join([get(row, col) for row in range(size) for col in range(size)])
+
+    def _load_cells(self, letters):
+        self.tiles = {}
+        for index, character in enumerate(letters):
+            if character != ' ':
+                self._place(*divmod(index, self.board_size), character)
+
+    def _load_empty_cells(self, letters):
+        self.occupied = len(letters) - letters.count(' ')
+        self.empty_count = letters.count(' ')
+
+    def copy(self):
+        """Returns an independent copy of the game state."""
+        clone = self.__class__(self.board_size, self.game_mode)
+        clone.tiles = {key: bytearray(tile) for key, tile in self.tiles.items()}
+        clone.occupied = self.occupied
+        clone.empty_count = self.empty_count
+        clone.current_player = self.current_player
+        clone.is_game_active = self.is_game_active
+        clone.sos_count = dict(self.sos_count)
+        clone.sos_occurred = self.sos_occurred
+        return clone
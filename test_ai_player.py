@@ -0,0 +1,73 @@
+import unittest
+from game_manager import GameManager
+from ai_player import AlphaBetaPlayer, TranspositionTable, WIN_SCORE
+
+
+class TestAlphaBetaPlayer(unittest.TestCase):
+
+    def new_game(self, board_size, game_mode, moves=()):
+        """Creates a game and plays the given (row, col, character) moves, switching turns as needed."""
+        game_manager = GameManager(board_size, game_mode)
+        game_manager.reset_game(board_size, game_mode)
+        for row, col, character in moves:
+            if game_manager.make_move(row, col, character)["result"] == "next_turn":
+                game_manager.switch_turn()
+        return game_manager
+
+    def test_completes_available_sos(self):
+        """Test that the player takes an SOS that wins a Simple game."""
+        game_manager = self.new_game(4, "Simple", [(0, 0, 'S'), (0, 1, 'O')])
+        player = AlphaBetaPlayer(time_limit=2.0)
+        self.assertEqual(player.choose_move(game_manager), (0, 2, 'S'))
+
+    def test_avoids_giving_opponent_sos(self):
+        """Test that the player does not set up an SOS for the opponent in Simple mode."""
+        game_manager = self.new_game(4, "Simple", [(0, 0, 'S')])
+        player = AlphaBetaPlayer(time_limit=None, max_depth=2)
+        row, col, character = player.choose_move(game_manager)
+        game_manager.make_move(row, col, character)
+        game_manager.switch_turn()
+        self.assertTrue(all(game_manager.count_potential_sos(r, c, letter) == 0
+                            for r, c in game_manager.get_empty_cells() for letter in "SO"))
+
+    def test_general_takes_double_sos(self):
+        """Test that the player prefers the move completing the most SOS lines."""
+        moves = [(0, 0, 'S'), (0, 2, 'S'), (2, 0, 'S'), (2, 2, 'S'), (1, 0, 'O')]
+        game_manager = self.new_game(3, "General", moves)
+        player = AlphaBetaPlayer(time_limit=None, max_depth=1)
+        self.assertEqual(player.choose_move(game_manager), (1, 1, 'O'))
+
+    def test_solves_three_by_three(self):
+        """Test that a full-depth search of an empty 3x3 board finishes within the budget."""
+        player = AlphaBetaPlayer(time_limit=30.0)
+        results = list(player.iter_search(self.new_game(3, "Simple")))
+        self.assertTrue(results)
+        self.assertLess(abs(results[-1][2]), WIN_SCORE)
+
+    def test_full_board_returns_none(self):
+        """Test that no move is returned once the board is full."""
+        moves = [(row, col, 'S') for row in range(3) for col in range(3)]
+        game_manager = self.new_game(3, "General", moves)
+        self.assertIsNone(AlphaBetaPlayer().choose_move(game_manager))
+
+    def test_tiny_time_limit_still_moves(self):
+        """Test that a time limit shorter than the first depth still returns a move."""
+        game_manager = self.new_game(20, "General")
+        player = AlphaBetaPlayer(time_limit=1e-6)
+        row, col, character = player.choose_move(game_manager)
+        self.assertEqual(game_manager.get_board_value(row, col), ' ')
+        self.assertEqual(player.depth_reached, 1)
+
+    def test_transposition_table_is_bounded(self):
+        """Test that the transposition table evicts the least recently used entry."""
+        table = TranspositionTable(max_entries=2)
+        table.store(1, 1, 0, 0, None)
+        table.store(2, 1, 0, 0, None)
+        table.get(1)
+        table.store(3, 1, 0, 0, None)
+        self.assertEqual(len(table), 2)
+        self.assertIsNone(table.get(2))
+        self.assertIsNotNone(table.get(1))
+
+if __name__ == '__main__':
+    unittest.main()
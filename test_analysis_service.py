@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+from game_manager import GameManager
+from analysis_service import AnalysisService
+from ai_player import AlphaBetaPlayer
+
+
+class FakeRoot:
+    """Stands in for Tk's root window by collecting callbacks scheduled with after()."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay, callback):
+        self.pending.append(callback)
+
+    def run_until_idle(self, timeout=10.0):
+        """Runs scheduled callbacks until nothing is left or the timeout passes."""
+        deadline = time.time() + timeout
+        while self.pending and time.time() < deadline:
+            callback = self.pending.pop(0)
+            time.sleep(0.005)
+            callback()
+
+
+class TestAnalysisService(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a 4x4 General game with an SOS available."""
+        self.game_manager = GameManager(board_size=4, game_mode="General")
+        self.game_manager.reset_game(4, "General")
+        self.game_manager.make_move(0, 0, 'S')
+        self.game_manager.make_move(0, 1, 'O')
+        self.root = FakeRoot()
+        self.service = AnalysisService(self.root)
+
+    def test_streams_suggestions_on_main_loop(self):
+        """Test that suggestions arrive through after() callbacks and finish with on_done."""
+        suggestions = []
+        finished = []
+        player = AlphaBetaPlayer(time_limit=None, max_depth=3)
+        self.service.start(self.game_manager, player.iter_search, suggestions.append, lambda: finished.append(True))
+        self.root.run_until_idle()
+
+        self.assertEqual([depth for depth, _, _ in suggestions], [1, 2, 3])
+        self.assertEqual(suggestions[-1][1], (0, 2, 'S'))
+        self.assertEqual(finished, [True])
+
+    def test_search_sees_snapshot(self):
+        """Test that moves made after starting do not affect the running search."""
+        boards = []
+
+        def search(game_manager, should_stop):
+            boards.append(game_manager.get_board_value(3, 3))
+            yield "done"
+
+        self.service.start(self.game_manager, search, lambda suggestion: None)
+        self.game_manager.make_move(3, 3, 'O')
+        self.root.run_until_idle()
+        self.assertEqual(boards, [' '])
+
+    def test_cancel_discards_results(self):
+        """Test that a cancelled search stops and delivers nothing."""
+        suggestions = []
+        player = AlphaBetaPlayer(time_limit=30.0)
+        self.service.start(self.game_manager, player.iter_search, suggestions.append)
+        self.service.cancel()
+        self.root.run_until_idle()
+        self.assertFalse(self.service.is_running())
+        self.assertEqual(suggestions, [])
+
+    def test_cancel_does_not_wait_for_the_worker(self):
+        """Test that cancel returns while the search is busy and the next search starts after it exits."""
+        release = threading.Event()
+        calls = []
+        suggestions = []
+
+        def slow_search(game_manager, should_stop):
+            calls.append("slow")
+            release.wait(5)
+            calls.append("slow done")
+            yield "stale"
+
+        def quick_search(game_manager, should_stop):
+            calls.append("quick")
+            yield "fresh"
+
+        self.service.start(self.game_manager, slow_search, suggestions.append)
+        self.service.cancel()  # Would block for 5 seconds if it joined the worker
+        self.service.start(self.game_manager, quick_search, suggestions.append)
+        self.assertTrue(self.service.is_running())
+        release.set()
+        self.root.run_until_idle()
+        self.assertEqual(calls, ["slow", "slow done", "quick"])
+        self.assertEqual(suggestions, ["fresh"])
+        self.assertFalse(self.service.is_running())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from game_manager import GameManager
+from batch_engine import np, BatchGameEngine, PLAYER_NAMES, RESULT_NAMES, NO_WINNER, DRAW
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchGameEngine(unittest.TestCase):
+
+    def replay_against_manager(self, board_size, game_mode, games=40, seed=5):
+        """Plays random batched games and replays each one through GameManager."""
+        engine = BatchGameEngine(games, board_size, game_mode)
+        managers = [GameManager(board_size, game_mode) for _ in range(games)]
+        for manager in managers:
+            manager.reset_game(board_size, game_mode)
+        rng = np.random.default_rng(seed)
+
+        while engine.is_game_active.any():
+            active = engine.is_game_active.copy()
+            rows, cols, letters = engine.random_moves(rng)
+            results = engine.step(rows, cols, letters)
+            for game in np.flatnonzero(active):
+                manager = managers[game]
+                result = manager.make_move(int(rows[game]), int(cols[game]), "SO"[letters[game] - 1])
+                expected = result["result"]
+                if expected == "continue" and manager.is_board_full():
+                    expected = "end"
+                self.assertEqual(RESULT_NAMES[results[game]], expected)
+                if expected == "next_turn":
+                    manager.switch_turn()
+
+        for game, manager in enumerate(managers):
+            self.assertNotEqual(engine.winner[game], NO_WINNER)
+            self.assertEqual(engine.sos_count[game].tolist(), [manager.sos_count["Blue"], manager.sos_count["Red"]])
+            self.assertEqual(PLAYER_NAMES[engine.current_player[game]], manager.get_current_player())
+
+    def test_simple_mode_matches_game_manager(self):
+        """Test that batched Simple games agree with GameManager move by move."""
+        self.replay_against_manager(4, "Simple")
+
+    def test_general_mode_matches_game_manager(self):
+        """Test that batched General games agree with GameManager move by move."""
+        self.replay_against_manager(5, "General")
+
+    def test_occupied_cell_is_invalid(self):
+        """Test that a move on an occupied cell leaves the board unchanged."""
+        engine = BatchGameEngine(2, 3, "Simple")
+        engine.step([0, 0], [0, 0], [1, 1])
+        results = engine.step([0, 1], [0, 1], [2, 2])
+        self.assertEqual(RESULT_NAMES[results[0]], None)
+        self.assertEqual(RESULT_NAMES[results[1]], "next_turn")
+        self.assertEqual(engine.boards[0, 0, 0], 1)
+
+    def test_full_board_without_sos_is_draw(self):
+        """Test that a filled Simple board with no SOS is a draw."""
+        engine = BatchGameEngine(1, 3, "Simple")
+        for cell in range(9):
+            engine.step([cell // 3], [cell % 3], [1])
+        self.assertEqual(engine.winner[0], DRAW)
+        self.assertFalse(engine.is_game_active[0])
+
+if __name__ == '__main__':
+    unittest.main()
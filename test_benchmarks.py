@@ -0,0 +1,93 @@
+import os
+import random
+import stat
+import sys
+import tempfile
+import unittest
+from benchmarks import _filled_game, compare_results, run_benchmarks, start_virtual_display, stop_virtual_display
+
+# Stands in for Xvfb: reports display 42 on the -displayfd descriptor, or exits at once when told to fail
+FAKE_XVFB = """#!{python}
+import os, sys, time
+if os.environ.get("FAIL"):
+    sys.exit(1)
+os.write(int(sys.argv[sys.argv.index("-displayfd") + 1]), b"42\\n")
+time.sleep(30)
+"""
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run_produces_rates(self):
+        """Test that a quick run reports a positive rate for every engine benchmark."""
+        results = run_benchmarks(board_sizes=[3], game_modes=["General"], min_time=0.01, gui=False)
+        self.assertEqual(len(results["rates"]), 4)
+        self.assertTrue(all(rate > 0 for rate in results["rates"].values()))
+
+    def test_filled_game_keeps_the_mode_rules(self):
+        """Test that benchmark boards are filled under the requested mode without ending at the first SOS."""
+        rng = random.Random(1)
+        for game_mode, word in (("Simple", None), ("General", None), ("General SOSOS", "SOSOS")):
+            game_manager = _filled_game(6, game_mode, rng)
+            self.assertTrue(game_manager.is_board_full())
+            self.assertEqual(game_manager.game_mode, game_mode)
+            self.assertEqual(game_manager.pattern.word if game_manager.pattern else None, word)
+        self.assertEqual(_filled_game(6, "Simple", rng, empty=1).empty_count, 1)
+
+    def test_slower_rate_is_regression(self):
+        """Test that a rate drop beyond the threshold is flagged and a small one is not."""
+        baseline = {"rates": {"make_move|Simple|3": 1000.0, "check_sos|Simple|3": 1000.0}}
+        current = {"rates": {"make_move|Simple|3": 700.0, "check_sos|Simple|3": 950.0}}
+        regressions = compare_results(baseline, current, threshold=0.1)
+        self.assertEqual([key for key, *_ in regressions], ["make_move|Simple|3"])
+
+    def test_slower_timing_is_regression(self):
+        """Test that a longer construction time beyond the threshold is flagged."""
+        baseline = {"timings": {"create_board|20": 0.10}}
+        current = {"timings": {"create_board|20": 0.15}}
+        self.assertEqual(len(compare_results(baseline, current, threshold=0.2)), 1)
+        self.assertEqual(compare_results(baseline, current, threshold=0.6), [])
+
+    def fake_xvfb(self, fail=False):
+        """Puts a stand-in Xvfb first on PATH and clears DISPLAY, restoring both afterwards."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "Xvfb")
+        with open(path, "w") as file:
+            file.write(FAKE_XVFB.format(python=sys.executable))
+        os.chmod(path, stat.S_IRWXU)
+        saved = {name: os.environ.get(name) for name in ("PATH", "DISPLAY", "FAIL")}
+
+        def restore():
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+        self.addCleanup(restore)
+        os.environ["PATH"] = directory.name + os.pathsep + os.environ.get("PATH", "")
+        os.environ.pop("DISPLAY", None)
+        os.environ.pop("FAIL", None)
+        if fail:
+            os.environ["FAIL"] = "1"
+
+    def test_virtual_display_uses_reported_number(self):
+        """Test that DISPLAY is set to the display Xvfb reports and unset again on stop."""
+        self.fake_xvfb()
+        process = start_virtual_display()
+        self.assertIsNotNone(process)
+        self.assertEqual(os.environ["DISPLAY"], ":42")
+        self.assertIsNone(process.poll())
+        stop_virtual_display(process)
+        self.assertIsNotNone(process.poll())
+        self.assertNotIn("DISPLAY", os.environ)
+
+    def test_virtual_display_that_exits_is_not_used(self):
+        """Test that an Xvfb exiting before it reports a display leaves DISPLAY unset."""
+        self.fake_xvfb(fail=True)
+        self.assertIsNone(start_virtual_display())
+        self.assertNotIn("DISPLAY", os.environ)
+
+if __name__ == '__main__':
+    unittest.main()
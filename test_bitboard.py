@@ -0,0 +1,46 @@
+import unittest
+from bitboard import BitboardGameManager
+
+
+class TestBitboardGameManager(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a new 3x3 General game backed by a bitboard."""
+        self.game_manager = BitboardGameManager(board_size=3, game_mode="General")
+        self.game_manager.reset_game(3, "General")
+
+    def test_initial_board_is_empty(self):
+        """Test that the bitboard exposes an empty list-of-lists board."""
+        empty_board = [[' ' for _ in range(3)] for _ in range(3)]
+        self.assertEqual(self.game_manager.board, empty_board)
+
+    def test_move_is_stored(self):
+        """Test that a placed character can be read back from the bitboard."""
+        self.game_manager.make_move(1, 2, 'O')
+        self.assertEqual(self.game_manager.get_board_value(1, 2), 'O')
+        self.assertEqual(self.game_manager.board[1], [' ', ' ', 'O'])
+
+    def test_occupied_cell_rejected(self):
+        """Test that placing a move in an occupied cell is rejected."""
+        self.game_manager.make_move(0, 0, 'S')
+        self.assertFalse(self.game_manager.make_move(0, 0, 'O'))
+
+    def test_sos_detected(self):
+        """Test that completing a diagonal SOS scores in General mode."""
+        self.game_manager.make_move(0, 0, 'S')
+        self.game_manager.make_move(1, 1, 'O')
+        result = self.game_manager.make_move(2, 2, 'S')
+
+        self.assertEqual(result["result"], "continue")
+        self.assertEqual(self.game_manager.sos_count["Blue"], 1)
+
+    def test_board_full(self):
+        """Test that the board is reported full once every cell is used."""
+        for row in range(3):
+            for col in range(3):
+                self.assertFalse(self.game_manager.is_board_full())
+                self.game_manager.make_move(row, col, 'S')
+        self.assertTrue(self.game_manager.is_board_full())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import random
+import tempfile
+import unittest
+from board_analyzer import (_check_batch, _check_game, count_sos_letters, count_sos_lines, load_position, np,
+                            validate_records)
+from game_manager import GameManager
+from game_record import HEADER, GAME_HEADER, MOVE, GameRecord, GameRecordWriter, iter_games
+
+
+def play_random(game_manager, rng):
+    while game_manager.is_game_active and not game_manager.is_board_full():
+        row, col = rng.choice(game_manager.get_empty_cells())
+        if game_manager.make_move(row, col, rng.choice("SO"))["result"] == "next_turn":
+            game_manager.switch_turn()
+
+
+class TestBoardAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".sosr")
+        os.close(handle)
+        os.remove(self.path)
+        self.addCleanup(lambda: os.path.exists(self.path) and os.remove(self.path))
+
+    def write_games(self, games, board_size=5, game_mode="General"):
+        rng = random.Random(6)
+        with GameRecordWriter(self.path, board_size, game_mode) as writer:
+            game_manager = GameManager(board_size, game_mode)
+            game_manager.recorder = writer
+            for _ in range(games):
+                game_manager.reset_game(board_size, game_mode)
+                play_random(game_manager, rng)
+                game_manager.end_game()
+
+    def test_recount_matches_game_scores(self):
+        """Test that recounting a finished General board gives the total SOS scored during play."""
+        rng = random.Random(2)
+        for board_size in (3, 4, 7):
+            for _ in range(10):
+                game_manager = GameManager(board_size, "General")
+                game_manager.reset_game(board_size, "General")
+                play_random(game_manager, rng)
+                letters = "".join("".join(row) for row in game_manager.board)
+                self.assertEqual(count_sos_letters(letters, board_size), sum(game_manager.sos_count.values()))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_stacked_boards(self):
+        """Test that a stack of boards is counted board by board in one call."""
+        boards = np.array([[[1, 2, 1], [2, 0, 0], [1, 0, 1]],
+                           [[1, 1, 1], [1, 2, 1], [1, 1, 1]]])
+        self.assertEqual(list(count_sos_lines(boards)), [2, 4])
+        self.assertEqual(count_sos_lines(boards[1]), 4)
+
+    def test_load_position(self):
+        """Test that loaded boards get consistent scores and flags, and inconsistent ones are rejected."""
+        rows = ["SOS", "...", "..."]
+        game_manager = load_position(GameManager(), rows, "General", "Red", {"Blue": 0, "Red": 1})
+        self.assertEqual((game_manager.sos_count, game_manager.sos_occurred), ({"Blue": 0, "Red": 1}, True))
+        self.assertTrue(game_manager.is_game_active)
+        self.assertEqual(game_manager.make_move(1, 1, 'O'), {"result": "next_turn"})
+        self.assertEqual(game_manager.get_empty_cells().__len__(), 5)
+
+        with self.assertRaises(ValueError):
+            load_position(GameManager(), rows, "General", sos_count={"Blue": 1, "Red": 1})
+        with self.assertRaises(ValueError):
+            load_position(GameManager(), rows, "General")
+        with self.assertRaises(ValueError):
+            load_position(GameManager(), ["SO", "OS"], "General")
+        with self.assertRaises(ValueError):
+            load_position(GameManager(), ["SOX", "...", "..."], "General")
+
+        simple = load_position(GameManager(), rows, "Simple")
+        self.assertFalse(simple.is_game_active)
+        self.assertTrue(simple.sos_occurred)
+        self.assertTrue(load_position(GameManager(), ["S.S", "...", "..."], "Simple").is_game_active)
+
+    def test_valid_records_pass(self):
+        """Test that faithfully recorded games validate cleanly."""
+        self.write_games(50)
+        self.assertEqual(validate_records(self.path, batch_size=16), (50, []))
+
+    def test_corrupted_records_are_reported(self):
+        """Test that a wrong SOS count and a repeated cell are both found."""
+        self.write_games(3, board_size=4)
+        with open(self.path, "r+b") as file:
+            data = bytearray(file.read())
+            first_move = HEADER.size + GAME_HEADER.size
+            data[first_move + 5] += 1  # Game 0: first move claims an extra SOS line
+            count = GAME_HEADER.unpack_from(data, HEADER.size)[0]
+            second_game = HEADER.size + GAME_HEADER.size + count * MOVE.size
+            first = second_game + GAME_HEADER.size
+            data[first + MOVE.size:first + MOVE.size + 4] = data[first:first + 4]  # Game 1: cell played twice
+            file.seek(0)
+            file.write(data)
+
+        checked, problems = validate_records(self.path)
+        self.assertEqual(checked, 3)
+        self.assertIn(0, [index for index, _ in problems])
+        self.assertIn((1, "cell played twice"), problems)
+        records = list(iter_games(self.path))
+        python_problems = sorted(problem for index, record in enumerate(records)
+                                 for problem in _check_game(record, index))
+        self.assertEqual(python_problems, problems)
+        if np is not None:
+            self.assertEqual(sorted(_check_batch(records, 0)), problems)
+
+    def test_simple_play_after_win_is_reported(self):
+        """Test that a Simple game recording moves after its winning SOS is flagged."""
+        with GameRecordWriter(self.path, 3, "Simple") as writer:
+            for row, col, character, delta in ((0, 0, 'S', 0), (0, 1, 'O', 0), (0, 2, 'S', 1), (2, 2, 'S', 0)):
+                writer.record_move(row, col, character, "Blue", delta)
+            writer.end_game()
+        self.assertEqual(validate_records(self.path)[1], [(0, "play continued after the winning SOS")])
+
+    def test_simple_batch_with_off_board_and_empty_games(self):
+        """Test that an off-board game and an empty game do not disturb the checks of the rest of a Simple batch."""
+        games = (
+            ((0, 0, 'S', 0), (1, 1, 'O', 0)),
+            ((0, 0, 'S', 0), (0, 1, 'O', 0), (0, 2, 'S', 1)),
+            ((0, 0, 'S', 0), (0, 1, 'O', 0), (0, 2, 'S', 1), (2, 2, 'S', 0)),
+        )
+        with GameRecordWriter(self.path, 3, "Simple") as writer:
+            for moves in games:
+                for row, col, character, delta in moves:
+                    writer.record_move(row, col, character, "Blue", delta)
+                writer.end_game()
+        with open(self.path, "r+b") as file:
+            file.seek(HEADER.size + GAME_HEADER.size + MOVE.size)
+            file.write(MOVE.pack(40, 0, 0))  # Game 0: second move lands off the 3x3 board
+
+        expected = [(0, "move outside the board"), (2, "play continued after the winning SOS")]
+        self.assertEqual(validate_records(self.path), (3, expected))
+        records = list(iter_games(self.path))
+        records.insert(1, GameRecord(3, "Simple", b""))  # The writer skips empty games, so add one by hand
+        expected = [(0, "move outside the board"), (3, "play continued after the winning SOS")]
+        self.assertEqual(sorted(problem for index, record in enumerate(records)
+                                for problem in _check_game(record, index)), expected)
+        if np is not None:
+            self.assertEqual(sorted(_check_batch(records, 0)), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from game_manager import GameManager
+from bitboard import BitboardGameManager
+
+
+class TestCheckSos(unittest.TestCase):
+
+    def play(self, manager_class, moves):
+        """Plays the moves in a 3x3 General game and returns the manager and last result."""
+        game_manager = manager_class(board_size=3, game_mode="General")
+        game_manager.reset_game(3, "General")
+        result = None
+        for row, col, character in moves:
+            result = game_manager.make_move(row, col, character)
+        return game_manager, result
+
+    def test_two_diagonals_counted(self):
+        """Test that an O completing both diagonals scores two SOS lines."""
+        moves = [(0, 0, 'S'), (0, 2, 'S'), (2, 0, 'S'), (2, 2, 'S'), (1, 1, 'O')]
+        for manager_class in (GameManager, BitboardGameManager):
+            game_manager, result = self.play(manager_class, moves)
+            self.assertEqual(result["result"], "continue")
+            self.assertEqual(game_manager.sos_count["Blue"], 2)
+            self.assertTrue(game_manager.sos_occurred)
+
+    def test_corner_s_completes_row_and_column(self):
+        """Test that an S closing a row and a column at once scores two SOS lines."""
+        moves = [(0, 0, 'S'), (0, 1, 'O'), (1, 2, 'O'), (2, 2, 'S'), (0, 2, 'S')]
+        for manager_class in (GameManager, BitboardGameManager):
+            game_manager, _ = self.play(manager_class, moves)
+            self.assertEqual(game_manager.check_sos(0, 2), 2)
+            self.assertEqual(game_manager.sos_count["Blue"], 2)
+
+    def test_no_sos_for_oso(self):
+        """Test that an O-S-O line does not count as SOS."""
+        moves = [(1, 0, 'O'), (1, 2, 'O'), (1, 1, 'S')]
+        for manager_class in (GameManager, BitboardGameManager):
+            game_manager, result = self.play(manager_class, moves)
+            self.assertEqual(result["result"], "next_turn")
+            self.assertFalse(game_manager.sos_occurred)
+
+    def test_sos_lines_listed(self):
+        """Test that the cells of each completed SOS are reported for drawing."""
+        moves = [(0, 0, 'S'), (0, 2, 'S'), (2, 0, 'S'), (2, 2, 'S'), (1, 1, 'O')]
+        game_manager, _ = self.play(GameManager, moves)
+        lines = game_manager.get_sos_lines(1, 1)
+        self.assertEqual(sorted((start, end) for start, _, end in lines), [((0, 0), (2, 2)), ((0, 2), (2, 0))])
+
+if __name__ == '__main__':
+    unittest.main()
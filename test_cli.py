@@ -0,0 +1,52 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import unittest
+from cli import format_board, main, play
+from game_manager import GameManager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestCli(unittest.TestCase):
+
+    def test_engine_imports_without_gui_or_numpy(self):
+        """Test that importing the engine, simulator and CLI loads neither tkinter nor numpy."""
+        code = ("import sys, game_manager, simulate, cli, sos; "
+                "print(sorted(m for m in ('tkinter', 'numpy', 'multiprocessing.pool') if m in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "[]")
+
+    def test_format_board(self):
+        """Test that the text board shows numbered rows and columns with dots for empty cells."""
+        game_manager = GameManager(board_size=3, game_mode="Simple")
+        game_manager.reset_game(3, "Simple")
+        game_manager.make_move(1, 2, 'S')
+        self.assertEqual(format_board(game_manager), "  1 2 3\n1 . . .\n2 . . S\n3 . . .")
+
+    def test_computer_game_finishes(self):
+        """Test that a game between two computer players runs to a result."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            winner = play(4, "General", "greedy", "random", seed=1)
+        self.assertIn(winner, ("Blue", "Red", "Draw"))
+
+    def test_human_input_is_validated(self):
+        """Test that malformed and occupied moves are rejected until a legal move is entered."""
+        answers = iter(["bad", "9 9 S", "1 1 s", "1 1 O", "2 2 o", "1 2 O", "1 3 S"])
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            winner = play(3, "Simple", "human", "human", input_func=lambda prompt: next(answers))
+        self.assertEqual(winner, "Red")
+        self.assertIn("already taken", output.getvalue())
+        self.assertIn("off the board", output.getvalue())
+
+    def test_simulate_command(self):
+        """Test that the simulate command forwards its options to the simulator."""
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            main(["simulate", "--games", "5", "--sizes", "3", "--modes", "Simple", "--workers", "1"])
+        self.assertIn("Simple", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
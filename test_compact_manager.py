@@ -0,0 +1,80 @@
+import random
+import unittest
+from compact_manager import CompactGameManager, SessionPool, session_size
+from game_manager import GameManager
+
+
+class TestCompactGameManager(unittest.TestCase):
+
+    def test_matches_game_manager(self):
+        """Test that random games give the same results move by move as GameManager."""
+        rng = random.Random(5)
+        for game_mode in ("Simple", "General"):
+            for board_size in (3, 4, 6):
+                for _ in range(20):
+                    reference = GameManager(board_size, game_mode)
+                    reference.reset_game(board_size, game_mode)
+                    compact = CompactGameManager(board_size, game_mode)
+                    compact.reset_game(board_size, game_mode)
+                    while reference.is_game_active and not reference.is_board_full():
+                        row, col = rng.choice(reference.get_empty_cells())
+                        character = rng.choice("SO")
+                        self.assertEqual(compact.count_potential_sos(row, col, character),
+                                         reference.count_potential_sos(row, col, character))
+                        result = reference.make_move(row, col, character)
+                        self.assertEqual(compact.make_move(row, col, character), result)
+                        if result["result"] == "next_turn":
+                            reference.switch_turn()
+                            compact.switch_turn()
+                    self.assertEqual(compact.sos_count, reference.sos_count)
+                    self.assertEqual(compact.end_game(), reference.end_game())
+                    self.assertEqual(sorted(compact.get_empty_cells()), sorted(reference.get_empty_cells()))
+
+    def test_has_no_instance_dict(self):
+        """Test that the compact state uses slots and is much smaller than a GameManager."""
+        compact = CompactGameManager(10, "General")
+        self.assertFalse(hasattr(compact, "__dict__"))
+        reference = GameManager(10, "General")
+        self.assertLess(session_size(compact) * 10, session_size(reference))
+
+    def test_copy_is_independent(self):
+        """Test that a copy does not share the board with the original."""
+        compact = CompactGameManager(3, "Simple")
+        compact.reset_game(3, "Simple")
+        compact.make_move(0, 0, 'S')
+        clone = compact.copy()
+        clone.make_move(1, 1, 'O')
+        self.assertEqual(compact.get_board_value(1, 1), ' ')
+        self.assertEqual(clone.get_board_value(0, 0), 'S')
+
+
+class TestSessionPool(unittest.TestCase):
+
+    def test_released_games_are_reused(self):
+        """Test that a released game is reset and handed out again for the same board size."""
+        pool = SessionPool(max_idle=1)
+        game = pool.acquire(4, "General")
+        game.make_move(0, 0, 'S')
+        board = game.board
+        pool.release(game)
+        self.assertEqual(len(pool), 1)
+        reused = pool.acquire(4, "Simple")
+        self.assertIs(reused, game)
+        self.assertIs(reused.board, board)
+        self.assertEqual((reused.game_mode, reused.get_board_value(0, 0), reused.is_game_active),
+                         ("Simple", ' ', True))
+        pool.release(reused)
+        pool.release(CompactGameManager(4, "Simple"))
+        self.assertEqual(len(pool), 1)
+
+    def test_other_sizes_get_new_games(self):
+        """Test that acquiring a different board size does not take a pooled game."""
+        pool = SessionPool()
+        game = pool.acquire(3, "Simple")
+        pool.release(game)
+        self.assertIsNot(pool.acquire(5, "Simple"), game)
+        self.assertEqual(len(pool), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
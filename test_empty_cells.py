@@ -0,0 +1,48 @@
+import unittest
+from game_manager import GameManager
+
+
+class TestEmptyCellTracking(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a new 3x3 Simple game for each test."""
+        self.game_manager = GameManager(board_size=3, game_mode="Simple")
+        self.game_manager.reset_game(3, "Simple")
+
+    def test_all_cells_empty_after_reset(self):
+        """Test that every cell is listed as empty after a reset."""
+        self.assertEqual(self.game_manager.empty_count, 9)
+        self.assertEqual(len(self.game_manager.get_empty_cells()), 9)
+
+    def test_move_removes_empty_cell(self):
+        """Test that a valid move removes its cell from the empty set."""
+        self.game_manager.make_move(1, 1, 'S')
+        self.assertEqual(self.game_manager.empty_count, 8)
+        self.assertNotIn((1, 1), self.game_manager.get_empty_cells())
+
+    def test_invalid_move_keeps_count(self):
+        """Test that a rejected move does not change the empty count."""
+        self.game_manager.make_move(1, 1, 'S')
+        self.game_manager.make_move(1, 1, 'O')
+        self.assertEqual(self.game_manager.empty_count, 8)
+
+    def test_reset_restores_empty_cells(self):
+        """Test that resetting to a new size rebuilds the tracker."""
+        self.game_manager.make_move(0, 0, 'S')
+        self.game_manager.reset_game(4, "General")
+        self.assertEqual(self.game_manager.empty_count, 16)
+        self.assertFalse(self.game_manager.is_board_full())
+
+    def test_full_board_draw(self):
+        """Test that filling the board without SOS reports a draw."""
+        result = None
+        for row in range(3):
+            for col in range(3):
+                result = self.game_manager.make_move(row, col, 'S')
+                self.game_manager.switch_turn()
+        self.assertTrue(self.game_manager.is_board_full())
+        self.assertTrue(self.game_manager.is_board_filled())
+        self.assertEqual(result["result"], "draw")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import random
+import tempfile
+import unittest
+from game_manager import GameManager
+from game_record import GameRecordWriter, MappedGameRecords, iter_games, MOVE
+from pattern_engine import GAME_MODES, register_game_mode
+
+
+class TestGameRecord(unittest.TestCase):
+
+    def setUp(self):
+        """Create a temporary record file path for each test."""
+        handle, self.path = tempfile.mkstemp(suffix=".sosr")
+        os.close(handle)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def play_random_games(self, games, board_size=4, game_mode="General", seed=1):
+        """Plays random games with a recorder attached and returns their final scores."""
+        rng = random.Random(seed)
+        scores = []
+        with GameRecordWriter(self.path, board_size, game_mode) as writer:
+            game_manager = GameManager(board_size, game_mode)
+            game_manager.recorder = writer
+            for _ in range(games):
+                game_manager.reset_game(board_size, game_mode)
+                while game_manager.is_game_active and not game_manager.is_board_full():
+                    row, col = rng.choice(game_manager.get_empty_cells())
+                    result = game_manager.make_move(row, col, rng.choice("SO"))
+                    if result["result"] == "next_turn":
+                        game_manager.switch_turn()
+                game_manager.end_game()
+                scores.append(dict(game_manager.sos_count))
+        return scores
+
+    def test_streaming_reader_returns_every_game(self):
+        """Test that every finished game is read back with its scores."""
+        scores = self.play_random_games(25)
+        games = list(iter_games(self.path))
+        self.assertEqual(len(games), 25)
+        self.assertEqual([game.scores() for game in games], scores)
+        self.assertTrue(all(len(game) == 16 for game in games))
+
+    def test_records_are_compact(self):
+        """Test that each move takes a fixed handful of bytes."""
+        self.play_random_games(1)
+        self.assertLessEqual(MOVE.size, 8)
+        self.assertLess(os.path.getsize(self.path), 16 * MOVE.size + 32)
+
+    def test_undo_after_the_game_is_written(self):
+        """Test that undoing and redoing a recorded win leaves just that game in the file."""
+        moves = [(0, 0, 'S'), (1, 1, 'S'), (0, 1, 'O'), (2, 2, 'O'), (0, 2, 'S')]
+        with GameRecordWriter(self.path, 3, "Simple") as writer:
+            game_manager = GameManager(3, "Simple")
+            game_manager.recorder = writer
+            game_manager.reset_game(3, "Simple")
+            for row, col, character in moves:
+                if game_manager.make_move(row, col, character)["result"] == "next_turn":
+                    game_manager.switch_turn()
+            game_manager.unmake_move()
+            self.assertEqual(game_manager.redo_move(), {"result": "win", "winner": "Blue"})
+            game_manager.unmake_move()
+            game_manager.unmake_move()
+            game_manager.redo_move()
+            game_manager.redo_move()
+        games = list(iter_games(self.path))
+        self.assertEqual(len(games), 1)
+        self.assertEqual([move[:4] for move in games[0].moves()],
+                         [(0, 0, 'S', "Blue"), (1, 1, 'S', "Red"), (0, 1, 'O', "Blue"), (2, 2, 'O', "Red"),
+                          (0, 2, 'S', "Blue")])
+
+    def test_general_game_ending_on_a_scoring_move(self):
+        """Test that a General game whose last move scores is written when the board fills."""
+        moves = [(0, 0, 'S'), (0, 1, 'S'), (0, 2, 'S'), (1, 0, 'O'), (1, 2, 'O'), (2, 0, 'S'), (2, 1, 'O'),
+                 (2, 2, 'S'), (1, 1, 'O')]
+        with GameRecordWriter(self.path, 3, "General") as writer:
+            game_manager = GameManager(3, "General")
+            game_manager.recorder = writer
+            game_manager.reset_game(3, "General")
+            for row, col, character in moves:
+                result = game_manager.make_move(row, col, character)
+                if result["result"] == "next_turn":
+                    game_manager.switch_turn()
+            self.assertEqual(result, {"result": "continue"})
+            self.assertTrue(game_manager.is_board_full())
+        games = list(iter_games(self.path))
+        self.assertEqual(len(games), 1)
+        self.assertEqual(len(games[0]), 9)
+        self.assertEqual(games[0].scores(), game_manager.sos_count)
+
+    def test_mapped_reader_random_access(self):
+        """Test that the memory-mapped reader returns the same games in any order."""
+        self.play_random_games(10)
+        streamed = [list(game.moves()) for game in iter_games(self.path)]
+        with MappedGameRecords(self.path) as records:
+            self.assertEqual(len(records), 10)
+            self.assertEqual(list(records[7].moves()), streamed[7])
+            self.assertEqual(list(records[0].moves()), streamed[0])
+            kept = records[3]
+        self.assertEqual(list(kept.moves()), streamed[3])  # Records outlive the closed reader
+
+    def test_move_fields_round_trip(self):
+        """Test that cell, letter, player and SOS delta are decoded as written."""
+        with GameRecordWriter(self.path, 3, "General") as writer:
+            writer.record_move(2, 1, 'O', "Red", 2)
+            writer.end_game()
+        game = next(iter_games(self.path))
+        self.assertEqual(list(game.moves()), [(2, 1, 'O', "Red", 2)])
+
+    def test_appending_checks_header(self):
+        """Test that a file cannot be reopened for a different board size."""
+        GameRecordWriter(self.path, 3, "Simple").close()
+        with self.assertRaises(ValueError):
+            GameRecordWriter(self.path, 4, "Simple")
+
+    def test_pattern_modes_are_recorded(self):
+        """Test that pattern mode games are recorded, read back and validated against their own word."""
+        from board_analyzer import validate_records
+        scores = self.play_random_games(5, 6, "General SOSOS")
+        self.assertEqual([game.scores() for game in iter_games(self.path)], scores)
+        self.assertEqual({game.game_mode for game in iter_games(self.path)}, {"General SOSOS"})
+        self.assertEqual(validate_records(self.path), (5, []))
+
+    def test_registered_mode_is_stored_by_name(self):
+        """Test that a record file of a registered mode reopens by name and is refused where it is not registered."""
+        register_game_mode("General SOO", "General", "SOO")
+        self.addCleanup(GAME_MODES.pop, "General SOO", None)
+        scores = self.play_random_games(2, 4, "General SOO")
+        scores += self.play_random_games(1, 4, "General SOO", seed=2)  # Appends after checking the header
+        self.assertEqual([game.scores() for game in iter_games(self.path)], scores)
+        with MappedGameRecords(self.path) as records:
+            self.assertEqual((records.game_mode, len(records)), ("General SOO", 3))
+            self.assertEqual(records[2].scores(), scores[2])
+        del GAME_MODES["General SOO"]
+        with self.assertRaises(ValueError):
+            next(iter_games(self.path))
+        with self.assertRaises(ValueError):
+            GameRecordWriter(self.path, 4, "General")
+
+    def test_unknown_mode_creates_no_file(self):
+        """Test that an unknown game mode is rejected before the record file is created."""
+        with self.assertRaises(ValueError):
+            GameRecordWriter(self.path, 4, "Misere")
+        self.assertFalse(os.path.exists(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+from game_server import GameClient, GameServer
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = GameServer(port=0, idle_timeout=30)
+        self.host, self.port = await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def client(self):
+        client = await GameClient().connect(self.host, self.port)
+        self.addAsyncCleanup(client.close)
+        return client
+
+    async def start_game(self, game_mode="Simple", board_size=3):
+        blue = await self.client()
+        await blue.send("join", mode=game_mode, size=board_size)
+        self.assertEqual((await blue.receive())["type"], "waiting")
+        red = await self.client()
+        self.assertEqual((await red.join(game_mode, board_size))["player"], "Red")
+        self.assertEqual((await blue.receive())["player"], "Blue")
+        return blue, red
+
+    async def test_simple_game_is_played_to_a_win(self):
+        """Test that matched clients alternate moves and both see the winning SOS."""
+        blue, red = await self.start_game()
+        moves = [(blue, 0, 0, 'S'), (red, 1, 1, 'S'), (blue, 0, 2, 'S')]
+        for client, row, col, letter in moves:
+            update = await client.move(row, col, letter)
+            self.assertEqual(update["result"], "next_turn")
+            self.assertEqual((await (red if client is blue else blue).receive()), update)
+
+        update = await red.move(0, 1, 'O')
+        self.assertEqual(update["result"], "win")
+        self.assertEqual((await blue.receive())["type"], "move")
+        for client in (blue, red):
+            game_over = await client.receive()
+            self.assertEqual((game_over["type"], game_over["winner"]), ("game_over", "Red"))
+        self.assertEqual(self.server.sessions, {})
+
+    async def test_general_scoring_move_keeps_the_turn(self):
+        """Test that a General mode SOS gives the same player another move."""
+        blue, red = await self.start_game("General", 3)
+        await blue.move(0, 0, 'S')
+        await red.receive()
+        await red.move(0, 2, 'S')
+        await blue.receive()
+        update = await blue.move(0, 1, 'O')
+        self.assertEqual((update["result"], update["next"]), ("continue", "Blue"))
+        self.assertEqual(update["scores"], {"Blue": 1, "Red": 0})
+
+    async def test_pattern_mode_game(self):
+        """Test that clients can join a pattern mode and score its word."""
+        blue, red = await self.start_game("General SOSOS", 5)
+        for client, col, letter in ((blue, 0, 'S'), (red, 1, 'O'), (blue, 2, 'S'), (red, 3, 'O')):
+            self.assertEqual((await client.move(0, col, letter))["result"], "next_turn")
+            await (red if client is blue else blue).receive()
+        update = await blue.move(0, 4, 'S')
+        self.assertEqual((update["result"], update["scores"]), ("continue", {"Blue": 1, "Red": 0}))
+
+    async def test_invalid_moves_are_rejected(self):
+        """Test that out-of-turn, occupied and malformed moves produce errors."""
+        blue, red = await self.start_game()
+        self.assertEqual((await red.move(0, 0, 'S'))["message"], "Not your turn")
+        self.assertEqual((await blue.move(5, 0, 'S'))["message"], "Invalid move")
+        self.assertEqual((await blue.move(0, 0, 'X'))["message"], "Invalid move")
+        await blue.move(0, 0, 'S')
+        await red.receive()
+        self.assertEqual((await red.move(0, 0, 'O'))["message"], "Invalid move")
+
+    async def test_join_validation_and_unknown_messages(self):
+        """Test that bad join requests and unknown message types are reported."""
+        client = await self.client()
+        self.assertEqual((await client.join("Blitz", 3))["type"], "error")
+        self.assertEqual((await client.join("Simple", 2))["type"], "error")
+        await client.send("dance")
+        self.assertEqual((await client.receive())["type"], "error")
+        client.writer.write(b"not json\n")
+        self.assertEqual((await client.receive())["message"], "Malformed JSON")
+
+    async def test_disconnect_forfeits_the_game(self):
+        """Test that a player leaving mid-game hands the win to the opponent."""
+        blue, red = await self.start_game()
+        await red.close()
+        game_over = await blue.receive()
+        self.assertEqual((game_over["winner"], game_over["reason"]), ("Blue", "forfeit"))
+
+    async def test_many_concurrent_sessions(self):
+        """Test that many games run side by side in one server."""
+        pairs = [await self.start_game("General", 4) for _ in range(20)]
+        self.assertEqual(len(self.server.sessions), 20)
+        updates = await asyncio.gather(*(blue.move(1, 1, 'S') for blue, _ in pairs))
+        self.assertTrue(all(update["result"] == "next_turn" for update in updates))
+
+
+class TestIdleEviction(unittest.IsolatedAsyncioTestCase):
+
+    async def test_idle_session_is_evicted(self):
+        """Test that a game with no moves for the idle timeout is ended and its clients disconnected."""
+        server = GameServer(port=0, idle_timeout=0.05)
+        host, port = await server.start()
+        try:
+            blue = await GameClient().connect(host, port)
+            red = await GameClient().connect(host, port)
+            await blue.send("join", mode="Simple", size=3)
+            await red.join()
+            messages = [await blue.receive() for _ in range(3)]
+            self.assertEqual(messages[-1]["reason"], "idle")
+            self.assertIsNone(await blue.receive())
+            self.assertEqual(server.sessions, {})
+            await blue.close()
+            await red.close()
+        finally:
+            await server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
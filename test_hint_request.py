@@ -0,0 +1,87 @@
+import time
+import unittest
+from ai_player import AlphaBetaPlayer
+from analysis_service import AnalysisService
+from game_manager import GameManager
+from sos_game_gui import SOSGameGUI
+
+
+class FakeRoot:
+    """Stands in for Tk's root window by collecting callbacks scheduled with after()."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay, callback):
+        self.pending.append(callback)
+
+    def run_until_idle(self, timeout=10.0):
+        deadline = time.time() + timeout
+        while self.pending and time.time() < deadline:
+            time.sleep(0.005)
+            self.pending.pop(0)()
+
+
+class FakeVar:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class FakeControls:
+    def __init__(self, is_computer):
+        self.is_computer = FakeVar(is_computer)
+        self.choice = FakeVar("S")
+
+
+class FakeLabel:
+    def __init__(self):
+        self.text = ""
+
+    def config(self, text):
+        self.text = text
+
+
+class TestHintRequest(unittest.TestCase):
+
+    def setUp(self):
+        """Set up the game state of an SOSGameGUI with Red played by the computer, without a Tk window."""
+        self.root = FakeRoot()
+        self.app = SOSGameGUI.__new__(SOSGameGUI)
+        self.app.board_size = 3
+        self.app.game_manager = GameManager(3, "General")
+        self.app.game_manager.reset_game(3, "General")
+        self.app.analysis = AnalysisService(self.root)
+        self.app.blue_controls = FakeControls(False)
+        self.app.red_controls = FakeControls(True)
+        self.app.computer_player = AlphaBetaPlayer(time_limit=None, max_depth=1)
+        self.app.hint_player = AlphaBetaPlayer(time_limit=None, max_depth=1)
+        self.app.hint_label = FakeLabel()
+        self.app.playback = None
+        self.app.computer_moving = False
+        self.clicks = []
+        self.app.on_board_click = lambda row, col: self.clicks.append((row, col))
+
+    def test_hint_on_computer_turn_keeps_computer_move(self):
+        """Test that pressing Hint while the computer is thinking does not cancel its move."""
+        self.app.game_manager.switch_turn()
+        self.app.schedule_computer_move()
+        self.app.request_hint()
+        self.root.run_until_idle()
+        self.assertEqual(len(self.clicks), 1)
+        self.assertEqual(self.app.hint_label.text, "")
+
+    def test_hint_on_human_turn(self):
+        """Test that a hint is shown when the human player is to move."""
+        self.app.request_hint()
+        self.root.run_until_idle()
+        self.assertTrue(self.app.hint_label.text.startswith("Hint:"))
+        self.assertEqual(self.clicks, [])
+
+if __name__ == '__main__':
+    unittest.main()
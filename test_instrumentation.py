@@ -0,0 +1,81 @@
+import gc
+import unittest
+import weakref
+from game_manager import GameManager
+from instrumentation import Instrumentation, LatencyHistogram
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        """Set up an instrumented 3x3 General game."""
+        self.game_manager = GameManager(board_size=3, game_mode="General")
+        self.game_manager.reset_game(3, "General")
+        self.instrumentation = Instrumentation()
+        self.instrumentation.instrument_game_manager(self.game_manager)
+
+    def test_phases_and_counters_recorded(self):
+        """Test that each make_move phase is timed and moves and SOS events are counted."""
+        self.game_manager.make_move(0, 0, 'S')
+        self.game_manager.make_move(0, 1, 'O')
+        self.game_manager.make_move(0, 2, 'S')
+        self.game_manager.make_move(0, 2, 'S')
+
+        stats = self.instrumentation.stats()
+        self.assertEqual(stats["counters"], {"moves": 3, "invalid_moves": 1, "sos_events": 1, "sos_lines": 1})
+        phases = stats["phases"]
+        self.assertEqual(phases["make_move"]["count"], 4)
+        self.assertEqual(phases["validation"]["count"], 4)
+        self.assertEqual(phases["placement"]["count"], 3)
+        self.assertEqual(phases["sos_detection"]["count"], 3)
+        self.assertIn("make_move", self.instrumentation.report())
+
+    def test_uninstrument_restores_methods(self):
+        """Test that removing instrumentation leaves no wrappers on the instance."""
+        self.instrumentation.uninstrument()
+        self.assertNotIn("make_move", vars(self.game_manager))
+        self.game_manager.make_move(1, 1, 'S')
+        self.assertEqual(self.instrumentation.stats()["phases"]["make_move"]["count"], 0)
+
+    def test_replaced_boards_are_released(self):
+        """Test that instrumenting each new game's board lets the previous board be freed."""
+
+        class Board:
+            def update_button(self, row, col, character):
+                pass
+
+            def draw_sos_line(self, *cells):
+                pass
+
+        board = Board()
+        self.instrumentation._instrument_board(board)
+        wrapped = len(self.instrumentation.wrapped)
+        released = weakref.ref(board)
+        for _ in range(3):
+            board = Board()
+            self.instrumentation._instrument_board(board)
+        self.instrumentation._instrument_board(board)
+        gc.collect()
+        self.assertIsNone(released())
+        self.assertEqual(len(self.instrumentation.wrapped), wrapped)
+        board.update_button(0, 0, 'S')
+        self.assertEqual(self.instrumentation.stats()["phases"]["widget_update"]["count"], 1)
+
+    def test_profile_capture(self):
+        """Test that a cProfile capture records make_move calls."""
+        self.instrumentation.start_profile()
+        self.game_manager.make_move(2, 2, 'O')
+        stats = self.instrumentation.stop_profile()
+        self.assertTrue(any(name == "make_move" for _, _, name in stats.stats))
+
+    def test_histogram_percentiles(self):
+        """Test that histogram percentiles fall in the right power-of-two bucket."""
+        histogram = LatencyHistogram()
+        for elapsed_us in (1, 3, 3, 3, 100):
+            histogram.add(elapsed_us * 1000)
+        self.assertEqual(histogram.percentile(0.5), 4)
+        self.assertEqual(histogram.percentile(1.0), 128)
+        self.assertEqual(histogram.summary()["max_us"], 100.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import unittest
+from game_manager import GameManager
+from mcts_player import MCTSPlayer, PlayoutState, merge_root_stats, random_playout, S, O, BLUE, RED
+
+
+class TestMCTSPlayer(unittest.TestCase):
+
+    def new_game(self, board_size, game_mode, moves=()):
+        """Creates a game and plays the given (row, col, character) moves, switching turns as needed."""
+        game_manager = GameManager(board_size, game_mode)
+        game_manager.reset_game(board_size, game_mode)
+        for row, col, character in moves:
+            if game_manager.make_move(row, col, character)["result"] == "next_turn":
+                game_manager.switch_turn()
+        return game_manager
+
+    def test_finds_winning_sos(self):
+        """Test that MCTS plays the SOS that wins a Simple game."""
+        game_manager = self.new_game(5, "Simple", [(2, 0, 'S'), (2, 1, 'O')])
+        player = MCTSPlayer(time_limit=0.5, seed=1)
+        self.assertEqual(player.choose_move(game_manager), (2, 2, 'S'))
+        self.assertGreater(player.last_playouts, 0)
+        self.assertGreater(player.playouts_per_second, 0)
+
+    def test_root_parallel_search(self):
+        """Test that a two-worker search returns a legal move from the summed worker statistics and closes its pool."""
+        game_manager = self.new_game(4, "Simple", [(1, 0, 'S'), (1, 1, 'O')])
+        player = MCTSPlayer(time_limit=0.3, workers=2, seed=3)
+        self.addCleanup(player.close)
+        row, col, character = player.choose_move(game_manager)
+        self.assertTrue(game_manager.is_valid_move(row, col))
+        self.assertEqual((row, col, character), (1, 2, 'S'))
+        self.assertEqual(sum(visits for visits, _ in player.last_stats.values()), player.last_playouts)
+
+        pool = player.pool
+        player.close()
+        self.assertIsNone(player.pool)
+        with self.assertRaises(ValueError):
+            pool.apply(len, ((),))  # A closed pool refuses new work
+
+    def test_merge_root_stats(self):
+        """Test that root statistics from several workers are summed move by move."""
+        stats, playouts = merge_root_stats([({(0, S): (3, 1.0), (1, O): (2, 2.0)}, 5),
+                                            ({(0, S): (4, 0.5)}, 4)])
+        self.assertEqual(stats, {(0, S): (7, 1.5), (1, O): (2, 2.0)})
+        self.assertEqual(playouts, 9)
+
+    def test_playout_state_extra_turn(self):
+        """Test that a scoring move in General mode keeps the turn and adds to the score."""
+        state = PlayoutState(3, "General")
+        state.play(0, S)
+        state.play(1, O)
+        self.assertEqual(state.player, BLUE)
+        state.play(2, S)
+        self.assertEqual(state.player, BLUE)
+        self.assertEqual(state.scores, [1, 0])
+
+    def test_random_playout_finishes_game(self):
+        """Test that random playouts fill a General board and pick a winner."""
+        state = PlayoutState(4, "General")
+        rng = random.Random(2)
+        while not state.over:
+            random_playout(state, rng)
+        self.assertFalse(state.empties)
+        self.assertIn(state.winner, (BLUE, RED, 2))
+
+    def test_state_from_game_manager(self):
+        """Test that the playout state mirrors the GameManager position and player."""
+        game_manager = self.new_game(3, "General", [(0, 0, 'S')])
+        state = PlayoutState.from_game_manager(game_manager)
+        self.assertEqual(state.cells[0], S)
+        self.assertEqual(len(state.empties), 8)
+        self.assertEqual(state.player, RED)
+
+if __name__ == '__main__':
+    unittest.main()
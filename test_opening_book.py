@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from ai_player import AlphaBetaPlayer
+from board_codec import board_codes, pack_cells, unpack_cells
+from game_manager import GameManager
+from mcts_player import MCTSPlayer
+from opening_book import (OpeningBook, OpeningLibrary, book_path, build_book, canonical_key, opening_positions,
+                          symmetries)
+from pattern_engine import GAME_MODES, register_game_mode
+
+
+def game_with(moves, board_size=3, game_mode="Simple"):
+    game_manager = GameManager(board_size, game_mode)
+    game_manager.reset_game(board_size, game_mode)
+    for row, col, character in moves:
+        game_manager.make_move(row, col, character)
+    return game_manager
+
+
+class TestBoardCodec(unittest.TestCase):
+
+    def test_pack_round_trip(self):
+        """Test that packed cells unpack to the same codes at four cells per byte."""
+        codes = [0, 1, 2, 1, 2, 0, 0, 1, 2]
+        packed = pack_cells(codes)
+        self.assertEqual(len(packed), 3)
+        self.assertEqual(unpack_cells(packed, len(codes)), codes)
+        self.assertEqual(board_codes(game_with([(0, 1, 'S'), (2, 2, 'O')])), [0, 1, 0, 0, 0, 0, 0, 0, 2])
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_symmetric_positions_share_a_key(self):
+        """Test that all eight rotations and reflections of a position canonicalize to one key."""
+        filled = [(0, 1), (1, 2), (5, 1)]  # (cell, code) on a 4x4 board
+        keys = set()
+        for forward, _ in symmetries(4):
+            keys.add(canonical_key([(forward[cell], code) for cell, code in filled], 4)[0])
+        self.assertEqual(len(keys), 1)
+        self.assertNotEqual(canonical_key([(0, 2), (1, 2), (5, 1)], 4)[0], keys.pop())
+
+    def test_opening_positions_are_deduplicated(self):
+        """Test that the first move on 3x3 reduces to corner, edge and centre for each letter."""
+        self.assertEqual(len(opening_positions(3, "General", 2)), 1 + 6)
+
+    def test_lookup_maps_moves_back_through_the_symmetry(self):
+        """Test that book moves are legal on rotated positions and have the same value."""
+        path = book_path(self.directory.name, 3, "Simple")
+        count = build_book(path, 3, "Simple", 3, time_limit=None, max_depth=3)
+        with OpeningBook(path) as book:
+            self.assertEqual(len(book), count)
+            self.assertIsNone(book.lookup(game_with([(0, 0, 'S'), (1, 1, 'O'), (2, 2, 'O')])))
+            self.assertIsNone(book.lookup(GameManager(4, "Simple")))
+
+            game_manager = game_with([(0, 0, 'S'), (0, 1, 'O')])
+            rotated = game_with([(0, 2, 'S'), (1, 2, 'O')])
+            move, value, depth = book.lookup(game_manager)
+            rotated_move, rotated_value, _ = book.lookup(rotated)
+            self.assertEqual(rotated_value, value)
+            self.assertTrue(game_manager.is_valid_move(*move[:2]))
+            self.assertTrue(rotated.is_valid_move(*rotated_move[:2]))
+            # Completing the S-O-S is the only winning reply
+            self.assertEqual(move, (0, 2, 'S'))
+            self.assertEqual(rotated_move, (2, 2, 'S'))
+
+    def test_parallel_build_matches_serial_build(self):
+        """Test that building with worker processes writes the same file."""
+        serial = os.path.join(self.directory.name, "serial.book")
+        parallel = os.path.join(self.directory.name, "parallel.book")
+        build_book(serial, 3, "General", 2, time_limit=None, max_depth=2)
+        build_book(parallel, 3, "General", 2, time_limit=None, max_depth=2, workers=2)
+        with open(serial, "rb") as first, open(parallel, "rb") as second:
+            self.assertEqual(first.read(), second.read())
+
+    def test_players_answer_from_the_book(self):
+        """Test that the computer players take book moves without searching."""
+        build_book(book_path(self.directory.name, 3, "General"), 3, "General", 2, time_limit=None, max_depth=2)
+        library = OpeningLibrary(self.directory.name)
+        self.addCleanup(library.close)
+        game_manager = game_with([(1, 1, 'O')], game_mode="General")
+        move = library.lookup(game_manager)[0]
+
+        player = AlphaBetaPlayer(time_limit=None, book=library)
+        self.assertEqual(player.choose_move(game_manager), move)
+        self.assertEqual(player.nodes, 0)
+        self.assertEqual(MCTSPlayer(time_limit=0.05, book=library).choose_move(game_manager), move)
+        self.assertIsNone(library.lookup(game_with([(1, 1, 'O')], board_size=5, game_mode="General")))
+
+    def test_registered_mode_books(self):
+        """Test that a book of a mode added with register_game_mode is read back by the mode's name."""
+        register_game_mode("General SOO", "General", "SOO")
+        self.addCleanup(GAME_MODES.pop, "General SOO", None)
+        path = book_path(self.directory.name, 3, "General SOO")
+        count = build_book(path, 3, "General SOO", 2, time_limit=None, max_depth=1)
+        with OpeningBook(path) as book:
+            self.assertEqual((book.game_mode, len(book)), ("General SOO", count))
+            self.assertIsNotNone(book.lookup(game_with([(1, 1, 'O')], game_mode="General SOO")))
+
+    def test_pattern_mode_books(self):
+        """Test that books are built for registered pattern modes and read back with their mode."""
+        path = book_path(self.directory.name, 5, "Simple SOSOS")
+        self.assertEqual(os.path.basename(path), "sos_simple_sosos_5.book")
+        count = build_book(path, 5, "Simple SOSOS", 2, time_limit=None, max_depth=1)
+        with OpeningBook(path) as book:
+            self.assertEqual((book.game_mode, len(book)), ("Simple SOSOS", count))
+            self.assertIsNone(book.lookup(game_with([(2, 2, 'O')], board_size=5, game_mode="Simple")))
+            row, col, character = book.lookup(game_with([], board_size=5, game_mode="Simple SOSOS"))[0]
+            self.assertIn(character, "SO")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+import random
+import unittest
+from ai_player import AlphaBetaPlayer
+from bitboard import BitboardGameManager
+from board_analyzer import load_position
+from compact_manager import CompactGameManager
+from game_manager import GameManager
+from mcts_player import PlayoutState
+from pattern_engine import GAME_MODES, compile_pattern, game_rules, line_windows, register_game_mode
+from simulate import cautious_policy, greedy_policy, play_game
+from sos_lines import line_triples
+from sparse_board import SparseGameManager
+
+
+def brute_force_count(game_manager, word):
+    """Counts the straight windows on the board spelling the word either way, reading every window."""
+    size = game_manager.board_size
+    count = 0
+    for window in line_windows(size, len(word)):
+        letters = "".join(game_manager.get_board_value(*divmod(cell, size)) for cell in window)
+        count += letters == word
+        if word != word[::-1]:
+            count += letters == word[::-1]
+    return count
+
+
+class TestPatternEngine(unittest.TestCase):
+
+    def new_game(self, game_mode, board_size=7, game_class=GameManager):
+        game_manager = game_class(board_size, game_mode)
+        game_manager.reset_game(board_size, game_mode)
+        return game_manager
+
+    def test_three_cell_windows_are_the_sos_triples(self):
+        """Test that length-3 windows are exactly the lines used by the built-in SOS checker."""
+        for board_size in (3, 4, 7):
+            self.assertEqual(line_windows(board_size, 3), line_triples(board_size))
+
+    def test_compiled_sos_matches_built_in_checker(self):
+        """Test that SOS compiled as a pattern counts the same lines as count_potential_sos."""
+        rng = random.Random(3)
+        pattern = compile_pattern("SOS", 6)
+        for _ in range(20):
+            game_manager = self.new_game("General", 6)
+            for row, col in rng.sample(game_manager.get_empty_cells(), rng.randint(5, 30)):
+                game_manager.make_move(row, col, rng.choice("SO"))
+            for row, col in game_manager.get_empty_cells():
+                for character in "SO":
+                    self.assertEqual(pattern.count(game_manager.get_board_value, row, col, character),
+                                     game_manager.count_potential_sos(row, col, character))
+
+    def test_general_sosos_scores_only_full_words(self):
+        """Test that General SOSOS scores five-letter lines and ignores plain SOS."""
+        game_manager = self.new_game("General SOSOS")
+        self.assertEqual((game_manager.scoring_mode, game_manager.pattern.word), ("General", "SOSOS"))
+        for col, character in enumerate("SOS"):
+            self.assertEqual(game_manager.make_move(0, col, character), {"result": "next_turn"})
+            game_manager.switch_turn()
+        game_manager.make_move(0, 3, 'O')
+        game_manager.switch_turn()
+        self.assertEqual(game_manager.make_move(0, 4, 'S'), {"result": "continue"})
+        self.assertEqual(game_manager.sos_count, {"Blue": 1, "Red": 0})
+        self.assertEqual(game_manager.get_sos_lines(0, 4), [((0, 0), (0, 1), (0, 2), (0, 3), (0, 4))])
+
+        # The same cell can finish a vertical and a diagonal word at once
+        for row, col, character in ((1, 4, 'O'), (2, 4, 'S'), (3, 4, 'O'), (1, 3, 'O'), (2, 2, 'S'), (3, 1, 'O')):
+            game_manager.make_move(row, col, character)
+        game_manager.make_move(4, 4, 'S')
+        game_manager.make_move(6, 6, 'S')
+        self.assertEqual(game_manager.make_move(4, 0, 'S'), {"result": "continue"})
+        self.assertEqual(len(game_manager.get_sos_lines(4, 0)), 1)
+        self.assertEqual(game_manager.check_sos(4, 4), 1)
+        self.assertEqual(game_manager.unmake_move(), True)
+        self.assertEqual(game_manager.count_potential_sos(4, 0, 'S'), 1)
+
+    def test_simple_sosos_win(self):
+        """Test that Simple SOSOS is won by the first five-letter line."""
+        game_manager = self.new_game("Simple SOSOS", 5)
+        for row, character in enumerate("SOSO"):
+            game_manager.make_move(row, row, character)
+            game_manager.switch_turn()
+        self.assertEqual(game_manager.make_move(4, 4, 'S'), {"result": "win", "winner": "Blue"})
+
+    def test_asymmetric_words_match_both_ways(self):
+        """Test that a non-palindrome word is found reading either way along a line."""
+        pattern = compile_pattern("SOO", 4)
+        board = {(0, 0): 'O', (0, 1): 'O', (1, 1): 'O', (2, 2): 'O'}
+
+        def get(row, col):
+            return board.get((row, col), ' ')
+
+        self.assertEqual(pattern.count(get, 0, 2, 'S'), 1)  # "OOS" read right to left
+        self.assertEqual(pattern.count(get, 3, 3, 'S'), 1)  # Diagonal
+        self.assertEqual(pattern.count(get, 0, 2, 'O'), 0)
+        self.assertEqual(pattern.threats(get, 3, 3, 'O'), (0, 0))
+        self.assertEqual(pattern.threats(get, 1, 0, 'S'), (0, 1))  # "SO" waits for an O in row 1
+        self.assertEqual(pattern.threats(get, 0, 2, 'O'), (0, 2))  # "OO" then an S, in row 0 and up the anti-diagonal
+
+    def test_custom_alphabet(self):
+        """Test that the engine compiles words over any letters."""
+        pattern = compile_pattern("CAT", 3)
+        self.assertEqual(pattern.alphabet, "ACT")
+        board = {(1, 0): 'T', (1, 1): 'A'}
+        self.assertEqual(pattern.count(lambda row, col: board.get((row, col), ' '), 1, 2, 'C'), 1)
+        self.assertEqual(pattern.count(lambda row, col: board.get((row, col), ' '), 1, 2, 'Q'), 0)
+
+    def test_backends_and_threat_map_agree_on_random_games(self):
+        """Test pattern modes on every board backend against a brute-force recount, with the threat map kept current."""
+        rng = random.Random(8)
+        for game_class in (GameManager, BitboardGameManager, SparseGameManager):
+            game_manager = self.new_game("General SOSOS", 6, game_class)
+            game_manager.get_threat_map()
+            total = 0
+            for _ in range(36):
+                row, col = rng.choice(game_manager.get_empty_cells())
+                character = rng.choice("SO")
+                expected = game_manager.count_potential_sos(row, col, character)
+                game_manager.make_move(row, col, character)
+                self.assertEqual(game_manager.check_sos(row, col), expected)
+                total += expected
+                self.assertEqual(total, brute_force_count(game_manager, "SOSOS"), game_class.__name__)
+                self.assertEqual(game_manager.get_threat_map(), game_manager.copy().get_threat_map())
+            self.assertEqual(sum(game_manager.sos_count.values()), total)
+
+    def test_snapshot_and_policies(self):
+        """Test that pattern modes survive snapshots and can be played by the simulation policies."""
+        game_manager = self.new_game("General SOSOS", 5)
+        game_manager.make_move(2, 2, 'O')
+        restored = GameManager.from_bytes(game_manager.to_bytes())
+        self.assertEqual((restored.game_mode, restored.scoring_mode), ("General SOSOS", "General"))
+        self.assertIs(restored.pattern, game_manager.pattern)
+
+        game = play_game(7, "General SOSOS", greedy_policy, cautious_policy, random.Random(2))
+        self.assertEqual(game["moves"], 49)
+
+    def test_search_players_follow_pattern_rules(self):
+        """Test that the search players score the mode's word rather than SOS."""
+        game_manager = self.new_game("Simple SOSOS", 5)
+        for row, col, character in ((0, 0, 'S'), (2, 0, 'S'), (0, 1, 'O'), (2, 2, 'S'), (0, 2, 'S'), (4, 0, 'O'),
+                                    (0, 3, 'O')):
+            game_manager.make_move(row, col, character)
+            game_manager.switch_turn()
+        self.assertEqual(AlphaBetaPlayer(time_limit=0.5).choose_move(game_manager), (0, 4, 'S'))
+
+        state = PlayoutState.from_game_manager(game_manager)
+        self.assertEqual(state.gain(4, 1), 1)  # S at (0, 4) spells SOSOS
+        self.assertEqual(state.gain(11, 2), 0)  # O at (2, 1) only spells SOS
+
+    def test_compact_manager_scores_patterns(self):
+        """Test that CompactGameManager scores pattern modes like GameManager."""
+        rng = random.Random(6)
+        game_manager = self.new_game("General SOSOS", 6)
+        compact = self.new_game("General SOSOS", 6, CompactGameManager)
+        while not game_manager.is_board_full():
+            row, col = rng.choice(game_manager.get_empty_cells())
+            character = rng.choice("SO")
+            result = game_manager.make_move(row, col, character)
+            self.assertEqual(compact.make_move(row, col, character), result)
+            if result["result"] == "next_turn":
+                game_manager.switch_turn()
+                compact.switch_turn()
+        self.assertGreater(sum(game_manager.sos_count.values()), 0)
+        self.assertEqual(compact.sos_count, game_manager.sos_count)
+        self.assertEqual(CompactGameManager.from_bytes(compact.to_bytes()).game_mode, "General SOSOS")
+
+    def test_load_position_recounts_words(self):
+        """Test that load_position checks scores against the mode's word."""
+        rows = ["SOSOS", "SOS..", ".....", ".....", "....."]
+        game_manager = load_position(GameManager(5, "General SOSOS"), rows, sos_count={"Blue": 1, "Red": 0})
+        self.assertEqual(game_manager.sos_count, {"Blue": 1, "Red": 0})
+        with self.assertRaises(ValueError):
+            load_position(GameManager(5, "General SOSOS"), rows, sos_count={"Blue": 2, "Red": 0})
+        self.assertFalse(load_position(GameManager(5, "Simple SOSOS"), rows, "Simple SOSOS").is_game_active)
+
+    def test_registered_modes_are_stored_by_name(self):
+        """Test that snapshots identify a registered mode by its name rather than its registration order."""
+        register_game_mode("General SOO", "General", "SOO")
+        register_game_mode("Simple SOO", "Simple", "SOO")
+        try:
+            game_manager = self.new_game("Simple SOO", 4)
+            game_manager.make_move(0, 0, 'O')
+            snapshot = game_manager.to_bytes()
+            self.assertEqual(CompactGameManager.from_bytes(snapshot).to_bytes(), snapshot)
+            del GAME_MODES["General SOO"]  # As in a process that only registers "Simple SOO"
+            restored = GameManager.from_bytes(snapshot)
+            self.assertEqual((restored.game_mode, restored.get_board_value(0, 0)), ("Simple SOO", 'O'))
+            del GAME_MODES["Simple SOO"]
+            with self.assertRaises(ValueError):
+                GameManager.from_bytes(snapshot)
+        finally:
+            GAME_MODES.pop("General SOO", None)
+            GAME_MODES.pop("Simple SOO", None)
+        self.assertEqual(GameManager.from_bytes(self.new_game("General SOSOS", 5).to_bytes()).game_mode,
+                         "General SOSOS")
+
+    def test_registering_modes(self):
+        """Test game mode registration and unknown modes."""
+        register_game_mode("General SOO", "General", "SOO")
+        try:
+            self.assertEqual(game_rules("General SOO", 4)[1], compile_pattern("SOO", 4))
+            game_manager = self.new_game("General SOO", 4)
+            game_manager.make_move(0, 0, 'O')
+            game_manager.make_move(0, 1, 'O')
+            self.assertEqual(game_manager.make_move(0, 2, 'S'), {"result": "continue"})
+            restored = GameManager.from_bytes(game_manager.to_bytes())
+            self.assertEqual((restored.game_mode, restored.sos_count), ("General SOO", {"Blue": 1, "Red": 0}))
+        finally:
+            del GAME_MODES["General SOO"]
+        self.assertEqual(game_rules("Simple", 3), ("Simple", None))
+        with self.assertRaises(ValueError):
+            register_game_mode("Simple SOSOS", "General", "SOSOS")
+        with self.assertRaises(ValueError):
+            register_game_mode("Simple CAT", "Simple", "CAT")
+        with self.assertRaises(ValueError):
+            register_game_mode("Odd", "Misere", "SOS")
+        with self.assertRaises(ValueError):
+            GameManager(3, "Unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import random
+import time
+import unittest
+from game_manager import GameManager
+from playback import PlaybackController, bot_moves, record_moves
+from simulate import greedy_policy, random_policy
+
+
+class FakeRoot:
+    """Stands in for Tk's root window by collecting callbacks scheduled with after()."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay, callback):
+        self.pending.append(callback)
+
+    def run_until_idle(self, timeout=10.0, frame_time=0.0):
+        deadline = time.time() + timeout
+        while self.pending and time.time() < deadline:
+            time.sleep(frame_time)
+            self.pending.pop(0)()
+
+
+class FakeBoard:
+    """Counts the widget updates a playback makes."""
+
+    def __init__(self):
+        self.cells = {}
+        self.updates = 0
+        self.lines = []
+
+    def update_button(self, row, col, text):
+        self.cells[(row, col)] = text
+        self.updates += 1
+
+    def draw_sos_line(self, start, end, color):
+        self.lines.append((start, end, color))
+
+
+class FakeRecord:
+    """Minimal GameRecord replacement yielding fixed moves."""
+
+    def __init__(self, moves):
+        self._moves = moves
+
+    def moves(self):
+        for row, col, character in self._moves:
+            yield row, col, character, "Blue", 0
+
+
+class TestPlayback(unittest.TestCase):
+
+    def new_game(self, board_size=20, game_mode="General"):
+        game_manager = GameManager(board_size, game_mode)
+        game_manager.reset_game(board_size, game_mode)
+        return game_manager
+
+    def test_max_speed_bot_game_coalesces_frames(self):
+        """Test that an as-fast-as-possible 20x20 bot game finishes in far fewer frames than moves."""
+        game_manager = self.new_game()
+        board = FakeBoard()
+        root = FakeRoot()
+        frames = []
+        results = []
+        policies = {"Blue": greedy_policy, "Red": random_policy}
+        controller = PlaybackController(root, game_manager, board, bot_moves(game_manager, policies, random.Random(1)),
+                                        on_frame=lambda gm: frames.append(gm.empty_count), on_finish=results.append)
+        controller.start()
+        root.run_until_idle()
+
+        self.assertEqual(controller.moves_played, 400)
+        self.assertLess(controller.frames, 100)
+        self.assertEqual(len(frames), controller.frames)
+        self.assertEqual(board.updates, 400)
+        self.assertEqual(len(board.lines), sum(game_manager.sos_count.values()))
+        self.assertEqual(len(results), 1)
+        self.assertIn(results[0]["winner"], ("Blue", "Red", "Draw"))
+        self.assertFalse(game_manager.is_game_active)
+
+    def test_limited_speed_spreads_moves_over_frames(self):
+        """Test that a capped speed plays a few moves per frame."""
+        game_manager = self.new_game(5, "General")
+        root = FakeRoot()
+        moves = [(row, col, 'O') for row in range(5) for col in range(5)]
+        controller = PlaybackController(root, game_manager, FakeBoard(), moves, moves_per_second=200)
+        controller.start()
+        root.run_until_idle(frame_time=0.02)
+        self.assertEqual(controller.moves_played, 25)
+        self.assertGreater(controller.frames, 3)
+        self.assertEqual(controller.result["winner"], "Draw")
+
+    def test_replay_simple_record_and_stop(self):
+        """Test replaying a recorded Simple game, stepping and pausing."""
+        game_manager = self.new_game(3, "Simple")
+        board = FakeBoard()
+        root = FakeRoot()
+        record = FakeRecord([(0, 0, 'S'), (1, 1, 'S'), (0, 2, 'S'), (0, 1, 'O')])
+        controller = PlaybackController(root, game_manager, board, record_moves(record))
+        self.assertTrue(controller.step())
+        self.assertEqual(board.cells, {(0, 0): 'S'})
+        controller.start()
+        controller.stop()
+        root.run_until_idle()
+        self.assertEqual(controller.moves_played, 1)
+        controller.start()
+        root.run_until_idle()
+        self.assertEqual(controller.result, {"result": "win", "winner": "Red"})
+        self.assertEqual(board.lines, [((0, 0), (0, 2), "red")])
+        self.assertFalse(controller.step())
+
+    def test_invalid_move_stops_playback(self):
+        """Test that a record replaying an occupied cell ends with an error."""
+        game_manager = self.new_game(3, "Simple")
+        controller = PlaybackController(FakeRoot(), game_manager, FakeBoard(), [(0, 0, 'S'), (0, 0, 'O')])
+        controller.step()
+        controller.step()
+        self.assertIn("error", controller.result)
+
+
+if __name__ == '__main__':
+    unittest.main()
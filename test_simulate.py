@@ -0,0 +1,39 @@
+import random
+import subprocess
+import sys
+import unittest
+from game_manager import GameManager
+from simulate import greedy_policy, play_game, random_policy, simulate
+
+
+class TestSimulate(unittest.TestCase):
+
+    def test_simulate_counts_every_game(self):
+        """Test that every simulated game is counted once per mode and board size."""
+        results = simulate(20, board_sizes=(3, 4), game_modes=("Simple", "General"), workers=1, seed=7, batch_size=6)
+        self.assertEqual(len(results), 4)
+        for stats in results.values():
+            summary = stats.summary()
+            self.assertEqual(summary["games"], 20)
+            self.assertAlmostEqual(sum(summary["win_rate"].values()), 1.0)
+
+    def test_general_game_fills_board(self):
+        """Test that a General game always runs until the board is full."""
+        game = play_game(4, "General", random_policy, random_policy, random.Random(3))
+        self.assertEqual(game["moves"], 16)
+
+    def test_greedy_takes_scoring_move(self):
+        """Test that the greedy policy completes an available SOS."""
+        game_manager = GameManager(board_size=3, game_mode="General")
+        game_manager.reset_game(3, "General")
+        game_manager.make_move(0, 0, 'S')
+        game_manager.make_move(0, 1, 'O')
+        self.assertEqual(greedy_policy(game_manager, random.Random(0)), (0, 2, 'S'))
+
+    def test_does_not_import_tkinter(self):
+        """Test that the simulator can be imported without loading tkinter."""
+        code = "import sys, simulate; sys.exit('tkinter' in sys.modules)"
+        self.assertEqual(subprocess.call([sys.executable, "-c", code]), 0)
+
+if __name__ == '__main__':
+    unittest.main()
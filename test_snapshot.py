@@ -0,0 +1,90 @@
+import pickle
+import random
+import unittest
+from bitboard import BitboardGameManager
+from compact_manager import CompactGameManager
+from game_manager import SNAPSHOT_HEADER, GameManager
+from sparse_board import SparseGameManager
+
+
+def random_game(game_class, board_size, game_mode, moves, rng):
+    game_manager = game_class(board_size, game_mode)
+    game_manager.reset_game(board_size, game_mode)
+    for _ in range(moves):
+        if not game_manager.is_game_active or game_manager.is_board_full():
+            break
+        row, col = rng.choice(game_manager.get_empty_cells())
+        if game_manager.make_move(row, col, rng.choice("SO"))["result"] == "next_turn":
+            game_manager.switch_turn()
+    return game_manager
+
+
+def state(game_manager):
+    size = game_manager.board_size
+    return ([[game_manager.get_board_value(row, col) for col in range(size)] for row in range(size)],
+            game_manager.game_mode, game_manager.current_player, game_manager.is_game_active,
+            game_manager.sos_occurred, dict(game_manager.sos_count), game_manager.is_board_full(),
+            sorted(game_manager.get_empty_cells()))
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_round_trip_for_every_backend(self):
+        """Test that snapshots restore the same state and are interchangeable between backends."""
+        rng = random.Random(8)
+        classes = (GameManager, BitboardGameManager, SparseGameManager, CompactGameManager)
+        for game_class in classes:
+            for game_mode in ("Simple", "General"):
+                for board_size in (3, 5, 7):
+                    game_manager = random_game(game_class, board_size, game_mode, rng.randint(0, 30), rng)
+                    snapshot = game_manager.to_bytes()
+                    for other_class in classes:
+                        restored = other_class.from_bytes(snapshot)
+                        self.assertEqual(state(restored), state(game_manager), (game_class, other_class))
+                        self.assertEqual(restored.to_bytes(), snapshot)
+
+    def test_snapshot_is_compact_and_hashable(self):
+        """Test that a 10x10 snapshot packs four cells per byte and works as a dictionary key."""
+        game_manager = random_game(GameManager, 10, "General", 40, random.Random(1))
+        snapshot = game_manager.to_bytes()
+        self.assertEqual(len(snapshot), SNAPSHOT_HEADER.size + 25)
+        self.assertLess(len(snapshot) * 10, len(pickle.dumps(game_manager)))
+        cache = {snapshot: "seen"}
+        self.assertEqual(cache[game_manager.copy().to_bytes()], "seen")
+
+    def test_restored_game_plays_on(self):
+        """Test that a restored game continues exactly like the original."""
+        rng = random.Random(3)
+        game_manager = random_game(GameManager, 6, "General", 12, rng)
+        restored = GameManager.from_bytes(game_manager.to_bytes())
+        for row, col in sorted(game_manager.get_empty_cells()):
+            self.assertEqual(restored.make_move(row, col, 'S'), game_manager.make_move(row, col, 'S'))
+        self.assertEqual(restored.sos_count, game_manager.sos_count)
+
+    def test_load_reuses_board(self):
+        """Test that loading a snapshot of the same size keeps the board storage."""
+        game_manager = random_game(GameManager, 5, "Simple", 6, random.Random(2))
+        snapshot = game_manager.to_bytes()
+        target = GameManager(5, "General")
+        rows = target.board
+        first_row = rows[0]
+        target.load_bytes(snapshot)
+        self.assertIs(target.board, rows)
+        self.assertIs(target.board[0], first_row)
+        self.assertEqual(state(target), state(game_manager))
+        target.load_bytes(GameManager(3, "Simple").to_bytes())
+        self.assertEqual(len(target.board), 3)
+
+        compact = CompactGameManager(5, "General")
+        buffer = compact.board
+        compact.load_bytes(snapshot)
+        self.assertIs(compact.board, buffer)
+
+    def test_unbounded_board_cannot_be_saved(self):
+        """Test that an unbounded sparse board refuses to make a snapshot."""
+        with self.assertRaises(ValueError):
+            SparseGameManager(None, "General").to_bytes()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import math
+import random
+import unittest
+from game_manager import GameManager
+from opening_book import canonical_key
+from solver import Solver, solve, split_positions
+
+
+def brute_force_value(game_manager):
+    """Exact value for the player to move, found by playing out every move sequence with GameManager."""
+    best = None
+    for row, col in game_manager.get_empty_cells():
+        for character in "SO":
+            result = game_manager.make_move(row, col, character)
+            gain = game_manager.undo_stack[-1][4]
+            outcome = result["result"]
+            if outcome == "win":
+                value = 1
+            elif outcome in ("draw", "end") or game_manager.is_board_full():
+                value = gain
+            elif outcome == "continue":
+                value = gain + brute_force_value(game_manager)
+            else:
+                value = -brute_force_value(game_manager)
+            game_manager.unmake_move()
+            best = value if best is None else max(best, value)
+    return best
+
+
+def brute_force_perft(game_manager, depth):
+    """Counts the move sequences of the given length with GameManager."""
+    if depth == 0:
+        return 1
+    if not game_manager.is_game_active or game_manager.is_board_full():
+        return 0
+    nodes = 0
+    for row, col in game_manager.get_empty_cells():
+        for character in "SO":
+            game_manager.make_move(row, col, character)
+            nodes += brute_force_perft(game_manager, depth - 1)
+            game_manager.unmake_move()
+    return nodes
+
+
+class TestSolver(unittest.TestCase):
+
+    def random_position(self, board_size, game_mode, moves, rng):
+        """Plays random moves, avoiding Simple mode wins, and returns the GameManager."""
+        game_manager = GameManager(board_size, game_mode)
+        game_manager.reset_game(board_size, game_mode)
+        while game_manager.empty_count > board_size * board_size - moves:
+            row, col = rng.choice(game_manager.get_empty_cells())
+            character = rng.choice("SO")
+            if game_mode == "Simple" and game_manager.count_potential_sos(row, col, character):
+                continue
+            if game_manager.make_move(row, col, character)["result"] == "next_turn":
+                game_manager.switch_turn()
+        return game_manager
+
+    def test_perft_matches_game_manager(self):
+        """Test the per-depth move sequence counts on 3x3 against GameManager play."""
+        for game_mode in ("Simple", "General"):
+            game_manager = GameManager(3, game_mode)
+            game_manager.reset_game(3, game_mode)
+            counts = Solver(3, game_mode).perft(4)
+            self.assertEqual([depth for depth, _, _ in counts], [0, 1, 2, 3, 4])
+            for depth, nodes, _ in counts:
+                self.assertEqual(nodes, brute_force_perft(game_manager, depth), (game_mode, depth))
+
+    def test_general_perft_counts_every_sequence(self):
+        """Test that General mode counts match the closed form, with every game ending on the full board."""
+        counts = Solver(3, "General").perft()
+        for depth, nodes, ended in counts:
+            self.assertEqual(nodes, 2 ** depth * math.perm(9, depth))
+            self.assertEqual(ended, nodes if depth == 9 else 0)
+        simple = Solver(3, "Simple").perft()
+        self.assertEqual(simple[3], (3, 4032, 48))
+        self.assertEqual(simple[-1][1], simple[-1][2])
+
+    def test_move_values_match_brute_force(self):
+        """Test exact move values against a GameManager minimax on random positions."""
+        rng = random.Random(5)
+        for board_size, game_mode, moves in ((3, "Simple", 3), (3, "General", 4), (4, "Simple", 10),
+                                             (4, "General", 11), (5, "General SOSOS", 19)):
+            solver = Solver(board_size, game_mode)
+            for _ in range(3):
+                game_manager = self.random_position(board_size, game_mode, moves, rng)
+                values = solver.solve_position(game_manager)
+                for (row, col, character), value in list(values.items())[:6]:
+                    result = game_manager.make_move(row, col, character)
+                    gain = game_manager.undo_stack[-1][4]
+                    if result["result"] == "win":
+                        expected = 1
+                    elif game_manager.is_board_full():
+                        expected = gain
+                    elif result["result"] == "continue":
+                        expected = gain + brute_force_value(game_manager)
+                    else:
+                        expected = -brute_force_value(game_manager)
+                    game_manager.unmake_move()
+                    self.assertEqual(value, expected, (game_mode, row, col, character))
+
+    def test_incremental_keys_are_canonical(self):
+        """Test that split positions are keyed by opening_book's canonical key."""
+        solver = Solver(4, "General")
+        positions = split_positions(solver, 2)
+        for key, codes in positions.items():
+            filled = [(cell, code) for cell, code in enumerate(codes) if code]
+            self.assertEqual(key, canonical_key(filled, 4)[0])
+        self.assertEqual(len(split_positions(Solver(3, "Simple"), 1)), 6)  # Corner, edge and centre, S or O
+
+    def test_parallel_solve_matches_in_process(self):
+        """Test that the pooled solve with a shared memo gives the in-process result."""
+        for game_mode in ("Simple", "General"):
+            expected = solve(3, game_mode, workers=1)
+            result = solve(3, game_mode, workers=2, split_plies=2, shared_plies=4)
+            self.assertEqual(result["result"], "Draw")
+            for key in ("value", "best_moves", "board_size", "game_mode"):
+                self.assertEqual(result[key], expected[key])
+            self.assertGreater(result["nodes"], 0)
+            self.assertEqual(result["nodes"], sum(result["depth_nodes"]))
+
+    def test_rejects_mismatched_positions(self):
+        """Test that solve_position refuses positions of another size or a finished game."""
+        game_manager = GameManager(4, "General")
+        game_manager.reset_game(4, "General")
+        with self.assertRaises(ValueError):
+            Solver(3, "General").solve_position(game_manager)
+        game_manager.end_game()
+        with self.assertRaises(ValueError):
+            Solver(4, "General").solve_position(game_manager)
+        with self.assertRaises(ValueError):
+            Solver(3, "Misere")
+
+
+if __name__ == '__main__':
+    unittest.main()
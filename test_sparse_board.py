@@ -0,0 +1,82 @@
+import random
+import unittest
+from game_manager import GameManager
+from sparse_board import SparseGameManager
+
+
+class TestSparseGameManager(unittest.TestCase):
+
+    def test_large_board_allocates_per_move(self):
+        """Test that a 1000x1000 board only allocates the tiles that hold moves."""
+        game_manager = SparseGameManager(board_size=1000, game_mode="General")
+        game_manager.reset_game(1000, "General")
+        game_manager.make_move(0, 0, 'S')
+        game_manager.make_move(999, 999, 'O')
+        self.assertEqual(len(game_manager.tiles), 2)
+        self.assertEqual(game_manager.empty_count, 1000 * 1000 - 2)
+        self.assertEqual(game_manager.get_board_value(999, 999), 'O')
+
+    def test_sos_across_tile_boundary(self):
+        """Test that an SOS spanning two tiles is detected."""
+        game_manager = SparseGameManager(board_size=1000, game_mode="General")
+        game_manager.reset_game(1000, "General")
+        game_manager.make_move(15, 15, 'S')
+        game_manager.make_move(16, 16, 'O')
+        result = game_manager.make_move(17, 17, 'S')
+        self.assertEqual(result["result"], "continue")
+        self.assertEqual(game_manager.sos_count["Blue"], 1)
+
+    def test_off_board_move_rejected(self):
+        """Test that a move outside a bounded board is rejected."""
+        game_manager = SparseGameManager(board_size=50, game_mode="Simple")
+        game_manager.reset_game(50, "Simple")
+        self.assertFalse(game_manager.make_move(50, 0, 'S'))
+
+    def test_unbounded_board(self):
+        """Test that an unbounded board accepts any coordinates and is never full."""
+        game_manager = SparseGameManager(board_size=None, game_mode="General")
+        game_manager.reset_game(None, "General")
+        game_manager.make_move(-5, -5, 'S')
+        game_manager.make_move(-5, -4, 'O')
+        game_manager.make_move(-5, -3, 'S')
+        self.assertEqual(game_manager.sos_count["Blue"], 1)
+        self.assertFalse(game_manager.is_board_full())
+        self.assertIn((-5, -2), game_manager.get_empty_cells())
+
+    def test_frontier_follows_the_moves(self):
+        """Test that frontier_cells lists only the empty cells near the moves, and get_empty_cells all of them."""
+        game_manager = SparseGameManager(board_size=1000, game_mode="General")
+        game_manager.reset_game(1000, "General")
+        self.assertEqual(game_manager.frontier_cells(), [(500, 500)])
+        game_manager.make_move(500, 500, 'S')
+        game_manager.make_move(0, 0, 'O')
+        cells = game_manager.frontier_cells()
+        self.assertEqual(len(cells), 24 + 8)
+        self.assertTrue(all(abs(row - 500) <= 2 and abs(col - 500) <= 2 or row <= 2 and col <= 2
+                            for row, col in cells))
+
+        small = SparseGameManager(board_size=4, game_mode="General")
+        small.reset_game(4, "General")
+        small.make_move(0, 0, 'S')
+        self.assertEqual(sorted(small.frontier_cells()), [(0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0), (2, 1),
+                                                          (2, 2)])
+        self.assertEqual(len(small.get_empty_cells()), 15)
+
+    def test_matches_dense_board(self):
+        """Test that random games score the same on sparse and dense boards."""
+        rng = random.Random(4)
+        dense = GameManager(board_size=20, game_mode="General")
+        dense.reset_game(20, "General")
+        sparse = SparseGameManager(board_size=20, game_mode="General")
+        sparse.reset_game(20, "General")
+        while not dense.is_board_full():
+            row, col = rng.choice(dense.get_empty_cells())
+            character = rng.choice("SO")
+            self.assertEqual(dense.make_move(row, col, character), sparse.make_move(row, col, character))
+            dense.switch_turn()
+            sparse.switch_turn()
+        self.assertTrue(sparse.is_board_full())
+        self.assertEqual(dense.sos_count, sparse.sos_count)
+
+if __name__ == '__main__':
+    unittest.main()
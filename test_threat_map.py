@@ -0,0 +1,87 @@
+import random
+import unittest
+from bitboard import BitboardGameManager
+from game_manager import GameManager
+from simulate import cautious_policy, greedy_policy
+from sparse_board import SparseGameManager
+
+
+def potential_counts(game_manager):
+    """Brute-force count_potential_sos for every empty cell and letter."""
+    return {(row, col, character): game_manager.count_potential_sos(row, col, character)
+            for row, col in game_manager.get_empty_cells() for character in "SO"}
+
+
+class TestThreatMap(unittest.TestCase):
+
+    def test_incremental_map_matches_rebuild(self):
+        """Test that the map kept up by make_move and unmake_move equals a map built from scratch."""
+        rng = random.Random(11)
+        for game_class in (GameManager, BitboardGameManager, SparseGameManager):
+            game_manager = game_class(6, "General")
+            game_manager.reset_game(6, "General")
+            game_manager.get_threat_map()
+            for _ in range(80):
+                if game_manager.undo_stack and rng.random() < 0.3:
+                    game_manager.unmake_move()
+                elif not game_manager.is_board_full():
+                    row, col = rng.choice(game_manager.get_empty_cells())
+                    game_manager.make_move(row, col, rng.choice("SO"))
+                fresh = game_manager.copy()
+                self.assertIsNone(fresh.threats)
+                self.assertEqual(game_manager.get_threat_map(), fresh.get_threat_map(), game_class.__name__)
+
+    def test_move_classes_match_brute_force(self):
+        """Test scoring, unsafe and safe moves against trial placement on every cell."""
+        rng = random.Random(4)
+        for _ in range(30):
+            game_manager = GameManager(5, "General")
+            game_manager.reset_game(5, "General")
+            for row, col in rng.sample(game_manager.get_empty_cells(), rng.randint(3, 15)):
+                game_manager.make_move(row, col, rng.choice("SO"))
+
+            before = potential_counts(game_manager)
+            scoring = {(row, col, character): count for row, col, character, count in game_manager.scoring_moves()}
+            self.assertEqual(scoring, {move: count for move, count in before.items() if count})
+
+            unsafe = set()
+            for move, count in before.items():
+                if count:
+                    continue
+                trial = game_manager.copy()
+                trial.make_move(*move)
+                after = potential_counts(trial)
+                if any(after[other] > before[other] for other in after):
+                    unsafe.add(move)
+            self.assertEqual(set(game_manager.unsafe_moves()), unsafe)
+            self.assertEqual(set(game_manager.safe_moves()), set(before) - set(scoring) - unsafe)
+
+    def test_reset_discards_map(self):
+        """Test that a new game starts without a threat map."""
+        game_manager = GameManager(3, "Simple")
+        game_manager.reset_game(3, "Simple")
+        game_manager.make_move(0, 0, 'S')
+        game_manager.make_move(0, 2, 'S')
+        self.assertEqual(game_manager.scoring_moves(), [(0, 1, 'O', 1)])
+        game_manager.reset_game(3, "Simple")
+        self.assertIsNone(game_manager.threats)
+        self.assertEqual(game_manager.scoring_moves(), [])
+
+    def test_policies_use_the_map(self):
+        """Test that greedy takes the best SOS and cautious avoids opening one."""
+        game_manager = GameManager(4, "General")
+        game_manager.reset_game(4, "General")
+        for row, col, character in ((0, 0, 'S'), (0, 2, 'S'), (2, 0, 'S'), (2, 2, 'S'), (1, 0, 'O')):
+            game_manager.make_move(row, col, character)
+        self.assertEqual(greedy_policy(game_manager, random.Random(0)), (1, 1, 'O'))
+
+        game_manager = GameManager(4, "General")
+        game_manager.reset_game(4, "General")
+        game_manager.make_move(1, 1, 'O')
+        rng = random.Random(2)
+        for _ in range(20):
+            self.assertNotIn(cautious_policy(game_manager, rng), game_manager.unsafe_moves())
+
+
+if __name__ == '__main__':
+    unittest.main()
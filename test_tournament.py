@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from tournament import EloRatings, Tournament, make_policy, read_results, round_robin_schedule, swiss_pairings
+
+BOT_SCRIPT = """
+import json, sys
+for line in sys.stdin:
+    board = json.loads(line)["board"]
+    row, col = next((r, c) for r, text in enumerate(board) for c, cell in enumerate(text) if cell == " ")
+    print(row, col, "S", flush=True)
+"""
+
+
+class TestTournament(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_round_robin_alternates_colours(self):
+        """Test that every pair plays every mode and size equally often with each colour."""
+        tasks = round_robin_schedule(["a", "b", "c"], 2, (3, 4), ("Simple", "General"))
+        self.assertEqual(len(tasks), 3 * 2 * 2 * 2 * 2)
+        self.assertEqual(len({task[0] for task in tasks}), len(tasks))
+        as_blue = sum(1 for task in tasks if task[2:4] == ("a", "b"))
+        as_red = sum(1 for task in tasks if task[2:4] == ("b", "a"))
+        self.assertEqual(as_blue, as_red)
+
+    def test_results_stream_and_resume(self):
+        """Test that results are written per game and a rerun only plays the missing games."""
+        output = self.path("results.jsonl")
+        ratings = Tournament(["random", "greedy"], output, games=3, board_sizes=(3,), workers=1).run()
+        rows = read_results(output)
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(sum(sum(record) for record in ratings.records.values()), 24)
+
+        with open(output) as file:
+            lines = file.readlines()
+        with open(output, "w") as file:
+            file.writelines(lines[:5])
+            file.write(lines[5][:10])  # Simulate a run killed mid-write
+        Tournament(["random", "greedy"], output, games=3, board_sizes=(3,), workers=1).run()
+        resumed = read_results(output)
+        self.assertEqual(sorted(row["game_id"] for row in resumed), sorted(row["game_id"] for row in rows))
+        by_id = {row["game_id"]: row["winner"] for row in rows}
+        self.assertTrue(all(by_id[row["game_id"]] == row["winner"] for row in resumed))
+
+    def test_parallel_csv_tournament(self):
+        """Test a pooled run writing CSV, with greedy outscoring random."""
+        output = self.path("results.csv")
+        ratings = Tournament(["random", "greedy"], output, games=10, board_sizes=(4,), game_modes=("General",),
+                             workers=2).run()
+        self.assertEqual(len(read_results(output)), 20)
+        self.assertGreater(ratings.ratings["greedy"], ratings.ratings["random"])
+
+    def test_csv_resume_skips_cut_rows(self):
+        """Test that a CSV row cut short is skipped on reading and its game is replayed."""
+        output = self.path("results.csv")
+        Tournament(["random", "greedy"], output, games=2, board_sizes=(3,), game_modes=("General",),
+                   workers=1).run()
+        rows = read_results(output)
+        with open(output, newline="") as file:
+            lines = file.readlines()
+        with open(output, "w", newline="") as file:
+            file.writelines(lines[:3])
+            file.write(lines[3][:lines[3].index(",", 2)])  # Simulate a run killed mid-write
+        self.assertEqual(len(read_results(output)), 2)
+
+        Tournament(["random", "greedy"], output, games=2, board_sizes=(3,), game_modes=("General",),
+                   workers=1).run()
+        resumed = read_results(output)
+        self.assertEqual(sorted(row["game_id"] for row in resumed), sorted(row["game_id"] for row in rows))
+
+    def test_swiss_pairs_by_points(self):
+        """Test that Swiss pairing groups leaders together and avoids rematches."""
+        points = {"a": 2, "b": 2, "c": 0, "d": 0}
+        self.assertEqual(swiss_pairings(["a", "b", "c", "d"], points, set()), [("a", "b"), ("c", "d")])
+        played = {frozenset(("a", "b")), frozenset(("c", "d"))}
+        self.assertEqual(swiss_pairings(["a", "b", "c", "d"], points, played), [("a", "c"), ("b", "d")])
+
+        output = self.path("swiss.jsonl")
+        Tournament(["random", "greedy", "cautious"], output, schedule="swiss", rounds=2, games=1,
+                   board_sizes=(3,), game_modes=("Simple",), workers=1).run()
+        rows = read_results(output)
+        self.assertEqual({row["round"] for row in rows}, {1, 2})
+
+    def test_script_player(self):
+        """Test that an external program can play through the line protocol."""
+        script = self.path("bot.py")
+        with open(script, "w") as file:
+            file.write(BOT_SCRIPT)
+        spec = f"script:{sys.executable} {script}"
+        output = self.path("script.jsonl")
+        Tournament([spec, "random"], output, games=1, board_sizes=(3,), workers=1).run()
+        self.assertEqual(len(read_results(output)), 4)
+        make_policy(spec)
+        with self.assertRaises(ValueError):
+            make_policy("nobody")
+
+    def test_elo_is_zero_sum(self):
+        """Test that rating changes balance and a win raises the winner's rating."""
+        ratings = EloRatings(["a", "b"])
+        ratings.add_result({"blue": "a", "red": "b", "winner": "Blue"})
+        ratings.add_result({"blue": "b", "red": "a", "winner": "Draw"})
+        self.assertAlmostEqual(sum(ratings.ratings.values()), 3000.0)
+        self.assertGreater(ratings.ratings["a"], ratings.ratings["b"])
+        self.assertEqual(ratings.records["a"], [1, 1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from game_manager import GameManager
+from bitboard import BitboardGameManager
+from sparse_board import SparseGameManager
+
+
+class TestUndoRedo(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a new 3x3 General game for each test."""
+        self.game_manager = GameManager(board_size=3, game_mode="General")
+        self.game_manager.reset_game(3, "General")
+
+    def state(self, game_manager):
+        """Returns the observable state of a game for comparisons."""
+        size = game_manager.board_size
+        cells = [game_manager.get_board_value(row, col) for row in range(size) for col in range(size)]
+        return (cells, game_manager.current_player, dict(game_manager.sos_count), game_manager.sos_occurred,
+                game_manager.is_game_active, game_manager.empty_count)
+
+    def test_unmake_restores_scoring_move(self):
+        """Test that undoing an SOS restores the cell, score and player."""
+        self.game_manager.make_move(0, 0, 'S')
+        self.game_manager.switch_turn()
+        self.game_manager.make_move(0, 1, 'O')
+        self.game_manager.switch_turn()
+        before = self.state(self.game_manager)
+        self.game_manager.make_move(0, 2, 'S')
+
+        self.assertTrue(self.game_manager.unmake_move())
+        self.assertEqual(self.state(self.game_manager), before)
+        self.assertIn((0, 2), self.game_manager.get_empty_cells())
+
+    def test_unmake_restores_player_after_switch(self):
+        """Test that undoing a passing move gives the turn back to its player."""
+        self.game_manager.make_move(1, 1, 'S')
+        self.game_manager.switch_turn()
+        self.game_manager.unmake_move()
+        self.assertEqual(self.game_manager.get_current_player(), "Blue")
+
+    def test_unmake_reactivates_simple_win(self):
+        """Test that undoing a Simple mode winning move makes the game active again."""
+        self.game_manager.reset_game(3, "Simple")
+        for move in [(0, 0, 'S'), (0, 1, 'O'), (0, 2, 'S')]:
+            self.game_manager.make_move(*move)
+        self.assertFalse(self.game_manager.is_game_active)
+        self.game_manager.unmake_move()
+        self.assertTrue(self.game_manager.is_game_active)
+        self.assertFalse(self.game_manager.sos_occurred)
+
+    def test_redo_replays_move(self):
+        """Test that redo restores the state exactly as it was before undo."""
+        self.game_manager.make_move(0, 0, 'S')
+        self.game_manager.switch_turn()
+        after = self.state(self.game_manager)
+        self.game_manager.unmake_move()
+        result = self.game_manager.redo_move()
+        self.assertEqual(result["result"], "next_turn")
+        self.assertEqual(self.state(self.game_manager), after)
+
+    def test_new_move_clears_redo(self):
+        """Test that making a new move discards the undone moves."""
+        self.game_manager.make_move(0, 0, 'S')
+        self.game_manager.unmake_move()
+        self.game_manager.make_move(1, 1, 'O')
+        self.assertFalse(self.game_manager.redo_move())
+        self.assertFalse(GameManager().unmake_move())
+
+    def test_full_undo_returns_to_start(self):
+        """Test that undoing a whole random game restores the empty board on every backend."""
+        for manager_class, size in ((GameManager, 5), (BitboardGameManager, 5), (SparseGameManager, 5)):
+            game_manager = manager_class(size, "General")
+            game_manager.reset_game(size, "General")
+            start = self.state(game_manager)
+            rng = random.Random(9)
+            history = []
+            while not game_manager.is_board_full():
+                history.append(self.state(game_manager))
+                row, col = rng.choice(game_manager.get_empty_cells())
+                if game_manager.make_move(row, col, rng.choice("SO"))["result"] == "next_turn":
+                    game_manager.switch_turn()
+            while history:
+                game_manager.unmake_move()
+                snapshot = self.state(game_manager)
+                self.assertEqual(snapshot[0], history.pop()[0])
+            self.assertEqual(self.state(game_manager), start)
+
+if __name__ == '__main__':
+    unittest.main()
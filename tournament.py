@@ -0,0 +1,351 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import time
+import zlib
+
+from pattern_engine import GAME_MODES
+from simulate import POLICIES, play_game
+
+# Columns of the per-game result files
+RESULT_FIELDS = ["game_id", "round", "blue", "red", "board_size", "game_mode", "winner",
+                 "blue_score", "red_score", "moves", "seconds"]
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 16.0
+
+
+class ScriptPolicy:
+    """Move policy backed by an external program that speaks a line protocol over stdin/stdout.
+
+    For every move the program receives one JSON line
+    {"size": n, "mode": ..., "player": "Blue" | "Red", "board": ["S O", ...]}
+    and must answer with one line "row col letter" (0-based row and column).
+    The program is started on the first move and kept running between games.
+    """
+
+    def __init__(self, command):
+        self.command = command
+        self.process = None
+
+    def __call__(self, game_manager, rng):
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(shlex.split(self.command), stdin=subprocess.PIPE,
+                                            stdout=subprocess.PIPE, text=True, bufsize=1)
+        size = game_manager.board_size
+        board = ["".join(game_manager.get_board_value(row, col) for col in range(size)) for row in range(size)]
+        request = {"size": size, "mode": game_manager.game_mode,
+                   "player": game_manager.get_current_player(), "board": board}
+        self.process.stdin.write(json.dumps(request) + "\n")
+        self.process.stdin.flush()
+        reply = self.process.stdout.readline().split()
+        if len(reply) != 3 or reply[2] not in ("S", "O") or not (reply[0].isdigit() and reply[1].isdigit()):
+            raise ValueError(f"Bad reply from {self.command!r}: {' '.join(reply)!r}")
+        row, col = int(reply[0]), int(reply[1])
+        if not (0 <= row < size and 0 <= col < size) or not game_manager.is_valid_move(row, col):
+            raise ValueError(f"Illegal move from {self.command!r}: {row} {col}")
+        return row, col, reply[2]
+
+    def close(self):
+        """Stops the external program."""
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+
+
+def make_policy(spec):
+    """Builds a move policy from a player spec.
+
+    Specs are a built-in policy name (random, greedy, cautious),
+    alphabeta[:seconds], mcts[:seconds] or script:<command line>.
+    """
+    name, _, argument = spec.partition(":")
+    if name in POLICIES and not argument:
+        return POLICIES[name]
+    if name == "alphabeta":
+        from ai_player import AlphaBetaPlayer
+        player = AlphaBetaPlayer(time_limit=float(argument or 0.1))
+        return lambda game_manager, rng: player.choose_move(game_manager)
+    if name == "mcts":
+        from mcts_player import MCTSPlayer
+        player = MCTSPlayer(time_limit=float(argument or 0.1))
+        return lambda game_manager, rng: player.choose_move(game_manager)
+    if name == "script" and argument:
+        return ScriptPolicy(argument)
+    raise ValueError(f"Unknown player: {spec}")
+
+
+# Policies built in this process, by spec; search players keep their tables between games
+_policies = {}
+
+
+def _policy(spec):
+    policy = _policies.get(spec)
+    if policy is None:
+        policy = _policies[spec] = make_policy(spec)
+    return policy
+
+
+def close_policies():
+    """Stops any external programs started by this process."""
+    for policy in _policies.values():
+        if isinstance(policy, ScriptPolicy):
+            policy.close()
+    _policies.clear()
+
+
+def play_scheduled_game(task):
+    """Plays one scheduled game and returns its result row."""
+    game_id, round_number, blue, red, board_size, game_mode, seed = task
+    started = time.perf_counter()
+    game = play_game(board_size, game_mode, _policy(blue), _policy(red), random.Random(seed))
+    return {"game_id": game_id, "round": round_number, "blue": blue, "red": red, "board_size": board_size,
+            "game_mode": game_mode, "winner": game["winner"], "blue_score": game["blue_score"],
+            "red_score": game["red_score"], "moves": game["moves"],
+            "seconds": round(time.perf_counter() - started, 6)}
+
+
+class EloRatings:
+    """Elo ratings and win/draw/loss totals, updated one game at a time."""
+
+    def __init__(self, players, k_factor=K_FACTOR):
+        self.k_factor = k_factor
+        self.ratings = {player: INITIAL_RATING for player in players}
+        self.records = {player: [0, 0, 0] for player in players}  # wins, draws, losses
+
+    def add_result(self, result):
+        """Updates both players' ratings from one result row."""
+        blue, red = result["blue"], result["red"]
+        score = {"Blue": 1.0, "Red": 0.0}.get(result["winner"], 0.5)
+        expected = 1 / (1 + 10 ** ((self.ratings[red] - self.ratings[blue]) / 400))
+        change = self.k_factor * (score - expected)
+        self.ratings[blue] += change
+        self.ratings[red] -= change
+        for player, player_score in ((blue, score), (red, 1 - score)):
+            self.records[player][0 if player_score == 1 else 1 if player_score == 0.5 else 2] += 1
+
+    def standings(self):
+        """Returns (player, rating, wins, draws, losses) sorted from the highest rating."""
+        return sorted(((player, rating, *self.records[player]) for player, rating in self.ratings.items()),
+                      key=lambda row: -row[1])
+
+    def format_standings(self):
+        """Formats the standings as a text table."""
+        lines = [f"{'player':<24} {'elo':>7} {'W':>6} {'D':>6} {'L':>6}"]
+        for player, rating, wins, draws, losses in self.standings():
+            lines.append(f"{player:<24} {rating:>7.1f} {wins:>6} {draws:>6} {losses:>6}")
+        return "\n".join(lines)
+
+
+def _pairing_games(round_number, pairings, games, board_sizes, game_modes, seed):
+    """Expands pairings into game tasks, giving each side both colours equally often."""
+    tasks = []
+    for first, second in pairings:
+        for game_mode in game_modes:
+            for board_size in board_sizes:
+                for index in range(games):
+                    for blue, red in ((first, second), (second, first)):
+                        game_id = f"{round_number}:{blue}:{red}:{game_mode}:{board_size}:{index}"
+                        tasks.append((game_id, round_number, blue, red, board_size, game_mode,
+                                      zlib.crc32(f"{seed}:{game_id}".encode())))
+    return tasks
+
+
+def round_robin_schedule(players, games, board_sizes, game_modes, seed=0, round_number=0):
+    """Returns game tasks in which every pair of players meets in every mode and size, in both colours."""
+    return _pairing_games(round_number, itertools.combinations(players, 2), games, board_sizes, game_modes, seed)
+
+
+def swiss_pairings(players, points, played):
+    """Pairs players with similar points, avoiding rematches where possible; one player may sit out."""
+    order = sorted(players, key=lambda player: (-points.get(player, 0), player))
+    pairings = []
+    while len(order) > 1:
+        first = order.pop(0)
+        opponent = next((player for player in order if frozenset((first, player)) not in played), order[0])
+        order.remove(opponent)
+        pairings.append((first, opponent))
+    return pairings
+
+
+def read_results(path):
+    """Returns the result rows already written to a CSV or JSONL file."""
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="") as file:
+        if path.endswith(".csv"):
+            rows = []
+            for row in csv.DictReader(file):
+                try:
+                    for field in ("round", "board_size", "blue_score", "red_score", "moves"):
+                        row[field] = int(row[field])
+                    row["seconds"] = float(row["seconds"])
+                except (TypeError, ValueError):
+                    continue  # A row cut short when the previous run was interrupted
+                rows.append(row)
+            return rows
+        rows = []
+        for line in file:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                pass  # A line cut short when the previous run was interrupted
+        return rows
+
+
+class ResultWriter:
+    """Appends result rows to a CSV or JSONL file, flushing after every game."""
+
+    def __init__(self, path):
+        self.csv = path.endswith(".csv")
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            with open(path, "rb") as file:
+                file.seek(-1, os.SEEK_END)
+                complete = file.read(1) == b"\n"
+        self.file = open(path, "a", newline="")
+        if not new_file and not complete:
+            self.file.write("\n")  # Terminate a row cut short by an interrupted run
+        if self.csv:
+            self.writer = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS)
+            if new_file:
+                self.writer.writeheader()
+
+    def write(self, result):
+        """Writes one result row."""
+        if self.csv:
+            self.writer.writerow(result)
+        else:
+            self.file.write(json.dumps(result) + "\n")
+        self.file.flush()
+
+    def close(self):
+        """Closes the file."""
+        self.file.close()
+
+
+class Tournament:
+    """Runs a round-robin or Swiss tournament across a process pool.
+
+    Results stream to the output file as games finish, and ratings are
+    updated live. Rerunning with the same output file skips every game
+    already recorded there, so an interrupted tournament picks up where it
+    stopped. Swiss rounds are paired by points, which do not depend on the
+    order games finished in, so resumed pairings match the original ones.
+    """
+
+    def __init__(self, players, output, schedule="round-robin", rounds=1, games=1, board_sizes=(3,),
+                 game_modes=("Simple", "General"), workers=None, seed=0, progress=None):
+        for spec in players:
+            make_policy(spec)  # Reject bad specs before starting any workers
+        self.players = list(players)
+        self.output = output
+        self.schedule = schedule
+        self.rounds = rounds
+        self.games = games
+        self.board_sizes = tuple(board_sizes)
+        self.game_modes = tuple(game_modes)
+        self.workers = workers
+        self.seed = seed
+        self.progress = progress  # Optional callable(result, ratings) called after every game
+        self.ratings = EloRatings(self.players)
+        self.completed = set()
+        self.history = []  # (round, blue, red, winner) of every finished game, for Swiss pairing
+
+    def run(self):
+        """Plays every scheduled game not already in the output file and returns the ratings."""
+        for result in read_results(self.output):
+            self._record(result)
+        writer = ResultWriter(self.output)
+        pool = None
+        try:
+            if self.workers != 1:
+                from multiprocessing import Pool  # Imported lazily to keep short-lived workers fast to start
+                pool = Pool(processes=self.workers)
+            if self.schedule == "swiss":
+                for round_number in range(1, self.rounds + 1):
+                    pairings = self.round_pairings(round_number)
+                    self._play(_pairing_games(round_number, pairings, self.games, self.board_sizes,
+                                              self.game_modes, self.seed), writer, pool)
+            else:
+                for round_number in range(self.rounds):
+                    self._play(round_robin_schedule(self.players, self.games, self.board_sizes, self.game_modes,
+                                                    self.seed, round_number), writer, pool)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            else:
+                close_policies()
+            writer.close()
+        return self.ratings
+
+    def round_pairings(self, round_number):
+        """Returns the Swiss pairings of a round from the games of the earlier rounds only."""
+        points = {}
+        played = set()
+        for game_round, blue, red, winner in self.history:
+            if game_round < round_number:
+                played.add(frozenset((blue, red)))
+                for player, color in ((blue, "Blue"), (red, "Red")):
+                    score = 1 if winner == color else 0.5 if winner == "Draw" else 0
+                    points[player] = points.get(player, 0) + score
+        return swiss_pairings(self.players, points, played)
+
+    def _record(self, result):
+        self.completed.add(result["game_id"])
+        self.ratings.add_result(result)
+        self.history.append((result["round"], result["blue"], result["red"], result["winner"]))
+
+    def _play(self, tasks, writer, pool):
+        tasks = [task for task in tasks if task[0] not in self.completed]
+        if pool is None:
+            results = map(play_scheduled_game, tasks)
+        else:
+            chunksize = max(1, len(tasks) // ((self.workers or os.cpu_count() or 1) * 32))
+            results = pool.imap_unordered(play_scheduled_game, tasks, chunksize=chunksize)
+        for result in results:
+            writer.write(result)
+            self._record(result)
+            if self.progress is not None:
+                self.progress(result, self.ratings)
+
+
+def main(argv=None):
+    """Command-line entry point for running tournaments."""
+    parser = argparse.ArgumentParser(description="Run an SOS tournament between computer players.")
+    parser.add_argument("players", nargs="+",
+                        help="player specs: random, greedy, cautious, alphabeta[:secs], mcts[:secs], script:<cmd>")
+    parser.add_argument("--output", default="tournament.jsonl", help="results file (.jsonl or .csv)")
+    parser.add_argument("--schedule", default="round-robin", choices=["round-robin", "swiss"])
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--games", type=int, default=10, help="games per pairing, mode, size and colour")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3])
+    parser.add_argument("--modes", nargs="+", default=["Simple", "General"], choices=list(GAME_MODES))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    counter = itertools.count(1)
+
+    def progress(result, ratings):
+        count = next(counter)
+        if count % 100 == 0:
+            leader, rating = ratings.standings()[0][:2]
+            print(f"{count} games, leader {leader} ({rating:.0f})", file=sys.stderr)
+
+    tournament = Tournament(args.players, args.output, args.schedule, args.rounds, args.games, args.sizes,
+                            args.modes, args.workers, args.seed, progress)
+    print(tournament.run().format_standings())
+
+
+if __name__ == "__main__":
+    main()